@@ -4,7 +4,16 @@ from .training import training
 from .certification import certification
 from .enrollment import enrollment
 from .compliance import compliance
+from .changes import changes
+from .metrics import metrics
+from .compliance_trends import compliance_trends
+from .compliance_sections import compliance_sections
+from .notifications import notifications
+from .expiry_calendar import expiry_calendar
+from .tenant import tenant
+from .archive import archive
 
 __all__ = [
-    "employee","department","training","certification", "enrollment", "compliance"
+    "employee","department","training","certification", "enrollment", "compliance", "changes", "metrics",
+    "compliance_trends", "compliance_sections", "notifications", "expiry_calendar", "tenant", "archive"
 ]
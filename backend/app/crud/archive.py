@@ -0,0 +1,155 @@
+# app/crud/archive.py
+from sqlalchemy import and_, case, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Tuple
+from datetime import datetime
+from ..models import (
+    Training, Enrollment, Certification, ExpiryCalendarEntry,
+    ArchivedEnrollment, ArchivedCertification, ArchiveCounter, Tombstone
+)
+
+# Live model -> (archive model, counter kind, statuses that may be archived)
+ARCHIVES = {
+    Enrollment: (ArchivedEnrollment, "enrollment", ("completed", "cancelled")),
+    Certification: (ArchivedCertification, "certification", ("expired", "revoked")),
+}
+
+class CRUDArchive:
+    """
+    Moves finished enrollments and certifications that nobody has touched for a while
+    out of the live tables, so the scans behind reports and listings only cover rows
+    that can still change.
+
+    A row is archived once its status is final and both its last update and its end
+    (completed_date / expires_at) are older than the cutoff. Nothing marks lapsed
+    certifications expired, so an active one whose expires_at is past the cutoff is
+    archived (and counted) as expired, which also releases its enrollment. Rows move in keyset
+    batches: copied into the archive table, added to archive_counters (which the
+    dashboard and daily rollups add to their totals), tombstoned so the change feed
+    reports them gone, then deleted, one commit per batch. Reads see live rows only unless the caller asks for archived ones.
+    """
+    def _archivable(self, db: Session, model, cutoff: datetime):
+        _, _, statuses = ARCHIVES[model]
+        end = Enrollment.completed_date if model is Enrollment else Certification.expires_at
+        status = model.status.in_(statuses)
+        if model is Certification:
+            status = or_(status, and_(Certification.status == "active", Certification.expires_at < cutoff))
+        conditions = [
+            status,
+            func.coalesce(model.updated_at, model.created_at) < cutoff,
+            or_(end.is_(None), end < cutoff),
+            # SQLite and older MySQL reissue an id above the highest remaining one, so
+            # the newest row stays live and archived ids are never handed out again
+            model.id < db.query(func.max(model.id)).scalar_subquery()
+        ]
+        if model is Enrollment:
+            # Certifications still point at their enrollment
+            conditions.append(~select(Certification.id).where(Certification.enrollment_id == Enrollment.id).exists())
+        return conditions
+
+    def _status(self, model):
+        """Status the archived copy keeps: certifications still marked active have lapsed"""
+        if model is Certification:
+            return case((Certification.status == "active", "expired"), else_=Certification.status).label("status")
+        return model.status
+
+    def archive(self, db: Session, model, cutoff: datetime, batch_size: int = 500) -> int:
+        """Archive the `model` rows past the cutoff; returns how many moved"""
+        archive_model, kind, _ = ARCHIVES[model]
+        columns = [
+            self._status(model) if column.name == "status" else getattr(model, column.name)
+            for column in archive_model.__table__.columns if column.name != "archived_at"
+        ]
+        query = select(*columns, Training.duration_hours).outerjoin(Training, Training.id == model.training_id)
+        query = query.where(*self._archivable(db, model, cutoff)).order_by(model.id).limit(batch_size)
+
+        total = 0
+        last_id = 0
+        while True:
+            rows = db.execute(query.where(model.id > last_id)).all()
+            if not rows:
+                return total
+            archived_at = datetime.utcnow()
+            ids = [row.id for row in rows]
+            db.execute(insert(archive_model), [
+                {**{column.key: getattr(row, column.key) for column in columns}, "archived_at": archived_at}
+                for row in rows
+            ])
+            self._count(db, kind, rows)
+            # Core inserts skip the tenant stamping, so each tombstone takes its row's tenant
+            db.execute(insert(Tombstone), [
+                {"tenant_id": row.tenant_id, "entity_type": kind, "entity_id": row.id, "deleted_at": archived_at}
+                for row in rows
+            ])
+            if model is Certification:
+                # Core deletes bypass the flush listener that keeps the calendar in step
+                db.execute(delete(ExpiryCalendarEntry).where(ExpiryCalendarEntry.certification_id.in_(ids)))
+            db.execute(delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False))
+            db.commit()
+            total += len(rows)
+            last_id = ids[-1]
+
+    def run(self, db: Session, cutoff: datetime, batch_size: int = 500) -> Dict[str, int]:
+        """Archive certifications, then the enrollments they no longer pin"""
+        return {
+            "certifications": self.archive(db, Certification, cutoff, batch_size),
+            "enrollments": self.archive(db, Enrollment, cutoff, batch_size)
+        }
+
+    def _count(self, db: Session, kind: str, rows) -> None:
+        """Add a batch of archived rows to archive_counters"""
+        batch: Dict[Tuple[Any, str], List[float]] = {}
+        for row in rows:
+            totals = batch.setdefault((row.tenant_id, row.status), [0, 0.0])
+            totals[0] += 1
+            if kind == "enrollment" and row.status == "completed":
+                totals[1] += row.duration_hours or 0
+
+        for (tenant_id, status), (row_count, training_hours) in batch.items():
+            counter = db.query(ArchiveCounter).filter(
+                ArchiveCounter.tenant_id == tenant_id,
+                ArchiveCounter.kind == kind,
+                ArchiveCounter.status == status
+            ).first()
+            if counter is None:
+                counter = ArchiveCounter(tenant_id=tenant_id, kind=kind, status=status, row_count=0, training_hours=0.0)
+                db.add(counter)
+            counter.row_count += row_count
+            counter.training_hours += training_hours
+        db.flush()
+
+    def totals(self, db: Session) -> Dict[str, float]:
+        """Archived figures the live totals leave out, from the counters alone"""
+        totals = {
+            "enrollments": 0,
+            "completed_enrollments": 0,
+            "certifications": 0,
+            "expired_certifications": 0,
+            "training_hours": 0.0
+        }
+        rows = db.query(
+            ArchiveCounter.kind, ArchiveCounter.status,
+            func.sum(ArchiveCounter.row_count), func.sum(ArchiveCounter.training_hours)
+        ).group_by(ArchiveCounter.kind, ArchiveCounter.status).all()
+        for kind, status, row_count, training_hours in rows:
+            totals[f"{kind}s"] += row_count or 0
+            if kind == "enrollment" and status == "completed":
+                totals["completed_enrollments"] += row_count or 0
+                totals["training_hours"] += training_hours or 0.0
+            if kind == "certification" and status == "expired":
+                totals["expired_certifications"] += row_count or 0
+        return totals
+
+    def get_multi(self, db: Session, model, skip: int = 0, limit: int = 100) -> List[Any]:
+        """Live and archived rows of `model` together, in id order"""
+        archive_model, _, _ = ARCHIVES[model]
+        names = [column.name for column in model.__table__.columns]
+        live = db.query(*[getattr(model, name) for name in names])
+        archived = db.query(*[getattr(archive_model, name) for name in names])
+        return live.union_all(archived).order_by(model.id).offset(skip).limit(limit).all()
+
+    def get_total_count(self, db: Session, model) -> int:
+        archive_model, _, _ = ARCHIVES[model]
+        return db.query(model).count() + db.query(archive_model).count()
+
+archive = CRUDArchive()
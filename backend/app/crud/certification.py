@@ -1,8 +1,11 @@
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime, timedelta
 from ..models.certification import Certification
 from ..schemas.certification import CertificationCreate, CertificationUpdate
+from ..events import outbox
+from .archive import archive
 
 class CRUDCertification:
     def get(self, db: Session, id: int) -> Optional[Certification]:
@@ -16,15 +19,44 @@ class CRUDCertification:
         return db.query(Certification).filter(Certification.enrollment_id == enrollment_id).first()
 
 
-    def get_multi(self, db: Session, skip: int = 0, limit: int = 100) -> List[Certification]:
+    def get_multi(self, db: Session, skip: int = 0, limit: int = 100, include_archived: bool = False) -> List[Certification]:
+        if include_archived:
+            return archive.get_multi(db, Certification, skip, limit)
         return db.query(Certification).offset(skip).limit(limit).all()
 
-    def get_total_count(self, db: Session) -> int:
+    def get_total_count(self, db: Session, include_archived: bool = False) -> int:
+        if include_archived:
+            return archive.get_total_count(db, Certification)
         return db.query(Certification).count()
 
+    def stream(
+        self,
+        db: Session,
+        *,
+        updated_since: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Tuple[List[str], Iterator[Row]]:
+        """Iterate certification rows as plain tuples through a server-side cursor (for exports)"""
+        # ORM attributes, not Table columns, so the tenant criteria applies
+        columns = [getattr(Certification, column.key) for column in Certification.__table__.columns]
+        query = db.query(*columns)
+        if updated_since:
+            query = query.filter(Certification.updated_at >= updated_since)
+        rows = query.order_by(Certification.id).yield_per(batch_size)
+        return [column.key for column in columns], iter(rows)
+
     def create(self, db: Session, *, obj_in: CertificationCreate) -> Certification:
         db_obj = Certification(**obj_in.model_dump())
         db.add(db_obj)
+        db.flush()
+        outbox.record(db, "CertificationIssued", "certification", db_obj.id, {
+            "employee_id": db_obj.employee_id,
+            "training_id": db_obj.training_id,
+            "enrollment_id": db_obj.enrollment_id,
+            "cert_number": db_obj.cert_number,
+            "status": db_obj.status,
+            "expires_at": db_obj.expires_at
+        })
         db.commit()
         db.refresh(db_obj)
         return db_obj
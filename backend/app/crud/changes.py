@@ -0,0 +1,123 @@
+# app/crud/changes.py
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+import base64
+import binascii
+import json
+from ..models import Employee, Training, Enrollment, Certification, Tombstone
+from ..schemas.changes import ChangeItem, ChangeFeed
+
+# Entities exposed by the feed, in tie-break order for rows sharing a timestamp
+FEED_MODELS = {
+    "employee": Employee,
+    "training": Training,
+    "enrollment": Enrollment,
+    "certification": Certification,
+}
+
+# Rows touched in the last few seconds are held back until the next poll, so a
+# transaction that committed slightly later with an earlier updated_at is not skipped
+CHANGE_FEED_LAG_SECONDS = 2
+
+EPOCH = datetime(1970, 1, 1)
+
+class CRUDChanges:
+    def encode_token(self, watermarks: Dict[str, Tuple[datetime, int]]) -> str:
+        """Encode per-source (timestamp, id) watermarks into an opaque token"""
+        raw = {source: [ts.isoformat(), row_id] for source, (ts, row_id) in watermarks.items()}
+        return base64.urlsafe_b64encode(json.dumps(raw, sort_keys=True).encode()).decode()
+
+    def decode_token(self, token: Optional[str]) -> Dict[str, Tuple[datetime, int]]:
+        """Decode a token produced by encode_token; raises ValueError if malformed"""
+        watermarks = {source: (EPOCH, 0) for source in list(FEED_MODELS) + ["tombstone"]}
+        if not token:
+            return watermarks
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(token.encode()))
+            for source, (ts, row_id) in raw.items():
+                if source in watermarks:
+                    watermarks[source] = (datetime.fromisoformat(ts), int(row_id))
+        except (binascii.Error, ValueError, TypeError, AttributeError):
+            raise ValueError("Invalid change token")
+        return watermarks
+
+    def _after(self, ts_column, id_column, watermark: Tuple[datetime, int]):
+        """(ts, id) > watermark, written so MySQL can range-scan the (ts, id) index"""
+        ts, row_id = watermark
+        return or_(ts_column > ts, and_(ts_column == ts, id_column > row_id))
+
+    def get_changes(self, db: Session, since: Optional[str] = None, limit: int = 500) -> ChangeFeed:
+        """
+        Return inserts/updates/deletes after the `since` token in (timestamp, id) order.
+        Each source is read with an indexed keyset query and the results are merged,
+        so a poll costs O(limit) per table regardless of table size.
+        """
+        watermarks = self.decode_token(since)
+        horizon = datetime.utcnow() - timedelta(seconds=CHANGE_FEED_LAG_SECONDS)
+
+        # (timestamp, source order, id, source, item)
+        candidates: List[Tuple[datetime, int, int, str, ChangeItem]] = []
+
+        for order, (entity, model) in enumerate(FEED_MODELS.items()):
+            # ORM attributes, not Table columns, so the tenant criteria applies
+            columns = [getattr(model, column.key) for column in model.__table__.columns]
+            rows = (
+                db.query(*columns)
+                .filter(
+                    self._after(model.updated_at, model.id, watermarks[entity]),
+                    model.updated_at <= horizon
+                )
+                .order_by(model.updated_at, model.id)
+                .limit(limit + 1)
+                .all()
+            )
+            for row in rows:
+                data: Dict[str, Any] = dict(row._mapping)
+                candidates.append((
+                    row.updated_at, order, row.id, entity,
+                    ChangeItem(
+                        entity=entity,
+                        id=row.id,
+                        operation="upsert",
+                        changed_at=row.updated_at,
+                        data=data
+                    )
+                ))
+
+        tombstones = (
+            db.query(Tombstone)
+            .filter(
+                self._after(Tombstone.deleted_at, Tombstone.id, watermarks["tombstone"]),
+                Tombstone.deleted_at <= horizon
+            )
+            .order_by(Tombstone.deleted_at, Tombstone.id)
+            .limit(limit + 1)
+            .all()
+        )
+        for tombstone in tombstones:
+            candidates.append((
+                tombstone.deleted_at, len(FEED_MODELS), tombstone.id, "tombstone",
+                ChangeItem(
+                    entity=tombstone.entity_type,
+                    id=tombstone.entity_id,
+                    operation="delete",
+                    changed_at=tombstone.deleted_at
+                )
+            ))
+
+        candidates.sort(key=lambda c: (c[0], c[1], c[2]))
+        page = candidates[:limit]
+
+        # Advance each source's watermark to the last row actually returned
+        for ts, _, row_id, source, _ in page:
+            watermarks[source] = (ts, row_id)
+
+        return ChangeFeed(
+            changes=[item for *_, item in page],
+            next_token=self.encode_token(watermarks),
+            has_more=len(candidates) > limit
+        )
+
+changes = CRUDChanges()
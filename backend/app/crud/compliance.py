@@ -1,13 +1,103 @@
 # app/services/compliance_service.py
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, case, select
 from datetime import datetime, date, timedelta
-from typing import Dict, Any, List
-from ..models import Employee, Department, Training, Enrollment, Certification
-from ..schemas import ComplianceMetrics, DepartmentCompliance, CertificationStatus, UpcomingExpiration, MissingCertification
-import pandas as pd
+from typing import TYPE_CHECKING, Callable, Dict, Any, Iterator, List, Optional, Tuple
+from collections import defaultdict
+from ..models import (
+    Employee, Department, Training, Enrollment, Certification, ExpiryCalendarEntry,
+    ArchivedEnrollment, ArchivedCertification
+)
+from ..cache import report_cache
+from ..data_versions import data_version
+from ..streaming import iter_zip
+from .expiry_calendar import expiry_calendar
+from .department import department as crud_department
+from ..tenancy import tenant_of
+from ..timezones import LocalClock, ZoneClocks
+from ..schemas import ComplianceMetrics, ComplianceSummary, DepartmentCompliance, CertificationStatus, UpcomingExpiration, MissingCertification
 from io import BytesIO
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas, openpyxl, reportlab and pyarrow are imported inside the export methods:
+# most workers never export, and importing them up front costs every worker
+# several hundred ms and tens of MB at startup
+
+MISSING_CERTIFICATION_SORTS = ("days_overdue_desc", "days_overdue_asc")
+
+# Zip-of-sections export formats; parquet and arrow need pyarrow
+COLUMNAR_FORMATS = ("parquet", "arrow", "csv")
+
+# Tables a report is built from; their data version keys the report cache
+REPORT_MODELS = (
+    Employee, Department, Training, Enrollment, Certification, ExpiryCalendarEntry,
+    ArchivedEnrollment, ArchivedCertification
+)
+
+class ComplianceReportContext:
+    """
+    Column-only rows behind one compliance report, loaded once and shared by every section.
+    Rows are plain tuples (no ORM objects), indexed by the keys the sections look up.
+    """
+    def __init__(
+        self,
+        *,
+        clocks: ZoneClocks,
+        department_filter: Optional[str],
+        departments: Dict[int, str],
+        trainings: Dict[int, str],
+        employees: List[Any],
+        certifications: List[Any],
+        enrollments: List[Any]
+    ):
+        self.clocks = clocks
+        self.department_filter = department_filter
+        self.departments = departments
+        self.trainings = trainings
+        self.employees = employees
+        self.certifications = certifications
+        self.enrollments = enrollments
+        
+        self.employees_by_id = {emp.id: emp for emp in employees}
+        self.employees_by_department: Dict[int, List[Any]] = defaultdict(list)
+        for emp in employees:
+            self.employees_by_department[emp.department_id].append(emp)
+        
+        self.certifications_by_employee: Dict[int, List[Any]] = defaultdict(list)
+        for cert in certifications:
+            self.certifications_by_employee[cert.employee_id].append(cert)
+        
+        self.enrollments_by_employee: Dict[int, List[Any]] = defaultdict(list)
+        for enrollment in enrollments:
+            self.enrollments_by_employee[enrollment.employee_id].append(enrollment)
+        
+        self._bounds: Dict[Any, Tuple[datetime, datetime]] = {}
+    
+    def expiry_bounds(self, department_id: Optional[int]) -> Tuple[datetime, datetime]:
+        """
+        (start of today, end of today + 30 days) in the department's zone, as naive UTC:
+        expires_at before the first is expired, between the two is expiring soon
+        """
+        clock = self.clocks.for_department(department_id)
+        bounds = self._bounds.get(clock.tz)
+        if bounds is None:
+            bounds = self._bounds[clock.tz] = (clock.today_start, clock.day_end(clock.today + timedelta(days=30)))
+        return bounds
+    
+    def _has_department(self, employee_id: int) -> bool:
+        employee = self.employees_by_id.get(employee_id)
+        return employee is not None and employee.department_id in self.departments
+    
+    @property
+    def reportable_certifications(self) -> List[Any]:
+        """Certifications with a known training held by an employee in a department"""
+        return [
+            cert for cert in self.certifications
+            if cert.training_id in self.trainings and self._has_department(cert.employee_id)
+        ]
+
 class CRUDCompliance:
     def __init__(self):
         pass
@@ -18,38 +108,184 @@ class CRUDCompliance:
             return dt_or_date.date()
         return dt_or_date
     
-    def get_compliance_report(self, db: Session, filters: Dict[str, Any]) -> ComplianceMetrics:
-        """Generate comprehensive compliance report"""
+    def _date_window(self, filters: Dict[str, Any]) -> Optional[Tuple[datetime, datetime]]:
+        """Parse filters['date_range'] into a [start, end) datetime window, or None for all history"""
+        date_range = filters.get('date_range')
+        if not date_range:
+            return None
         
-        # Get all employees (apply department filter)
-        query = db.query(Employee)
+        try:
+            start = date.fromisoformat(str(date_range['start'])[:10]) if date_range.get('start') else None
+            end = date.fromisoformat(str(date_range['end'])[:10]) if date_range.get('end') else None
+        except (ValueError, TypeError, AttributeError):
+            raise ValueError("date_range must contain start and end dates in YYYY-MM-DD format")
+        
+        if start and end and start > end:
+            raise ValueError("date_range start must be on or before end")
+        
+        # End date is inclusive, so the window runs up to midnight after it
+        return (
+            datetime.combine(start, datetime.min.time()) if start else datetime.min,
+            datetime.combine(end + timedelta(days=1), datetime.min.time()) if end else datetime.max
+        )
+    
+    def _certification_window(self, query, window: Optional[Tuple[datetime, datetime]], model=Certification):
+        """Keep certifications valid at some point in the window (issued before it ends, not expired before it starts)"""
+        if not window:
+            return query
+        start, end = window
+        return query.filter(
+            model.issued_date < end,
+            or_(model.expires_at.is_(None), model.expires_at >= start)
+        )
+    
+    def _enrollment_window(self, query, window: Optional[Tuple[datetime, datetime]], model=Enrollment):
+        """Keep enrollments active at some point in the window (enrolled before it ends, not completed before it starts)"""
+        # enrolled_date is bounded from above only, and not at all for all history, so on
+        # MySQL these prune the enrollments partitions after the window only (app/partitioning.py)
+        if not window:
+            return query
+        start, end = window
+        return query.filter(
+            model.enrolled_date < end,
+            or_(model.completed_date.is_(None), model.completed_date >= start)
+        )
+    
+    def _department_bound(self, clocks: ZoneClocks, bound: Callable[[LocalClock], datetime]):
+        """
+        bound(clock) for the zone of Employee.department_id: a plain value when every
+        department uses the org zone, else a CASE over the few zones in use
+        """
+        zoned = clocks.departments_by_clock()
+        if not zoned:
+            return bound(clocks.org)
+        return case(
+            *[(Employee.department_id.in_(ids), bound(clock)) for clock, ids in zoned],
+            else_=bound(clocks.org)
+        )
+    
+    def _load_report_context(self, db: Session, filters: Dict[str, Any], clocks: ZoneClocks) -> ComplianceReportContext:
+        """
+        Load every table slice the report needs in one query each, with only the columns it uses.
+        Archived enrollments and certifications are included only when filters['include_archived'] is set.
+        """
+        window = self._date_window(filters)
+        department_filter = filters.get('department') if filters.get('department') and filters['department'] != 'all' else None
+        
+        departments = {row.id: row.name for row in db.query(Department.id, Department.name).all()}
+        trainings = {row.id: row.name for row in db.query(Training.id, Training.name).all()}
+        
+        employees_query = db.query(Employee.id, Employee.first_name, Employee.last_name, Employee.department_id)
+        if department_filter:
+            employees_query = employees_query.join(Department, Employee.department_id == Department.id).filter(
+                Department.name == department_filter
+            )
         
-        if filters.get('department') and filters['department'] != 'all':
-            query = query.join(Department).filter(Department.name == filters['department'])
+        def in_department(query, model):
+            if not department_filter:
+                return query
+            return (
+                query
+                .join(Employee, model.employee_id == Employee.id)
+                .join(Department, Employee.department_id == Department.id)
+                .filter(Department.name == department_filter)
+            )
+        
+        def certifications(model):
+            query = db.query(model.id, model.employee_id, model.training_id, model.status, model.expires_at)
+            return self._certification_window(in_department(query, model), window, model).all()
+        
+        def enrollments(model):
+            query = db.query(model.id, model.employee_id, model.training_id, model.status, model.completed_date)
+            return self._enrollment_window(in_department(query, model), window, model).all()
+        
+        certification_rows = certifications(Certification)
+        enrollment_rows = enrollments(Enrollment)
+        if filters.get('include_archived'):
+            certification_rows += certifications(ArchivedCertification)
+            enrollment_rows += enrollments(ArchivedEnrollment)
+        
+        return ComplianceReportContext(
+            clocks=clocks,
+            department_filter=department_filter,
+            departments=departments,
+            trainings=trainings,
+            employees=employees_query.all(),
+            certifications=certification_rows,
+            enrollments=enrollment_rows
+        )
+    
+    def _report_cache_key(self, db: Session, filters: Dict[str, Any], clocks: ZoneClocks) -> Tuple:
+        """Tenant + normalized filters + its data version + today in every zone (expiry figures move with the date)"""
+        department = filters.get('department') or 'all'
+        return (
+            tenant_of(db), department, self._date_window(filters), bool(filters.get('include_archived')),
+            data_version(db, REPORT_MODELS), clocks.today_key()
+        )
+    
+    def get_compliance_report(self, db: Session, filters: Dict[str, Any]) -> ComplianceMetrics:
+        """Generate comprehensive compliance report, served from the report cache when nothing has changed"""
+        clocks = crud_department.clocks(db)
+        key = self._report_cache_key(db, filters, clocks)
+        report = report_cache.get(key)
+        if report is None:
+            report = self._build_compliance_report(db, filters, clocks)
+            report_cache.set(key, report)
+        return report
+    
+    def get_compliance_summary(self, db: Session, filters: Dict[str, Any]) -> ComplianceSummary:
+        """Report headline counts only, without building the per-row sections"""
+        clocks = crud_department.clocks(db)
+        key = self._report_cache_key(db, filters, clocks)
+        report = report_cache.get(key)
+        if report is not None:
+            return ComplianceSummary(
+                **report.model_dump(exclude={'department_compliance', 'certification_status', 'upcoming_expirations', 'missing_certifications'}),
+                upcoming_expirations_count=len(report.upcoming_expirations),
+                missing_certifications_count=len(report.missing_certifications)
+            )
+        
+        summary_key = ("summary",) + key
+        summary = report_cache.get(summary_key)
+        if summary is None:
+            ctx = self._load_report_context(db, filters, clocks)
+            compliance_data = self._calculate_compliance_metrics(ctx)
+            training_stats = self._get_training_statistics(ctx)
+            summary = ComplianceSummary(
+                total_employees=len(ctx.employees),
+                **compliance_data,
+                **training_stats,
+                upcoming_expirations_count=self._upcoming_expirations_query(db, filters, clocks).order_by(None).count(),
+                missing_certifications_count=self._missing_certifications_query(db, filters).order_by(None).count()
+            )
+            report_cache.set(summary_key, summary)
+        return summary
+    
+    def _build_compliance_report(self, db: Session, filters: Dict[str, Any], clocks: ZoneClocks) -> ComplianceMetrics:
+        """Generate comprehensive compliance report"""
         
-        employees = query.all()
-        total_employees = len(employees)
+        ctx = self._load_report_context(db, filters, clocks)
         
         # Calculate compliance metrics
-        compliance_data = self._calculate_compliance_metrics(db, employees)
+        compliance_data = self._calculate_compliance_metrics(ctx)
         
         # Get department-wise compliance
-        department_compliance = self._get_department_compliance(db, filters)
+        department_compliance = self._get_department_compliance(ctx)
         
         # Get certification status
-        certification_status = self._get_certification_status(db, filters)
+        certification_status = self._get_certification_status(ctx)
         
         # Get upcoming expirations
-        upcoming_expirations = self._get_upcoming_expirations(db, filters)
+        upcoming_expirations = self._get_upcoming_expirations(db, filters, clocks)
         
-        # Get missing certifications
-        missing_certifications = self._get_missing_certifications(db, filters)
+        # Get missing certifications (a single anti-join query, see get_missing_certifications)
+        missing_certifications, _ = self.get_missing_certifications(db, filters, clocks=clocks)
         
         # Get training statistics
-        training_stats = self._get_training_statistics(db, filters)
+        training_stats = self._get_training_statistics(ctx)
         
         return ComplianceMetrics(
-            total_employees=total_employees,
+            total_employees=len(ctx.employees),
             compliant_employees=compliance_data['compliant_employees'],
             non_compliant_employees=compliance_data['non_compliant_employees'],
             expiring_soon=compliance_data['expiring_soon'],
@@ -64,54 +300,48 @@ class CRUDCompliance:
             missing_certifications=missing_certifications
         )
     
-    def _calculate_compliance_metrics(self, db: Session, employees: List[Employee]) -> Dict[str, Any]:
+    def _is_compliant(self, certs: List[Any], enrollments: List[Any], today_start: datetime) -> bool:
+        """An employee is compliant if all their certs are valid and all their trainings are completed"""
+        has_valid_certs = all(
+            cert.status == "active" and 
+            (not cert.expires_at or cert.expires_at >= today_start)
+            for cert in certs
+        ) if certs else False
+        
+        has_completed_trainings = all(
+            enrollment.status == "completed" 
+            for enrollment in enrollments
+        ) if enrollments else False
+        
+        return has_valid_certs and has_completed_trainings
+    
+    def _calculate_compliance_metrics(self, ctx: ComplianceReportContext) -> Dict[str, Any]:
         """Calculate overall compliance metrics"""
         
-        today = datetime.now().date()
-        thirty_days_from_now = today + timedelta(days=30)
-        
         compliant_employees = 0
         expiring_soon = 0
         expired_certifications = 0
         
-        for employee in employees:
-            # Get employee certifications
-            certs = db.query(Certification).filter(
-                Certification.employee_id == employee.id
-            ).all()
-            
-            # Check if employee has valid certifications
-            has_valid_certs = all(
-                cert.status == "active" and 
-                (not cert.expires_at or self._to_date(cert.expires_at) >= today)
-                for cert in certs
-            ) if certs else False
+        for employee in ctx.employees:
+            certs = ctx.certifications_by_employee.get(employee.id, [])
+            enrollments = ctx.enrollments_by_employee.get(employee.id, [])
+            # Local day bounds of the employee's department, compared with stored values directly
+            today_start, outlook_end = ctx.expiry_bounds(employee.department_id)
             
             # Check for expiring/expired certs
             has_expiring = any(
                 cert.expires_at and 
-                today <= self._to_date(cert.expires_at) <= thirty_days_from_now 
+                today_start <= cert.expires_at < outlook_end 
                 for cert in certs
             )
 
             has_expired = any(
                 cert.expires_at and 
-                self._to_date(cert.expires_at) < today 
+                cert.expires_at < today_start 
                 for cert in certs
             )
             
-            # Check training completion
-            enrollments = db.query(Enrollment).filter(
-                Enrollment.employee_id == employee.id
-            ).all()
-            
-            has_completed_trainings = all(
-                enrollment.status == "completed" 
-                for enrollment in enrollments
-            ) if enrollments else False
-            
-            # Employee is compliant if they have valid certs and completed trainings
-            if has_valid_certs and has_completed_trainings:
+            if self._is_compliant(certs, enrollments, today_start):
                 compliant_employees += 1
             
             if has_expiring:
@@ -120,8 +350,9 @@ class CRUDCompliance:
             if has_expired:
                 expired_certifications += 1
         
-        non_compliant_employees = len(employees) - compliant_employees
-        overall_compliance_rate = (compliant_employees / len(employees)) * 100 if employees else 0
+        total_employees = len(ctx.employees)
+        non_compliant_employees = total_employees - compliant_employees
+        overall_compliance_rate = (compliant_employees / total_employees) * 100 if total_employees else 0
         
         return {
             'compliant_employees': compliant_employees,
@@ -131,53 +362,31 @@ class CRUDCompliance:
             'overall_compliance_rate': round(overall_compliance_rate, 2)
         }
     
-    def _get_department_compliance(self, db: Session, filters: Dict[str, Any]) -> List[DepartmentCompliance]:
+    def _get_department_compliance(self, ctx: ComplianceReportContext) -> List[DepartmentCompliance]:
         """Get compliance statistics by department"""
         
-        departments = db.query(Department).all()
         department_compliance = []
         
-        for dept in departments:
+        for dept_id, dept_name in ctx.departments.items():
             # Apply department filter
-            if filters.get('department') and filters['department'] != 'all':
-                if dept.name != filters['department']:
-                    continue
+            if ctx.department_filter and dept_name != ctx.department_filter:
+                continue
             
-            employees = db.query(Employee).filter(
-                Employee.department_id == dept.id
-            ).all()
+            employees = ctx.employees_by_department.get(dept_id, [])
             
             if not employees:
                 continue
             
+            today_start, _ = ctx.expiry_bounds(dept_id)
+            
             compliant_count = 0
             completed_trainings_count = 0
             pending_trainings_count = 0
             total_trainings_count = 0
             
             for emp in employees:
-                # Get certifications
-                certs = db.query(Certification).filter(
-                    Certification.employee_id == emp.id
-                ).all()
-                
-                # Get enrollments
-                enrollments = db.query(Enrollment).filter(
-                    Enrollment.employee_id == emp.id
-                ).all()
-                
-                # Check valid certifications
-                has_valid_certs = all(
-                    cert.status == "active" and 
-                    (not cert.expires_at or self._to_date(cert.expires_at) >= datetime.now().date())
-                    for cert in certs
-                ) if certs else False
-                
-                # Check completed trainings
-                has_completed_trainings = all(
-                    enrollment.status == "completed" 
-                    for enrollment in enrollments
-                ) if enrollments else False
+                certs = ctx.certifications_by_employee.get(emp.id, [])
+                enrollments = ctx.enrollments_by_employee.get(emp.id, [])
                 
                 # Count training statistics
                 if enrollments:
@@ -185,14 +394,14 @@ class CRUDCompliance:
                     pending_trainings_count += sum(1 for e in enrollments if e.status in ["enrolled", "in_progress"])
                     total_trainings_count += len(enrollments)
                 
-                if has_valid_certs and has_completed_trainings:
+                if self._is_compliant(certs, enrollments, today_start):
                     compliant_count += 1
 
             compliance_rate = (compliant_count / len(employees)) * 100 if employees else 0
             
             department_compliance.append(
                 DepartmentCompliance(
-                    department=dept.name,
+                    department=dept_name,
                     compliance_rate=round(compliance_rate, 2),
                     total_employees=len(employees),
                     compliant_employees=compliant_count,
@@ -204,30 +413,13 @@ class CRUDCompliance:
         
         return department_compliance
     
-    def _get_certification_status(self, db: Session, filters: Dict[str, Any]) -> List[CertificationStatus]:
+    def _get_certification_status(self, ctx: ComplianceReportContext) -> List[CertificationStatus]:
         """Get certification status statistics"""
         
-        today = datetime.now().date()
-        thirty_days_from_now = today + timedelta(days=30)
-        
-        # Build query
-        query = (
-            db.query(Certification)
-            .join(Training, Certification.training_id == Training.id)
-            .join(Employee, Certification.employee_id == Employee.id)
-            .join(Department, Employee.department_id == Department.id)
-        )
-        
-        # Apply department filter
-        if filters.get('department') and filters['department'] != 'all':
-            query = query.filter(Department.name == filters['department'])
-        
-        certifications = query.all()
-        
         # Group by training name
         cert_by_training = {}
-        for cert in certifications:
-            training_name = cert.training.name if cert.training else "Unknown Training"
+        for cert in ctx.reportable_certifications:
+            training_name = ctx.trainings[cert.training_id]
             
             if training_name not in cert_by_training:
                 cert_by_training[training_name] = []
@@ -238,20 +430,20 @@ class CRUDCompliance:
         for training_name, certs in cert_by_training.items():
             total = len(certs)
             
-            # Count valid certifications
-            valid = sum(1 for cert in certs 
-                       if cert.status == "active" and 
-                       (not cert.expires_at or self._to_date(cert.expires_at) >= today))
-            
-            # Count expiring soon
-            expiring_soon = sum(1 for cert in certs 
-                              if cert.expires_at and 
-                              today <= self._to_date(cert.expires_at) <= thirty_days_from_now)
-            
-            # Count expired
-            expired = sum(1 for cert in certs 
-                         if cert.expires_at and 
-                         self._to_date(cert.expires_at) < today)
+            valid = expiring_soon = expired = 0
+            for cert in certs:
+                # Local day bounds of the holder's department
+                today_start, outlook_end = ctx.expiry_bounds(ctx.employees_by_id[cert.employee_id].department_id)
+                
+                # Count valid certifications
+                if cert.status == "active" and (not cert.expires_at or cert.expires_at >= today_start):
+                    valid += 1
+                
+                # Count expiring soon / expired
+                if cert.expires_at and today_start <= cert.expires_at < outlook_end:
+                    expiring_soon += 1
+                elif cert.expires_at and cert.expires_at < today_start:
+                    expired += 1
             
             compliance_rate = (valid / total) * 100 if total > 0 else 0
             
@@ -268,130 +460,138 @@ class CRUDCompliance:
         
         return certification_status
     
-    def _get_upcoming_expirations(self, db: Session, filters: Dict[str, Any]) -> List[UpcomingExpiration]:
-        """Get certifications expiring soon"""
-        
-        today = datetime.now().date()
-        thirty_days_from_now = today + timedelta(days=30)
-        
-        # Build query
-        query = (
-            db.query(Certification)
-            .join(Training, Certification.training_id == Training.id)
-            .join(Employee, Certification.employee_id == Employee.id)
-            .join(Department, Employee.department_id == Department.id)
-            .filter(
-                and_(
-                    Certification.expires_at >= today,
-                    Certification.expires_at <= thirty_days_from_now
-                )
-            )
+    def _upcoming_expirations_query(self, db: Session, filters: Dict[str, Any], clocks: ZoneClocks, days: int = 30):
+        """
+        Reportable certifications expiring in the next `days` local days of their
+        department (today included), read from the expiry calendar: one range scan
+        per zone in use, over the matching rows only
+        """
+        query = expiry_calendar.due_within(expiry_calendar.entries(db), clocks, days).filter(
+            ExpiryCalendarEntry.department_id.isnot(None)
         )
         
         # Apply department filter
         if filters.get('department') and filters['department'] != 'all':
             query = query.filter(Department.name == filters['department'])
         
-        expiring_certs = query.all()
-        
-        upcoming_expirations = []
-        for cert in expiring_certs:
-            expires_at_date = self._to_date(cert.expires_at)
-            days_until_expiry = (expires_at_date - today).days
-            
-            training_name = cert.training.name if cert.training else "Unknown Training"
-            
-            upcoming_expirations.append(
-                UpcomingExpiration(
-                    id=cert.id,
-                    employee_name=f"{cert.employee.first_name} {cert.employee.last_name}",
-                    certification_name=training_name,
-                    expiry_date=expires_at_date,
-                    days_until_expiry=days_until_expiry,
-                    department=cert.employee.department.name if cert.employee.department else "N/A"
-                )
-            )
-        
-        return sorted(upcoming_expirations, key=lambda x: x.days_until_expiry)
+        return self._certification_window(query, self._date_window(filters))
     
-    def _get_missing_certifications(self, db: Session, filters: Dict[str, Any]) -> List[MissingCertification]:
-        """Get employees missing required certifications"""
-        
-        missing_certifications = []
-        today = datetime.now().date()
+    def _get_upcoming_expirations(self, db: Session, filters: Dict[str, Any], clocks: ZoneClocks) -> List[UpcomingExpiration]:
+        """Get certifications expiring soon, soonest first"""
         
-        # Get all completed enrollments
+        return [
+            self._upcoming_expiration_item(row, clocks)
+            for row in self._upcoming_expirations_query(db, filters, clocks)
+        ]
+    
+    def _upcoming_expiration_item(self, row, clocks: ZoneClocks) -> UpcomingExpiration:
+        """Expiry date and days left are both in the department's zone"""
+        return UpcomingExpiration(
+            id=row.id,
+            employee_name=f"{row.first_name} {row.last_name}",
+            certification_name=row.training_name,
+            expiry_date=row.expiry_date,
+            days_until_expiry=(row.expiry_date - clocks.for_department(row.department_id).today).days,
+            department=row.department_name
+        )
+    
+    def _missing_certifications_query(self, db: Session, filters: Dict[str, Any]):
+        """Completed enrollments with no certification, live or archived, for the same employee and training"""
         query = (
-            db.query(Enrollment)
+            db.query(
+                Enrollment.id,
+                Enrollment.employee_id,
+                Enrollment.completed_date,
+                Employee.department_id,
+                Employee.first_name,
+                Employee.last_name,
+                Training.name.label("training_name"),
+                Department.name.label("department_name")
+            )
             .join(Employee, Enrollment.employee_id == Employee.id)
             .join(Training, Enrollment.training_id == Training.id)
             .join(Department, Employee.department_id == Department.id)
-            .filter(Enrollment.status == "completed")
+            .outerjoin(
+                Certification,
+                and_(
+                    Certification.employee_id == Enrollment.employee_id,
+                    Certification.training_id == Enrollment.training_id
+                )
+            )
+            .filter(
+                Enrollment.status == "completed",
+                Certification.id.is_(None),
+                # An archived (expired or revoked) certification still covers an enrollment that stays live
+                ~select(ArchivedCertification.id).where(
+                    ArchivedCertification.employee_id == Enrollment.employee_id,
+                    ArchivedCertification.training_id == Enrollment.training_id
+                ).exists()
+            )
         )
         
         # Apply department filter
         if filters.get('department') and filters['department'] != 'all':
             query = query.filter(Department.name == filters['department'])
         
-        completed_enrollments = query.all()
-        
-        for enrollment in completed_enrollments:
-            # Check if employee has certification for this training
-            has_cert = (
-                db.query(Certification)
-                .filter(
-                    and_(
-                        Certification.employee_id == enrollment.employee_id,
-                        Certification.training_id == enrollment.training_id
-                    )
-                )
-                .first()
-            )
-            
-            if not has_cert:
-                days_overdue = 0
-                if enrollment.completed_date:
-                    completion_date = self._to_date(enrollment.completed_date)
-                    days_overdue = max(0, (today - completion_date).days - 30)
-                
-                missing_certifications.append(
-                    MissingCertification(
-                        id=enrollment.employee_id,
-                        employee_name=f"{enrollment.employee.first_name} {enrollment.employee.last_name}",
-                        required_certification=enrollment.training.name,
-                        department=enrollment.employee.department.name if enrollment.employee.department else "N/A",
-                        days_overdue=days_overdue
-                    )
-                )
-        
-        return missing_certifications
+        return self._enrollment_window(query, self._date_window(filters))
+    
+    def get_missing_certifications(
+        self,
+        db: Session,
+        filters: Dict[str, Any],
+        *,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        sort: str = "days_overdue_desc",
+        clocks: Optional[ZoneClocks] = None
+    ) -> Tuple[List[MissingCertification], int]:
+        """
+        Get employees missing required certifications, with the total count before paging.
+        Days overdue grows as completed_date gets older, so sorting happens on that column.
+        """
+        clocks = clocks or crud_department.clocks(db)
+        if sort not in MISSING_CERTIFICATION_SORTS:
+            raise ValueError(f"Unsupported sort: {sort}. Use one of: {', '.join(MISSING_CERTIFICATION_SORTS)}")
+        
+        query = self._missing_certifications_query(db, filters)
+        total = query.order_by(None).count()
+        
+        query = self._order_missing_certifications(query, sort).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        
+        return [self._missing_certification_item(row, clocks) for row in query.all()], total
     
-    def _get_training_statistics(self, db: Session, filters: Dict[str, Any]) -> Dict[str, int]:
+    def _order_missing_certifications(self, query, sort: str):
+        """Sort by days overdue; enrollments without a completion date count as 0 days overdue"""
+        if sort == "days_overdue_desc":
+            return query.order_by(Enrollment.completed_date.is_(None), Enrollment.completed_date, Enrollment.id)
+        return query.order_by(Enrollment.completed_date.isnot(None), Enrollment.completed_date.desc(), Enrollment.id)
+    
+    def _missing_certification_item(self, row, clocks: ZoneClocks) -> MissingCertification:
+        """Completion day and today are both in the department's zone"""
+        days_overdue = 0
+        if row.completed_date:
+            clock = clocks.for_department(row.department_id)
+            days_overdue = max(0, (clock.today - clock.local_date(row.completed_date)).days - 30)
+        
+        return MissingCertification(
+            id=row.employee_id,
+            employee_name=f"{row.first_name} {row.last_name}",
+            required_certification=row.training_name,
+            department=row.department_name,
+            days_overdue=days_overdue
+        )
+    
+    def _get_training_statistics(self, ctx: ComplianceReportContext) -> Dict[str, int]:
         """Get training completion statistics"""
         
-        query = db.query(Training)
-        
-        # Note: Training statistics should be calculated based on employees in filtered department
-        total_trainings = query.count()
-        
-        # Get enrollments with department filter
-        enrollments_query = db.query(Enrollment)
-        
-        if filters.get('department') and filters['department'] != 'all':
-            enrollments_query = (
-                enrollments_query
-                .join(Employee, Enrollment.employee_id == Employee.id)
-                .join(Department, Employee.department_id == Department.id)
-                .filter(Department.name == filters['department'])
-            )
-        
-        enrollments = enrollments_query.all()
-        
-        completed_trainings = sum(1 for e in enrollments if e.status == "completed")
-        pending_trainings = sum(1 for e in enrollments if e.status in ["enrolled", "in_progress"])
+        # Note: total trainings is catalogue-wide; completion counts follow the department filter
+        completed_trainings = sum(1 for e in ctx.enrollments if e.status == "completed")
+        pending_trainings = sum(1 for e in ctx.enrollments if e.status in ["enrolled", "in_progress"])
         
         return {
-            'total_trainings': total_trainings,
+            'total_trainings': len(ctx.trainings),
             'completed_trainings': completed_trainings,
             'pending_trainings': pending_trainings
         }
@@ -399,6 +599,8 @@ class CRUDCompliance:
     def export_to_excel(self, db: Session, filters: Dict[str, Any]) -> BytesIO:
         """Export compliance report to Excel (.xlsx format)"""
         try:
+            import pandas as pd
+            
             report = self.get_compliance_report(db, filters)
             output = BytesIO()
             
@@ -541,225 +743,87 @@ class CRUDCompliance:
                 # Return empty bytes as last resort
                 return BytesIO()
             
-    def export_to_pdf(self, db: Session, filters: Dict[str, Any]) -> BytesIO:
-        """Export compliance report to PDF using reportlab"""
+    def report_frames(self, report: ComplianceMetrics) -> Dict[str, "pd.DataFrame"]:
+        """One typed DataFrame per report section (rates stay numeric, dates stay dates)"""
+        import pandas as pd
+        
+        sections = {
+            'department_compliance': (DepartmentCompliance, report.department_compliance),
+            'certification_status': (CertificationStatus, report.certification_status),
+            'upcoming_expirations': (UpcomingExpiration, report.upcoming_expirations),
+            'missing_certifications': (MissingCertification, report.missing_certifications),
+        }
+        
+        summary = report.model_dump(exclude={name for name in sections})
+        frames = {'summary': pd.DataFrame({'metric': list(summary), 'value': [float(v) for v in summary.values()]})}
+        
+        for name, (model, items) in sections.items():
+            # Built column by column so empty sections still carry their schema
+            frames[name] = pd.DataFrame({
+                field: [getattr(item, field) for item in items]
+                for field in model.model_fields
+            })
+        return frames
+    
+    def _serialize_frame(self, frame: "pd.DataFrame", format: str) -> bytes:
+        if format == 'csv':
+            return frame.to_csv(index=False).encode('utf-8')
+        
+        import pyarrow as pa
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        if format == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, sink)
+        else:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    
+    def export_columnar(self, db: Session, filters: Dict[str, Any], format: str) -> Iterator[bytes]:
+        """
+        Export every report section as a parquet/arrow/csv file, streamed as one zip.
+        The report and pyarrow availability are checked up front so errors surface
+        before the response starts.
+        """
+        if format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+        if format != 'csv':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError(f"{format} export requires pyarrow, which is not installed on this server")
+        
+        report = self.get_compliance_report(db, filters)
+        frames = self.report_frames(report)
+        
+        # Parquet is already compressed; arrow IPC and csv deflate well
+        return iter_zip(
+            (f"{name}.{format}", lambda frame=frame: self._serialize_frame(frame, format), format != 'parquet')
+            for name, frame in frames.items()
+        )
+    
+    def preload_export_libraries(self) -> None:
+        """Import the export stack now rather than on the first export (for dedicated export workers)"""
+        import pandas  # noqa: F401
+        import openpyxl  # noqa: F401
+        try:
+            from .. import pdf  # noqa: F401  (reportlab)
+        except ImportError:
+            pass
         try:
-            from reportlab.lib.pagesizes import letter
-            from reportlab.pdfgen import canvas
-            from reportlab.lib import colors
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            pass
+    
+    def export_to_pdf(self, db: Session, filters: Dict[str, Any], full: bool = False) -> BytesIO:
+        """Export compliance report to PDF using reportlab (see app/pdf.py)"""
+        try:
+            from ..pdf import render_compliance_report
             
             # Get compliance report data
             report = self.get_compliance_report(db, filters)
-            
-            # Create PDF in memory
-            buffer = BytesIO()
-            doc = SimpleDocTemplate(
-                buffer, 
-                pagesize=letter,
-                rightMargin=72,
-                leftMargin=72,
-                topMargin=72,
-                bottomMargin=72
-            )
-            
-            styles = getSampleStyleSheet()
-            
-            # Create custom styles
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                spaceAfter=30,
-                alignment=1  # Center alignment
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=16,
-                spaceAfter=12,
-                spaceBefore=20
-            )
-            
-            # Story to hold all elements
-            story = []
-            
-            # Title
-            story.append(Paragraph("Compliance Report", title_style))
-            
-            # Report Period
-            story.append(Paragraph(
-                f"Report Period: {filters.get('date_range', {}).get('start', 'N/A')} to {filters.get('date_range', {}).get('end', 'N/A')}",
-                styles['Normal']
-            ))
-            
-            # Department Filter
-            if filters.get('department') and filters['department'] != 'all':
-                story.append(Paragraph(
-                    f"Department: {filters['department']}",
-                    styles['Normal']
-                ))
-            
-            story.append(Spacer(1, 20))
-            
-            # Summary Section
-            story.append(Paragraph("Summary", heading_style))
-            
-            summary_data = [
-                ['Metric', 'Value'],
-                ['Total Employees', str(report.total_employees)],
-                ['Compliant Employees', str(report.compliant_employees)],
-                ['Non-Compliant Employees', str(report.non_compliant_employees)],
-                ['Overall Compliance Rate', f"{report.overall_compliance_rate}%"],
-                ['Expiring Soon', str(report.expiring_soon)],
-                ['Expired Certifications', str(report.expired_certifications)],
-                ['Total Trainings', str(report.total_trainings)],
-                ['Completed Trainings', str(report.completed_trainings)],
-                ['Pending Trainings', str(report.pending_trainings)],
-            ]
-            
-            summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-            summary_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 12),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ]))
-            story.append(summary_table)
-            
-            # Department Compliance Section
-            if report.department_compliance:
-                story.append(Spacer(1, 20))
-                story.append(Paragraph("Department Compliance", heading_style))
-                
-                dept_data = [['Department', 'Compliance Rate', 'Employees', 'Compliant']]
-                for dept in report.department_compliance:
-                    dept_data.append([
-                        dept.department,
-                        f"{dept.compliance_rate}%",
-                        str(dept.total_employees),
-                        str(dept.compliant_employees)
-                    ])
-                
-                dept_table = Table(dept_data, colWidths=[2*inch, 1.5*inch, 1*inch, 1*inch])
-                dept_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ]))
-                story.append(dept_table)
-            
-            # Certification Status Section
-            if report.certification_status:
-                story.append(Spacer(1, 20))
-                story.append(Paragraph("Certification Status", heading_style))
-                
-                cert_data = [['Certification', 'Total', 'Valid', 'Expiring Soon', 'Expired', 'Rate']]
-                for cert in report.certification_status:
-                    cert_data.append([
-                        cert.certification[:30],  # Limit name length
-                        str(cert.total),
-                        str(cert.valid),
-                        str(cert.expiring_soon),
-                        str(cert.expired),
-                        f"{cert.compliance_rate}%"
-                    ])
-                
-                cert_table = Table(cert_data, colWidths=[2*inch, 0.8*inch, 0.8*inch, 1*inch, 0.8*inch, 0.8*inch])
-                cert_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ]))
-                story.append(cert_table)
-            
-            # Upcoming Expirations Section
-            if report.upcoming_expirations:
-                story.append(Spacer(1, 20))
-                story.append(Paragraph("Upcoming Expirations (Next 30 Days)", heading_style))
-                
-                exp_data = [['Employee', 'Certification', 'Days Left', 'Department']]
-                for exp in report.upcoming_expirations[:10]:  # Limit to 10
-                    exp_data.append([
-                        exp.employee_name,
-                        exp.certification_name[:30],  # Limit name length
-                        str(exp.days_until_expiry),
-                        exp.department
-                    ])
-                
-                exp_table = Table(exp_data, colWidths=[2*inch, 2*inch, 1*inch, 1.5*inch])
-                exp_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ]))
-                story.append(exp_table)
-            
-            # Missing Certifications Section
-            if report.missing_certifications:
-                story.append(Spacer(1, 20))
-                story.append(Paragraph("Missing Required Certifications", heading_style))
-                
-                miss_data = [['Employee', 'Required Certification', 'Department', 'Status']]
-                for miss in report.missing_certifications[:10]:  # Limit to 10
-                    status = f"{miss.days_overdue} days overdue" if miss.days_overdue > 0 else "Missing"
-                    miss_data.append([
-                        miss.employee_name,
-                        miss.required_certification[:30],  # Limit name length
-                        miss.department,
-                        status
-                    ])
-                
-                miss_table = Table(miss_data, colWidths=[2*inch, 2*inch, 1.5*inch, 1.5*inch])
-                miss_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 10),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ]))
-                story.append(miss_table)
-            
-            # Footer
-            story.append(Spacer(1, 20))
-            story.append(Paragraph(
-                f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-                styles['Italic']
-            ))
-            
-            # Build PDF
-            doc.build(story)
-            buffer.seek(0)
-            return buffer
+            return BytesIO(render_compliance_report(report, filters, full=full))
             
         except ImportError:
             # If reportlab is not installed, fall back to Excel
@@ -0,0 +1,254 @@
+# app/crud/compliance_sections.py
+from sqlalchemy import and_, or_, case, func
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+import base64
+import binascii
+import json
+from ..models import Employee, Department, Training, Enrollment, Certification, ExpiryCalendarEntry
+from ..schemas.compliance import (
+    UpcomingExpiration,
+    DepartmentCompliance,
+    UpcomingExpirationPage,
+    DepartmentCompliancePage,
+    MissingCertificationPage,
+)
+from .compliance import compliance, MISSING_CERTIFICATION_SORTS
+from .department import department as crud_department
+
+class CRUDComplianceSections:
+    """
+    Compliance report sections served one page at a time. Filtering, sorting and
+    paging all happen in SQL, and pages are addressed by keyset cursors so deep
+    pages cost the same as the first one.
+    """
+    def encode_cursor(self, values: List[Any]) -> str:
+        raw = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        return base64.urlsafe_b64encode(json.dumps(raw).encode()).decode()
+
+    def decode_cursor(self, cursor: str, size: int) -> List[Any]:
+        """Decode a cursor produced by encode_cursor; raises ValueError if malformed"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        # Every cursor ends with the row id that breaks ties
+        if not isinstance(values, list) or len(values) != size or not isinstance(values[-1], int):
+            raise ValueError("Invalid cursor")
+        return values
+
+    def _parse_datetime(self, value: Optional[str]) -> Optional[datetime]:
+        if value is None:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+
+    def _filter_department(self, query, filters: Dict[str, Any]):
+        if filters.get('department') and filters['department'] != 'all':
+            query = query.filter(Department.name == filters['department'])
+        return query
+
+    def upcoming_expirations(
+        self,
+        db: Session,
+        filters: Dict[str, Any],
+        *,
+        days: int = 30,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> UpcomingExpirationPage:
+        """Certifications expiring within `days` local days of their department, soonest first, keyed on (expires_at, id)"""
+        clocks = crud_department.clocks(db)
+        # Same calendar range scan as the report section
+        query = compliance._upcoming_expirations_query(db, filters, clocks, days)
+
+        if cursor:
+            expires_at, cert_id = self.decode_cursor(cursor, 2)
+            expires_at = self._parse_datetime(expires_at)
+            query = query.filter(or_(
+                ExpiryCalendarEntry.expires_at > expires_at,
+                and_(
+                    ExpiryCalendarEntry.expires_at == expires_at,
+                    ExpiryCalendarEntry.certification_id > cert_id
+                )
+            ))
+
+        rows = query.limit(limit + 1).all()
+        page = rows[:limit]
+
+        items = [compliance._upcoming_expiration_item(row, clocks) for row in page]
+
+        has_more = len(rows) > limit
+        return UpcomingExpirationPage(
+            items=items,
+            next_cursor=self.encode_cursor([page[-1].expires_at, page[-1].id]) if has_more else None,
+            has_more=has_more
+        )
+
+    def missing_certifications(
+        self,
+        db: Session,
+        filters: Dict[str, Any],
+        *,
+        sort: str = "days_overdue_desc",
+        limit: int = 50,
+        skip: int = 0,
+        cursor: Optional[str] = None
+    ) -> MissingCertificationPage:
+        """
+        Missing certifications by days overdue, keyed on (completed_date, enrollment id).
+        `skip` is still honoured for offset paging when no cursor is given.
+        """
+        if sort not in MISSING_CERTIFICATION_SORTS:
+            raise ValueError(f"Unsupported sort: {sort}. Use one of: {', '.join(MISSING_CERTIFICATION_SORTS)}")
+
+        query = compliance._missing_certifications_query(db, filters)
+        total = query.order_by(None).count()
+
+        if cursor:
+            completed_date, enrollment_id = self.decode_cursor(cursor, 2)
+            query = query.filter(self._after_missing(sort, self._parse_datetime(completed_date), enrollment_id))
+
+        query = compliance._order_missing_certifications(query, sort)
+        if skip and not cursor:
+            query = query.offset(skip)
+
+        rows = query.limit(limit + 1).all()
+        page = rows[:limit]
+        clocks = crud_department.clocks(db)
+
+        has_more = len(rows) > limit
+        return MissingCertificationPage(
+            items=[compliance._missing_certification_item(row, clocks) for row in page],
+            total=total,
+            skip=skip,
+            limit=limit,
+            next_cursor=self.encode_cursor([page[-1].completed_date, page[-1].id]) if has_more else None,
+            has_more=has_more
+        )
+
+    def _after_missing(self, sort: str, completed_date: Optional[datetime], enrollment_id: int):
+        """Rows after the cursor in the order produced by _order_missing_certifications"""
+        completed = Enrollment.completed_date
+        if sort == "days_overdue_desc":
+            # completed_date ascending, undated rows last
+            if completed_date is None:
+                return and_(completed.is_(None), Enrollment.id > enrollment_id)
+            return or_(
+                completed.is_(None),
+                completed > completed_date,
+                and_(completed == completed_date, Enrollment.id > enrollment_id)
+            )
+        # Undated rows first, then completed_date descending
+        if completed_date is None:
+            return or_(completed.isnot(None), and_(completed.is_(None), Enrollment.id > enrollment_id))
+        return and_(
+            completed.isnot(None),
+            or_(completed < completed_date, and_(completed == completed_date, Enrollment.id > enrollment_id))
+        )
+
+    def department_compliance(
+        self,
+        db: Session,
+        filters: Dict[str, Any],
+        *,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> DepartmentCompliancePage:
+        """
+        Per-department compliance aggregated in SQL, ordered by department name.
+        An employee is compliant when all their certifications are valid and all their
+        enrollments are completed, exactly as in the full report.
+        """
+        window = compliance._date_window(filters)
+        # Start of today in each employee's department zone
+        today_start = compliance._department_bound(crud_department.clocks(db), lambda clock: clock.today_start)
+
+        cert_query = db.query(
+            Certification.employee_id.label("employee_id"),
+            func.count(Certification.id).label("total"),
+            func.sum(case(
+                (and_(
+                    Certification.status == "active",
+                    or_(Certification.expires_at.is_(None), Certification.expires_at >= today_start)
+                ), 0),
+                else_=1
+            )).label("invalid")
+        ).join(Employee, Employee.id == Certification.employee_id)
+        certs = compliance._certification_window(cert_query, window).group_by(Certification.employee_id).subquery()
+
+        enrollment_query = db.query(
+            Enrollment.employee_id.label("employee_id"),
+            func.count(Enrollment.id).label("total"),
+            func.sum(case((Enrollment.status == "completed", 1), else_=0)).label("completed"),
+            func.sum(case((Enrollment.status.in_(["enrolled", "in_progress"]), 1), else_=0)).label("pending")
+        )
+        enrollments = compliance._enrollment_window(enrollment_query, window).group_by(Enrollment.employee_id).subquery()
+
+        compliant = func.sum(case(
+            (and_(
+                certs.c.total > 0,
+                certs.c.invalid == 0,
+                enrollments.c.total > 0,
+                enrollments.c.completed == enrollments.c.total
+            ), 1),
+            else_=0
+        ))
+        employee_count = func.count(Employee.id)
+        rate = compliant * 100.0 / employee_count
+
+        query = (
+            db.query(
+                Department.id,
+                Department.name,
+                employee_count.label("total_employees"),
+                compliant.label("compliant_employees"),
+                func.coalesce(func.sum(enrollments.c.completed), 0).label("completed_trainings"),
+                func.coalesce(func.sum(enrollments.c.pending), 0).label("pending_trainings"),
+                func.coalesce(func.sum(enrollments.c.total), 0).label("total_trainings")
+            )
+            .join(Employee, Employee.department_id == Department.id)
+            .outerjoin(certs, certs.c.employee_id == Employee.id)
+            .outerjoin(enrollments, enrollments.c.employee_id == Employee.id)
+        )
+        query = self._filter_department(query, filters)
+
+        if cursor:
+            name, dept_id = self.decode_cursor(cursor, 2)
+            query = query.filter(or_(Department.name > name, and_(Department.name == name, Department.id > dept_id)))
+
+        query = query.group_by(Department.id, Department.name)
+        if min_rate is not None:
+            query = query.having(rate >= min_rate)
+        if max_rate is not None:
+            query = query.having(rate <= max_rate)
+
+        rows = query.order_by(Department.name, Department.id).limit(limit + 1).all()
+        page = rows[:limit]
+
+        items = [
+            DepartmentCompliance(
+                department=row.name,
+                compliance_rate=round(int(row.compliant_employees or 0) / row.total_employees * 100, 2),
+                total_employees=row.total_employees,
+                compliant_employees=int(row.compliant_employees or 0),
+                completed_trainings=int(row.completed_trainings),
+                pending_trainings=int(row.pending_trainings),
+                total_trainings=int(row.total_trainings)
+            )
+            for row in page
+        ]
+
+        has_more = len(rows) > limit
+        return DepartmentCompliancePage(
+            items=items,
+            next_cursor=self.encode_cursor([page[-1].name, page[-1].id]) if has_more else None,
+            has_more=has_more
+        )
+
+compliance_sections = CRUDComplianceSections()
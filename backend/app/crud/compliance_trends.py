@@ -0,0 +1,157 @@
+# app/crud/compliance_trends.py
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session
+from typing import Dict, List, Optional, Tuple
+from datetime import date, timedelta
+from ..models import Employee, Department, Certification, ComplianceSnapshot
+from ..schemas.compliance import ComplianceTrendPoint, ComplianceTrendSeries, ComplianceTrends
+from .compliance import compliance
+from .department import department as crud_department
+from ..timezones import LocalClock
+
+BUCKETS = ("day", "week", "month")
+
+class CRUDComplianceTrends:
+    def _bucket_start(self, day: date, bucket: str) -> date:
+        """First day of the bucket a snapshot date falls in"""
+        if bucket == "week":
+            return day - timedelta(days=day.weekday())  # Monday
+        if bucket == "month":
+            return day.replace(day=1)
+        return day
+
+    def _expiry_counts(self, db: Session, day: date) -> Dict[Optional[int], Tuple[int, int]]:
+        """(expiring within 30 days, expired) certification counts per department, in each department's zone"""
+        clocks = crud_department.clocks(db)
+        start_of_day = compliance._department_bound(clocks, lambda clock: clock.day_start(day))
+        # Through the end of day + 30
+        window_end = compliance._department_bound(clocks, lambda clock: clock.day_end(day + timedelta(days=30)))
+
+        rows = db.query(
+            Employee.department_id,
+            func.sum(case(
+                ((Certification.expires_at >= start_of_day) & (Certification.expires_at < window_end), 1),
+                else_=0
+            )),
+            func.sum(case((Certification.expires_at < start_of_day, 1), else_=0))
+        ).join(
+            Employee, Employee.id == Certification.employee_id
+        ).group_by(
+            Employee.department_id
+        ).all()
+
+        return {dept_id: (int(expiring or 0), int(expired or 0)) for dept_id, expiring, expired in rows}
+
+    def snapshot(self, db: Session, day: Optional[date] = None) -> List[ComplianceSnapshot]:
+        """Compute today's compliance figures and store them as one overall row plus one per department"""
+        day = day or LocalClock().today
+        report = compliance.get_compliance_report(db, {"department": "all"})
+        expiry_counts = self._expiry_counts(db, day)
+        department_ids = {name: dept_id for dept_id, name in db.query(Department.id, Department.name).all()}
+
+        overall_finished = report.completed_trainings + report.pending_trainings
+        rows = [
+            ComplianceSnapshot(
+                snapshot_date=day,
+                department_id=None,
+                department_name="all",
+                total_employees=report.total_employees,
+                compliant_employees=report.compliant_employees,
+                compliance_rate=report.overall_compliance_rate,
+                completed_trainings=report.completed_trainings,
+                total_trainings=overall_finished,
+                completion_rate=round(report.completed_trainings / overall_finished * 100, 2) if overall_finished else 0,
+                expiring_soon=sum(expiring for expiring, _ in expiry_counts.values()),
+                expired_certifications=sum(expired for _, expired in expiry_counts.values())
+            )
+        ]
+
+        for dept in report.department_compliance:
+            dept_id = department_ids.get(dept.department)
+            expiring, expired = expiry_counts.get(dept_id, (0, 0))
+            rows.append(ComplianceSnapshot(
+                snapshot_date=day,
+                department_id=dept_id,
+                department_name=dept.department,
+                total_employees=dept.total_employees,
+                compliant_employees=dept.compliant_employees,
+                compliance_rate=dept.compliance_rate,
+                completed_trainings=dept.completed_trainings or 0,
+                total_trainings=dept.total_trainings or 0,
+                completion_rate=round((dept.completed_trainings or 0) / dept.total_trainings * 100, 2) if dept.total_trainings else 0,
+                expiring_soon=expiring,
+                expired_certifications=expired
+            ))
+
+        # Re-running the job for the same day replaces that day's rows
+        db.query(ComplianceSnapshot).filter(ComplianceSnapshot.snapshot_date == day).delete()
+        db.add_all(rows)
+        db.commit()
+        return rows
+
+    def get_trends(
+        self,
+        db: Session,
+        *,
+        start: date,
+        end: date,
+        bucket: str = "month",
+        department: str = "all",
+        include_departments: bool = False
+    ) -> ComplianceTrends:
+        """
+        Read the precomputed series for a date range and bucket it by day/week/month.
+        Each bucket reports the last snapshot taken inside it (end-of-period values).
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unsupported bucket: {bucket}. Use one of: {', '.join(BUCKETS)}")
+        if start > end:
+            raise ValueError("start must be on or before end")
+
+        query = db.query(ComplianceSnapshot).filter(
+            ComplianceSnapshot.snapshot_date >= start,
+            ComplianceSnapshot.snapshot_date <= end
+        )
+
+        if not include_departments:
+            if department == "all":
+                query = query.filter(ComplianceSnapshot.department_id.is_(None))
+            else:
+                dept = db.query(Department.id).filter(Department.name == department).first()
+                if not dept:
+                    raise ValueError(f"Department not found: {department}")
+                query = query.filter(ComplianceSnapshot.department_id == dept.id)
+
+        snapshots = query.order_by(ComplianceSnapshot.snapshot_date).all()
+
+        # series key -> (display name, bucket start -> latest snapshot in bucket)
+        series: Dict[Optional[int], Tuple[str, Dict[date, ComplianceSnapshot]]] = {}
+        for snap in snapshots:
+            name, buckets = series.setdefault(snap.department_id, (snap.department_name, {}))
+            buckets[self._bucket_start(snap.snapshot_date, bucket)] = snap
+            # Keep the most recent name in case a department was renamed
+            series[snap.department_id] = (snap.department_name, buckets)
+
+        result = []
+        for _, (name, buckets) in series.items():
+            result.append(ComplianceTrendSeries(
+                department=name,
+                points=[
+                    ComplianceTrendPoint(
+                        period_start=period_start,
+                        compliance_rate=snap.compliance_rate or 0,
+                        completion_rate=snap.completion_rate or 0,
+                        expiring_soon=snap.expiring_soon or 0,
+                        expired_certifications=snap.expired_certifications or 0,
+                        total_employees=snap.total_employees or 0,
+                        compliant_employees=snap.compliant_employees or 0
+                    )
+                    for period_start, snap in sorted(buckets.items())
+                ]
+            ))
+
+        # Overall series first, then departments alphabetically
+        result.sort(key=lambda s: (s.department != "all", s.department))
+        return ComplianceTrends(bucket=bucket, start=start, end=end, series=result)
+
+compliance_trends = CRUDComplianceTrends()
@@ -3,6 +3,7 @@ from typing import List, Optional
 from datetime import datetime
 from ..models.department import Department
 from ..schemas.department import DepartmentCreate, DepartmentUpdate
+from ..timezones import ZoneClocks
 
 class CRUDDepartment:
     def get(self, db: Session, id: int) -> Optional[Department]:
@@ -34,6 +35,11 @@ class CRUDDepartment:
         db.refresh(db_obj)
         return db_obj
 
+    def clocks(self, db: Session, now: Optional[datetime] = None) -> ZoneClocks:
+        """Per-department local clocks for one request (departments without a timezone use the org zone)"""
+        zones = db.query(Department.id, Department.timezone).filter(Department.timezone.isnot(None)).all()
+        return ZoneClocks(dict(zones), now)
+
     def remove(self, db: Session, *, id: int) -> Optional[Department]:
         obj = db.query(Department).get(id)
         if obj:
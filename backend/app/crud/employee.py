@@ -1,9 +1,15 @@
 # app/crud/employee.py
+from sqlalchemy import insert, Row
 from sqlalchemy.orm import Session, selectinload, joinedload
-from typing import List, Optional
+from pydantic import ValidationError
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
+from itertools import islice
 from ..models.employee import Employee
-from ..schemas.employee import EmployeeCreate, EmployeeUpdate
+from ..models.tombstone import Tombstone
+from ..models.department import Department
+from ..events import outbox
+from ..schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeImportError, EmployeeImportResult
 
 class CRUDEmployee:
     def get(self, db: Session, id: int) -> Optional[Employee]:
@@ -70,6 +76,12 @@ class CRUDEmployee:
     def create(self, db: Session, *, obj_in: EmployeeCreate) -> Employee:
         db_employee = Employee(**obj_in.model_dump())
         db.add(db_employee)
+        db.flush()
+        outbox.record(db, "EmployeeCreated", "employee", db_employee.id, {
+            "employee_id": db_employee.employee_id,
+            "department_id": db_employee.department_id,
+            "is_active": db_employee.is_active
+        })
         db.commit()
         db.refresh(db_employee)
         
@@ -85,6 +97,9 @@ class CRUDEmployee:
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         
+        if update_data:
+            outbox.record(db, "EmployeeUpdated", "employee", db_obj.id, {"changes": update_data})
+        
         db.commit()
         
         # Refresh with department data
@@ -94,7 +109,136 @@ class CRUDEmployee:
         obj = db.query(Employee).get(id)
         if obj:
             db.delete(obj)
+            # Recorded in the same transaction so the change feed sees the delete
+            db.add(Tombstone(entity_type="employee", entity_id=id))
+            outbox.record(db, "EmployeeDeleted", "employee", id, {"employee_id": obj.employee_id})
             db.commit()
         return obj
 
+    def stream(
+        self,
+        db: Session,
+        *,
+        updated_since: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Tuple[List[str], Iterator[Row]]:
+        """Iterate employee rows as plain tuples through a server-side cursor (for exports)"""
+        # ORM attributes, not Table columns, so the tenant criteria applies
+        columns = [getattr(Employee, column.key) for column in Employee.__table__.columns]
+        query = db.query(*columns)
+        if updated_since:
+            query = query.filter(Employee.updated_at >= updated_since)
+        rows = query.order_by(Employee.id).yield_per(batch_size)
+        return [column.key for column in columns], iter(rows)
+
+    def import_rows(
+        self,
+        db: Session,
+        *,
+        rows: Iterable[Dict[str, Any]],
+        chunk_size: int = 500
+    ) -> EmployeeImportResult:
+        """
+        Bulk import employees from an iterable of raw rows (e.g. a csv.DictReader).
+
+        Rows are consumed chunk by chunk so the whole upload never has to sit in
+        memory: each chunk is validated with EmployeeCreate, checked for duplicates
+        with one IN query per unique column, and written with a single multi-row insert.
+        """
+        total_rows = 0
+        imported = 0
+        errors: List[EmployeeImportError] = []
+        # Row numbers start at 2 because line 1 of the CSV is the header
+        numbered = enumerate(rows, start=2)
+
+        while True:
+            chunk = list(islice(numbered, chunk_size))
+            if not chunk:
+                break
+            total_rows += len(chunk)
+
+            # Validate rows with the same schema the single-create endpoint uses
+            valid = []
+            for row_number, raw in chunk:
+                data = {
+                    key.strip(): (value.strip() if isinstance(value, str) else value) or None
+                    for key, value in raw.items() if key
+                }
+                try:
+                    valid.append((row_number, EmployeeCreate(**data)))
+                except ValidationError as e:
+                    errors.append(EmployeeImportError(
+                        row=row_number,
+                        employee_id=data.get("employee_id"),
+                        email=data.get("email"),
+                        errors=[f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()]
+                    ))
+
+            if not valid:
+                continue
+
+            # Set-based duplicate and foreign key checks for the whole chunk
+            emails = {obj.email for _, obj in valid}
+            employee_ids = {obj.employee_id for _, obj in valid}
+            department_ids = {obj.department_id for _, obj in valid if obj.department_id is not None}
+
+            existing_emails = {
+                email for (email,) in
+                db.query(Employee.email).filter(Employee.email.in_(emails)).all()
+            }
+            existing_employee_ids = {
+                employee_id for (employee_id,) in
+                db.query(Employee.employee_id).filter(Employee.employee_id.in_(employee_ids)).all()
+            }
+            known_departments = {
+                dept_id for (dept_id,) in
+                db.query(Department.id).filter(Department.id.in_(department_ids)).all()
+            } if department_ids else set()
+
+            to_insert = []
+            seen_emails = set()
+            seen_employee_ids = set()
+            for row_number, obj in valid:
+                row_errors = []
+                if obj.email in existing_emails:
+                    row_errors.append("Email already registered")
+                elif obj.email in seen_emails:
+                    row_errors.append("Duplicate email in file")
+                if obj.employee_id in existing_employee_ids:
+                    row_errors.append("Employee ID already exists")
+                elif obj.employee_id in seen_employee_ids:
+                    row_errors.append("Duplicate employee ID in file")
+                if obj.department_id is not None and obj.department_id not in known_departments:
+                    row_errors.append(f"Department {obj.department_id} not found")
+
+                if row_errors:
+                    errors.append(EmployeeImportError(
+                        row=row_number,
+                        employee_id=obj.employee_id,
+                        email=obj.email,
+                        errors=row_errors
+                    ))
+                    continue
+
+                seen_emails.add(obj.email)
+                seen_employee_ids.add(obj.employee_id)
+                to_insert.append(obj.model_dump())
+
+            if to_insert:
+                db.execute(insert(Employee), to_insert)
+                # One event per chunk: the multi-row insert doesn't return the new ids
+                outbox.record(db, "EmployeesImported", "employee", None, {
+                    "count": len(to_insert),
+                    "employee_ids": [row["employee_id"] for row in to_insert]
+                })
+                db.commit()
+                imported += len(to_insert)
+
+        return EmployeeImportResult(
+            total_rows=total_rows,
+            imported=imported,
+            failed=total_rows - imported,
+            errors=errors
+        )
+
 employee = CRUDEmployee()
\ No newline at end of file
@@ -1,14 +1,20 @@
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
 from ..models.enrollment import Enrollment
+from ..models.tombstone import Tombstone
+from ..events import outbox
+from .archive import archive
 from ..schemas.enrollment import EnrollmentCreate, EnrollmentUpdate
 
 class CRUDEnrollment:
     def get(self, db: Session, id: int) -> Optional[Enrollment]:
         return db.query(Enrollment).filter(Enrollment.id == id).first()
 
-    def get_multi(self, db: Session, skip: int = 0, limit: int = 100) -> List[Enrollment]:
+    def get_multi(self, db: Session, skip: int = 0, limit: int = 100, include_archived: bool = False) -> List[Enrollment]:
+        if include_archived:
+            return archive.get_multi(db, Enrollment, skip, limit)
         return db.query(Enrollment).offset(skip).limit(limit).all()
 
     def get_by_employee(self, db: Session, employee_id: int):
@@ -19,12 +25,21 @@ class CRUDEnrollment:
         )
 
 
-    def get_total_count(self, db: Session) -> int:
+    def get_total_count(self, db: Session, include_archived: bool = False) -> int:
+        if include_archived:
+            return archive.get_total_count(db, Enrollment)
         return db.query(Enrollment).count()
 
     def create(self, db: Session, *, obj_in: EnrollmentCreate) -> Enrollment:
         db_obj = Enrollment(**obj_in.model_dump())
         db.add(db_obj)
+        db.flush()
+        outbox.record(db, "EnrollmentCreated", "enrollment", db_obj.id, {
+            "employee_id": db_obj.employee_id,
+            "training_id": db_obj.training_id,
+            "status": db_obj.status,
+            "progress": db_obj.progress
+        })
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -32,9 +47,17 @@ class CRUDEnrollment:
     def update(self, db: Session, *, db_obj: Enrollment, obj_in: EnrollmentUpdate) -> Enrollment:
         data = obj_in.model_dump(exclude_unset=True)
         if data:
+            previous_status = db_obj.status
             db_obj.updated_at = datetime.utcnow()
             for field, value in data.items():
                 setattr(db_obj, field, value)
+            outbox.record(db, "EnrollmentUpdated", "enrollment", db_obj.id, {
+                "employee_id": db_obj.employee_id,
+                "training_id": db_obj.training_id,
+                "status": db_obj.status,
+                "previous_status": previous_status,
+                "changes": data
+            })
         db.commit()
         db.refresh(db_obj)
         return db_obj
@@ -43,9 +66,32 @@ class CRUDEnrollment:
         obj = db.query(Enrollment).get(id)
         if obj:
             db.delete(obj)
+            # Recorded in the same transaction so the change feed sees the delete
+            db.add(Tombstone(entity_type="enrollment", entity_id=id))
+            outbox.record(db, "EnrollmentDeleted", "enrollment", id, {
+                "employee_id": obj.employee_id,
+                "training_id": obj.training_id,
+                "status": obj.status
+            })
             db.commit()
         return obj
 
+    def stream(
+        self,
+        db: Session,
+        *,
+        updated_since: Optional[datetime] = None,
+        batch_size: int = 1000
+    ) -> Tuple[List[str], Iterator[Row]]:
+        """Iterate enrollment rows as plain tuples through a server-side cursor (for exports)"""
+        # ORM attributes, not Table columns, so the tenant criteria applies
+        columns = [getattr(Enrollment, column.key) for column in Enrollment.__table__.columns]
+        query = db.query(*columns)
+        if updated_since:
+            query = query.filter(Enrollment.updated_at >= updated_since)
+        rows = query.order_by(Enrollment.id).yield_per(batch_size)
+        return [column.key for column in columns], iter(rows)
+
     # NEW METHOD: Update progress for an enrollment
     def update_progress(self, db: Session, *, enrollment_id: int, progress: int) -> Optional[Enrollment]:
         """Update progress percentage for an enrollment (0-100)"""
@@ -55,6 +101,8 @@ class CRUDEnrollment:
         
         # Clamp progress between 0 and 100
         progress = max(0, min(100, progress))
+        previous_status = obj.status
+        previous_progress = obj.progress
         obj.progress = progress
         
         # Auto-update status based on progress
@@ -65,6 +113,14 @@ class CRUDEnrollment:
             obj.status = "in_progress"
         
         obj.updated_at = datetime.utcnow()
+        outbox.record(db, "EnrollmentProgressed", "enrollment", obj.id, {
+            "employee_id": obj.employee_id,
+            "training_id": obj.training_id,
+            "status": obj.status,
+            "previous_status": previous_status,
+            "progress": progress,
+            "previous_progress": previous_progress
+        })
         db.commit()
         db.refresh(obj)
         return obj
@@ -0,0 +1,230 @@
+# app/crud/expiry_calendar.py
+from sqlalchemy import event, delete, insert, select, inspect, and_, func, or_
+from sqlalchemy.orm import Session
+from typing import Iterable, List, Optional
+from datetime import datetime, timedelta
+from ..models import Employee, Department, Training, Certification, ExpiryCalendarEntry
+from ..data_versions import bump_data_version
+from ..timezones import ORG_TZ, ZoneClocks, get_zone, local_date
+
+# Certification attributes the calendar copies; other changes don't touch it
+TRACKED_ATTRIBUTES = ("expires_at", "status", "employee_id", "training_id")
+
+class CRUDExpiryCalendar:
+    """
+    Certifications bucketed by local expiry day (the department's timezone, else
+    ORG_TIMEZONE), so "expiring in the next N days" (optionally per department) is
+    an index range scan over just the matching rows instead of a scan of
+    certifications classified row by row in Python.
+
+    Rows are refreshed in the same flush as the certification, employee or
+    department change that affects them (see the listener below); rebuild()
+    recreates the table from certifications, e.g. after bulk writes that bypass the ORM.
+    """
+    def entries(self, db: Session):
+        """
+        Query of calendar rows, soonest first, joined with the certification, employee,
+        training and department columns the reports show. Callers add the date range
+        (expiring_by, due_within) and their own filters (status, department, issue window).
+        """
+        return (
+            db.query(
+                ExpiryCalendarEntry.certification_id.label("id"),
+                ExpiryCalendarEntry.expiry_date,
+                ExpiryCalendarEntry.expires_at,
+                ExpiryCalendarEntry.status,
+                ExpiryCalendarEntry.department_id,
+                Employee.first_name,
+                Employee.last_name,
+                Employee.position,
+                Training.name.label("training_name"),
+                Department.name.label("department_name")
+            )
+            # Inner join drops rows whose certification was bulk deleted
+            .join(Certification, Certification.id == ExpiryCalendarEntry.certification_id)
+            .join(Employee, Employee.id == ExpiryCalendarEntry.employee_id)
+            .join(Training, Training.id == ExpiryCalendarEntry.training_id)
+            .outerjoin(Department, Department.id == ExpiryCalendarEntry.department_id)
+            .order_by(
+                ExpiryCalendarEntry.expiry_date,
+                ExpiryCalendarEntry.expires_at,
+                ExpiryCalendarEntry.certification_id
+            )
+        )
+
+    def expiring_by(self, query, until: datetime):
+        """Rows expiring at or before the instant `until`"""
+        # No zone is a day or more ahead of UTC, so the day after until's UTC date bounds every local day
+        return query.filter(
+            ExpiryCalendarEntry.expiry_date <= (until + timedelta(days=1)).date(),
+            ExpiryCalendarEntry.expires_at <= until
+        )
+
+    def expiring_between(self, query, since: datetime, until: datetime):
+        """Rows expiring after the instant `since` and at or before `until`"""
+        # Local days lie within a day of the UTC date either way; bounding expiry_date
+        # on both sides keeps the scan (and on MySQL the partitions read) to the range
+        return query.filter(
+            ExpiryCalendarEntry.expiry_date.between((since - timedelta(days=1)).date(), (until + timedelta(days=1)).date()),
+            ExpiryCalendarEntry.expires_at > since,
+            ExpiryCalendarEntry.expires_at <= until
+        )
+
+    def due_within(self, query, clocks: ZoneClocks, days: int):
+        """
+        Rows expiring in the next `days` local days of their own zone, today included:
+        one expiry_date range per zone in use, each matched on its departments
+        """
+        def window(clock):
+            return ExpiryCalendarEntry.expiry_date.between(clock.today, clock.today + timedelta(days=days - 1))
+
+        zoned = clocks.departments_by_clock()
+        conditions = [and_(ExpiryCalendarEntry.department_id.in_(ids), window(clock)) for clock, ids in zoned]
+        zoned_ids = [department_id for _, ids in zoned for department_id in ids]
+        if zoned_ids:
+            conditions.append(and_(
+                or_(ExpiryCalendarEntry.department_id.is_(None), ExpiryCalendarEntry.department_id.notin_(zoned_ids)),
+                window(clocks.org)
+            ))
+        else:
+            conditions.append(window(clocks.org))
+        return query.filter(or_(*conditions))
+
+    def rebuild(self, db: Session, batch_size: int = 1000) -> int:
+        """Recreate every calendar row from certifications; returns the number of rows"""
+        connection = db.connection()
+        connection.execute(delete(ExpiryCalendarEntry))
+        total = self._insert_from_certifications(connection, None, batch_size)
+        # Core writes on the connection skip the session hooks that bump data versions
+        bump_data_version(connection, None, {"expiry_calendar"})
+        db.commit()
+        return total
+
+    def ensure_built(self, db: Session) -> Optional[int]:
+        """
+        Build the calendar if it is empty but certifications with expiries exist (first
+        start after upgrading), or rebuild it if rows were bucketed in a zone other than
+        the one their department now implies (ORG_TIMEZONE changed since they were written)
+        """
+        if db.query(ExpiryCalendarEntry.certification_id).first() is not None:
+            return self.rebuild(db) if self._stale_zone(db) else None
+        if db.query(Certification.id).filter(Certification.expires_at.isnot(None)).first() is None:
+            return None
+        return self.rebuild(db)
+
+    def _stale_zone(self, db: Session) -> bool:
+        """Whether any row's zone differs from its department's timezone, else the org zone"""
+        # Department timezone changes refresh their rows as they flush, so in practice
+        # this catches rows filed under the org zone after ORG_TIMEZONE changed
+        expected = func.coalesce(func.nullif(Department.timezone, ""), ORG_TZ.zone)
+        return db.query(ExpiryCalendarEntry.certification_id).outerjoin(
+            Department, Department.id == ExpiryCalendarEntry.department_id
+        ).filter(or_(
+            ExpiryCalendarEntry.timezone.is_(None),
+            ExpiryCalendarEntry.timezone != expected
+        )).first() is not None
+
+    def _insert_from_certifications(self, connection, condition, batch_size: int = 1000) -> int:
+        """
+        Insert rows for the certifications matching `condition` (None: all), read in
+        id order in keyset batches so no cursor stays open while inserting
+        """
+        query = (
+            select(
+                Certification.id, Certification.tenant_id, Certification.expires_at, Certification.status,
+                Certification.employee_id, Certification.training_id,
+                Employee.department_id, Department.timezone
+            )
+            .join(Employee, Employee.id == Certification.employee_id)
+            .outerjoin(Department, Department.id == Employee.department_id)
+            .where(Certification.expires_at.isnot(None), Certification.training_id.isnot(None))
+            .order_by(Certification.id)
+            .limit(batch_size)
+        )
+        if condition is not None:
+            query = query.where(condition)
+
+        total = 0
+        last_id = 0
+        while True:
+            rows = connection.execute(query.where(Certification.id > last_id)).all()
+            if not rows:
+                return total
+            zones = {row.timezone: get_zone(row.timezone) for row in rows}
+            connection.execute(insert(ExpiryCalendarEntry), [
+                {
+                    "certification_id": row.id,
+                    "tenant_id": row.tenant_id,
+                    "expiry_date": local_date(row.expires_at, zones[row.timezone]),
+                    "timezone": zones[row.timezone].zone,
+                    "expires_at": row.expires_at,
+                    "status": row.status,
+                    "employee_id": row.employee_id,
+                    "training_id": row.training_id,
+                    "department_id": row.department_id
+                }
+                for row in rows
+            ])
+            total += len(rows)
+            last_id = rows[-1].id
+
+    def refresh(
+        self,
+        connection,
+        certification_ids: Iterable[int] = (),
+        employee_ids: Iterable[int] = (),
+        department_ids: Iterable[int] = ()
+    ) -> None:
+        """
+        Recompute the rows of these certifications, employees and departments from the
+        current tables, on the caller's connection (inside the flush that changed them).
+        Rows whose certification or employee no longer exists are simply not re-added.
+        """
+        certification_ids, employee_ids, department_ids = set(certification_ids), set(employee_ids), set(department_ids)
+        if department_ids:
+            # Rows filed under these departments, including employees who just left them
+            certification_ids |= set(connection.execute(
+                select(ExpiryCalendarEntry.certification_id)
+                .where(ExpiryCalendarEntry.department_id.in_(department_ids))
+            ).scalars())
+
+        stale = []
+        if certification_ids:
+            stale.append(ExpiryCalendarEntry.certification_id.in_(certification_ids))
+        if employee_ids:
+            stale.append(ExpiryCalendarEntry.employee_id.in_(employee_ids))
+        if stale:
+            connection.execute(delete(ExpiryCalendarEntry).where(or_(*stale)))
+
+        self._insert_from_certifications(connection, or_(
+            Certification.id.in_(certification_ids),
+            Certification.employee_id.in_(employee_ids),
+            Employee.department_id.in_(department_ids)
+        ))
+
+expiry_calendar = CRUDExpiryCalendar()
+
+def _changed(obj, attributes) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+def _ids(objects, model, attributes=None) -> List[int]:
+    return [
+        obj.id for obj in objects
+        if isinstance(obj, model) and (attributes is None or _changed(obj, attributes))
+    ]
+
+@event.listens_for(Session, "after_flush")
+def _sync_expiry_calendar(session, flush_context):
+    # History and the new/dirty/deleted sets still describe this flush, and the
+    # flushed rows are visible on the connection, so the refresh reads them back
+    certification_ids = (
+        _ids(session.new, Certification)
+        + _ids(session.dirty, Certification, TRACKED_ATTRIBUTES)
+        + _ids(session.deleted, Certification)
+    )
+    employee_ids = _ids(session.dirty, Employee, ("department_id",)) + _ids(session.deleted, Employee)
+    department_ids = _ids(session.dirty, Department, ("timezone",)) + _ids(session.deleted, Department)
+
+    if certification_ids or employee_ids or department_ids:
+        expiry_calendar.refresh(session.connection(), certification_ids, employee_ids, department_ids)
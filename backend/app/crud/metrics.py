@@ -0,0 +1,87 @@
+# app/crud/metrics.py
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import Dict, Any, Optional
+from datetime import datetime, date, timedelta
+from ..models import Employee, Training, Enrollment, Certification, DailyMetric, ExpiryCalendarEntry
+from .archive import archive
+from .expiry_calendar import expiry_calendar
+# Day boundaries follow the zone the dashboard reports in
+from ..timezones import ORG_TZ, day_start_utc
+
+class CRUDMetrics:
+    def _end_of_day_utc(self, local_date: date) -> datetime:
+        """Naive UTC datetime for the last instant of an org-local calendar day"""
+        return day_start_utc(local_date + timedelta(days=1), ORG_TZ) - timedelta(microseconds=1)
+
+    def compute_totals(self, db: Session, local_date: date) -> Dict[str, Any]:
+        """Compute cumulative totals as they stood at the end of an org-local day"""
+        end_utc = self._end_of_day_utc(local_date)
+
+        def count_up_to(column):
+            # select_from names the entity, so a tenant-scoped session filters the count
+            return db.query(func.count()).select_from(column.class_).filter(column <= end_utc).scalar() or 0
+
+        total_training_hours = db.query(
+            func.sum(Training.duration_hours)
+        ).select_from(Enrollment).join(
+            Training, Training.id == Enrollment.training_id
+        ).filter(
+            Enrollment.status == "completed",
+            Enrollment.completed_date <= end_utc
+        ).scalar() or 0
+
+        expiring_certifications = expiry_calendar.expiring_between(
+            db.query(func.count(ExpiryCalendarEntry.certification_id)).join(
+                Certification, Certification.id == ExpiryCalendarEntry.certification_id
+            ),
+            end_utc, end_utc + timedelta(days=30)
+        ).filter(
+            ExpiryCalendarEntry.status == "active"
+        ).scalar() or 0
+
+        # Archived rows ended before the archive cutoff, so they count towards any recent day
+        archived = archive.totals(db)
+
+        return {
+            "total_employees": count_up_to(Employee.created_at),
+            "total_trainings": count_up_to(Training.created_at),
+            "total_enrollments": count_up_to(Enrollment.enrolled_date) + archived["enrollments"],
+            "completed_enrollments": count_up_to(Enrollment.completed_date) + archived["completed_enrollments"],
+            "total_certifications": count_up_to(Certification.issued_date) + archived["certifications"],
+            "total_training_hours": float(total_training_hours) + archived["training_hours"],
+            "expiring_certifications": expiring_certifications
+        }
+
+    def get_for_date(self, db: Session, local_date: date) -> Optional[DailyMetric]:
+        return db.query(DailyMetric).filter(DailyMetric.metric_date == local_date).first()
+
+    def snapshot(self, db: Session, local_date: date) -> DailyMetric:
+        """Write (or overwrite) the rollup row for an org-local day"""
+        totals = self.compute_totals(db, local_date)
+        db_obj = self.get_for_date(db, local_date)
+        if db_obj:
+            db_obj.updated_at = datetime.utcnow()
+            for field, value in totals.items():
+                setattr(db_obj, field, value)
+        else:
+            db_obj = DailyMetric(metric_date=local_date, **totals)
+            db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def get_or_snapshot(self, db: Session, local_date: date) -> DailyMetric:
+        """Read a day's rollup, computing it once if the daily job hasn't written it yet"""
+        existing = self.get_for_date(db, local_date)
+        if existing:
+            return existing
+        try:
+            return self.snapshot(db, local_date)
+        except IntegrityError:
+            # Another request wrote the same day concurrently
+            db.rollback()
+            return self.get_for_date(db, local_date)
+
+metrics = CRUDMetrics()
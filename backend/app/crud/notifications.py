@@ -0,0 +1,148 @@
+# app/crud/notifications.py
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Set, Tuple
+from datetime import datetime, timedelta
+from ..models import Employee, Department, Training, Certification, NotificationLog, NotificationWatermark
+
+# Days before expiry at which a certification is announced, most urgent first
+NOTIFICATION_THRESHOLDS = (1, 7, 30)
+
+# How far back the very first scan of a threshold looks
+INITIAL_LOOKBACK = timedelta(days=1)
+
+class CRUDNotifications:
+    def watermarks(self, db: Session, now: datetime) -> Dict[int, datetime]:
+        """Scanned-until time per threshold (INITIAL_LOOKBACK before `now` if never scanned)"""
+        stored = dict(db.query(NotificationWatermark.threshold_days, NotificationWatermark.scanned_until).all())
+        return {days: stored.get(days, now - INITIAL_LOOKBACK) for days in NOTIFICATION_THRESHOLDS}
+
+    def advance_watermarks(self, db: Session, now: datetime) -> None:
+        for days in NOTIFICATION_THRESHOLDS:
+            row = db.query(NotificationWatermark).get(days)
+            if row is None:
+                db.add(NotificationWatermark(threshold_days=days, scanned_until=now))
+            else:
+                row.scanned_until = now
+        db.commit()
+
+    def crossed_thresholds(self, db: Session, now: datetime) -> List[Dict]:
+        """
+        Active certifications that crossed a threshold since that threshold's watermark.
+
+        A certification crosses the T-day threshold when now reaches expires_at - T, so
+        each threshold is one indexed range scan on expires_at, (now, now + T], keeping
+        rows past watermark + T. Certifications issued since the watermark that were
+        already inside the threshold are kept through created_at. Each certification
+        is reported once per run, at the most urgent threshold it has reached.
+        """
+        watermarks = self.watermarks(db, now)
+        notices: Dict[int, Dict] = {}
+
+        for days in NOTIFICATION_THRESHOLDS:
+            since = watermarks[days]
+            horizon = now + timedelta(days=days)
+            rows = self._notice_query(db).filter(
+                Certification.status == "active",
+                Certification.expires_at > now,
+                Certification.expires_at <= horizon,
+                or_(
+                    Certification.expires_at > since + timedelta(days=days),
+                    Certification.created_at > since
+                )
+            ).all()
+            for row in rows:
+                # Thresholds run most urgent first, so keep the first match
+                if row.certification_id not in notices:
+                    notices[row.certification_id] = {**row._asdict(), "threshold_days": days}
+
+        return sorted(notices.values(), key=lambda notice: (notice["expires_at"], notice["certification_id"]))
+
+    def _notice_query(self, db: Session):
+        """Certification, employee, training and department columns a notice carries"""
+        return (
+            db.query(
+                Certification.id.label("certification_id"),
+                Certification.tenant_id,
+                Certification.expires_at,
+                Employee.id.label("employee_id"),
+                Employee.first_name,
+                Employee.last_name,
+                Employee.email,
+                Training.name.label("training_name"),
+                Department.id.label("department_id"),
+                Department.name.label("department_name"),
+                Department.manager_email
+            )
+            .join(Employee, Employee.id == Certification.employee_id)
+            .join(Training, Training.id == Certification.training_id)
+            .outerjoin(Department, Department.id == Employee.department_id)
+        )
+
+    def retry_notices(self, db: Session, now: datetime, skip: Iterable[int] = ()) -> List[Dict]:
+        """
+        Notices whose last send failed transiently, for certifications that are still
+        active and unexpired, except those in `skip` (announced afresh this run)
+        """
+        failed = db.query(NotificationLog.certification_id, NotificationLog.threshold_days).filter(
+            NotificationLog.status == "failed"
+        ).all()
+        skip = set(skip)
+        thresholds: Dict[int, int] = {}
+        for certification_id, days in failed:
+            if certification_id not in skip:
+                # Retry at the most urgent threshold that failed
+                thresholds[certification_id] = min(days, thresholds.get(certification_id, days))
+        if not thresholds:
+            return []
+        rows = self._notice_query(db).filter(
+            Certification.id.in_(thresholds),
+            Certification.status == "active",
+            Certification.expires_at > now
+        ).all()
+        return [{**row._asdict(), "threshold_days": thresholds[row.certification_id]} for row in rows]
+
+    def sent_keys(self, db: Session, certification_ids: Iterable[int]) -> Set[Tuple[int, int, str]]:
+        """(certification_id, threshold_days, recipient) already sent, or refused for good, for these certifications"""
+        ids = list(set(certification_ids))
+        if not ids:
+            return set()
+        rows = db.query(
+            NotificationLog.certification_id,
+            NotificationLog.threshold_days,
+            NotificationLog.recipient
+        ).filter(
+            NotificationLog.certification_id.in_(ids),
+            or_(NotificationLog.status.is_(None), NotificationLog.status != "failed")
+        ).all()
+        return {tuple(row) for row in rows}
+
+    def log_sent(self, db: Session, notices: List[Dict], recipient: str, recipient_type: str, status: str = "sent") -> None:
+        """
+        Record one digest's outcome (sent, failed to retry, rejected for good); committed
+        on its own so a later failure can't undo it. A retried digest updates its row.
+        """
+        now = datetime.utcnow()
+        logged = {
+            (row.certification_id, row.threshold_days): row
+            for row in db.query(NotificationLog).filter(
+                NotificationLog.certification_id.in_([notice["certification_id"] for notice in notices]),
+                NotificationLog.recipient == recipient
+            )
+        }
+        for notice in notices:
+            row = logged.get((notice["certification_id"], notice["threshold_days"]))
+            if row is None:
+                row = NotificationLog(
+                    tenant_id=notice["tenant_id"],
+                    certification_id=notice["certification_id"],
+                    threshold_days=notice["threshold_days"],
+                    recipient=recipient,
+                    recipient_type=recipient_type
+                )
+                db.add(row)
+            row.status = status
+            row.sent_at = now
+        db.commit()
+
+notifications = CRUDNotifications()
@@ -0,0 +1,56 @@
+# app/crud/tenant.py
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from ..database import Base
+from ..data_versions import ensure_data_versions
+from ..models.tenant import Tenant
+from ..schemas.tenant import TenantCreate
+from ..tenancy import DEFAULT_TENANT_ID, TenantScoped
+
+class CRUDTenant:
+    def get(self, db: Session, id: int) -> Optional[Tenant]:
+        return db.query(Tenant).filter(Tenant.id == id).first()
+
+    def get_by_slug(self, db: Session, slug: str) -> Optional[Tenant]:
+        return db.query(Tenant).filter(Tenant.slug == slug.strip().lower()).first()
+
+    def get_multi(self, db: Session) -> List[Tenant]:
+        return db.query(Tenant).order_by(Tenant.id).all()
+
+    def ids(self, db: Session) -> List[int]:
+        return [id for (id,) in db.query(Tenant.id).order_by(Tenant.id).all()]
+
+    def create(self, db: Session, *, obj_in: TenantCreate) -> Tenant:
+        db_obj = Tenant(**obj_in.model_dump())
+        db.add(db_obj)
+        db.flush()
+        ensure_data_versions(db.connection())
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def ensure_default(self, db: Session) -> int:
+        """
+        Create the default tenant if missing, assign it every row without a tenant
+        (rows written before tenants existed) and add any missing data version rows.
+        Returns the number of rows backfilled.
+        """
+        if self.get(db, DEFAULT_TENANT_ID) is None:
+            db.add(Tenant(id=DEFAULT_TENANT_ID, slug="default", name="Default"))
+            db.flush()
+
+        backfilled = 0
+        for mapper in Base.registry.mappers:
+            if not issubclass(mapper.class_, TenantScoped):
+                continue
+            table = mapper.local_table
+            result = db.execute(
+                update(table).where(table.c.tenant_id.is_(None)).values(tenant_id=DEFAULT_TENANT_ID)
+            )
+            backfilled += result.rowcount or 0
+        ensure_data_versions(db.connection())
+        db.commit()
+        return backfilled
+
+tenant = CRUDTenant()
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
 from ..models.training import Training
+from ..models.tombstone import Tombstone
 from ..schemas.training import TrainingCreate, TrainingUpdate
 
 class CRUDTraining:
@@ -36,6 +37,8 @@ class CRUDTraining:
         obj = db.query(Training).get(id)
         if obj:
             db.delete(obj)
+            # Recorded in the same transaction so the change feed sees the delete
+            db.add(Tombstone(entity_type="training", entity_id=id))
             db.commit()
         return obj
 
@@ -0,0 +1,116 @@
+# app/data_versions.py
+"""
+Per-tenant data versions: one counter row per (tenant, table) in data_versions.
+
+Every write to a versioned table bumps its tenant's counter in the same transaction,
+so the version moves exactly when the write commits, for every worker and for the
+app.jobs processes alike. Reading a version is one lookup on the unique
+(tenant_id, table_name) index, whatever the size of the tables.
+
+    flushes    after_flush bumps the tables of the new, dirty and deleted objects,
+               each for the object's tenant
+    bulk DML   insert()/update()/delete() run through a session (query().delete()
+               included) bump the statement's table: for the session's tenant, or
+               for every tenant when the session is unscoped
+    Core       writes on a raw connection call bump_data_version() themselves
+               (expiry_calendar.rebuild)
+
+Bumping holds the counter row's lock until commit, so concurrent writers to one
+tenant's table queue on it; readers are never blocked.
+"""
+from typing import Dict, Iterable, Optional, Set
+
+from sqlalchemy import and_, event, insert, inspect, literal, select, update
+from sqlalchemy.orm import Session
+
+from .models import DataVersion, Tenant
+
+# Tables whose version keys cached reports (crud.compliance.REPORT_MODELS) and ETags (conditional_get)
+VERSIONED_TABLES = frozenset({
+    "employees", "departments", "trainings", "enrollments", "certifications",
+    "expiry_calendar", "archived_enrollments", "archived_certifications",
+})
+
+# Tables rewritten by another table's flush: the expiry calendar listener refreshes
+# its rows in the flush that changes certifications, employees or departments
+DERIVED_TABLES = {
+    "certifications": {"expiry_calendar"},
+    "employees": {"expiry_calendar"},
+    "departments": {"expiry_calendar"},
+}
+
+_versions = DataVersion.__table__
+
+
+def data_version(db: Session, models) -> str:
+    """Version of the given models' tables, read through the session (its tenant only; every tenant if unscoped)"""
+    names = [model.__tablename__ for model in models]
+    unversioned = set(names) - VERSIONED_TABLES
+    if unversioned:
+        raise ValueError(f"Tables without a data version: {', '.join(sorted(unversioned))}")
+    rows = db.query(DataVersion.tenant_id, DataVersion.table_name, DataVersion.version).filter(
+        DataVersion.table_name.in_(names)
+    ).order_by(DataVersion.tenant_id, DataVersion.table_name).all()
+    return "|".join(f"{tenant_id}:{table_name}:{version}" for tenant_id, table_name, version in rows)
+
+
+def ensure_data_versions(connection) -> None:
+    """Add the missing counter rows of every tenant, so bumps are plain updates"""
+    for name in sorted(VERSIONED_TABLES):
+        missing = select(Tenant.id, literal(name), literal(0)).where(
+            ~select(_versions.c.id).where(and_(
+                _versions.c.tenant_id == Tenant.id,
+                _versions.c.table_name == name
+            )).exists()
+        )
+        connection.execute(insert(_versions).from_select(["tenant_id", "table_name", "version"], missing))
+
+
+def bump_data_version(connection, tenant_id: Optional[int], tables: Iterable[str]) -> None:
+    """Move the version of these tables for one tenant (None: every tenant), inside the caller's transaction"""
+    names = set(tables) & VERSIONED_TABLES
+    if not names:
+        return
+    bump = update(_versions).where(_versions.c.table_name.in_(names)).values(version=_versions.c.version + 1)
+    if tenant_id is None:
+        connection.execute(bump)
+        return
+    result = connection.execute(bump.where(_versions.c.tenant_id == tenant_id))
+    if result.rowcount < len(names):
+        # A tenant created outside crud.tenant has no rows yet
+        existing = set(connection.execute(
+            select(_versions.c.table_name).where(_versions.c.tenant_id == tenant_id, _versions.c.table_name.in_(names))
+        ).scalars())
+        connection.execute(insert(_versions), [
+            {"tenant_id": tenant_id, "table_name": name, "version": 1} for name in sorted(names - existing)
+        ])
+
+
+def _written_tables(session: Session) -> Dict[Optional[int], Set[str]]:
+    scoped_tenant = session.info.get("tenant_id")
+    written: Dict[Optional[int], Set[str]] = {}
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        name = getattr(obj, "__tablename__", None)
+        if name not in VERSIONED_TABLES:
+            continue
+        # Read from the loaded state: attribute access could reload a deleted row
+        tenant_id = scoped_tenant if scoped_tenant is not None else inspect(obj).dict.get("tenant_id")
+        written.setdefault(tenant_id, set()).update({name} | DERIVED_TABLES.get(name, set()))
+    return written
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_tables(session, flush_context):
+    for tenant_id, tables in _written_tables(session).items():
+        bump_data_version(session.connection(), tenant_id, tables)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_bulk_tables(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    name = getattr(table, "name", None)
+    if name in VERSIONED_TABLES:
+        session = orm_execute_state.session
+        bump_data_version(session.connection(), session.info.get("tenant_id"), {name} | DERIVED_TABLES.get(name, set()))
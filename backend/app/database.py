@@ -1,7 +1,10 @@
 import os
-from sqlalchemy import create_engine
+from fastapi import Depends
+from sqlalchemy import Index, UniqueConstraint, create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from dotenv import load_dotenv
+from .dependecies import get_tenant_id
+from .tenancy import scope
 
 load_dotenv()
 
@@ -27,9 +30,58 @@ engine = create_engine(
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 Base = declarative_base()
 
+def upgrade_schema():
+    """
+    Add nullable columns and indexes declared on the models that are missing from
+    existing tables. create_all() only creates brand new tables, so columns and
+    indexes added to a model later would otherwise never reach an existing database.
+
+    Unique keys the models no longer declare (e.g. `email`, now unique per tenant as
+    (tenant_id, email)) and ix_ indexes they replaced are dropped, or the old global
+    rule would keep rejecting rows that are valid in another tenant.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            # Only nullable columns can be added without a backfill
+            if column.name not in existing_columns and column.nullable:
+                column_type = column.type.compile(dialect=engine.dialect)
+                with engine.begin() as connection:
+                    connection.execute(text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type} NULL"
+                    ))
+        existing_indexes = inspector.get_indexes(table.name)
+        declared_names = {index.name for index in table.indexes}
+        declared_unique = {
+            tuple(column.name for column in constraint.columns)
+            for constraint in list(table.indexes) + list(table.constraints)
+            if isinstance(constraint, UniqueConstraint) or (isinstance(constraint, Index) and constraint.unique)
+        }
+        for index in existing_indexes:
+            columns = tuple(index["column_names"])
+            stale = (
+                (index.get("unique") and columns not in declared_unique)
+                or (index["name"].startswith("ix_") and index["name"] not in declared_names)
+            )
+            if stale and all(name in table.c for name in columns):
+                try:
+                    Index(index["name"], *[table.c[name] for name in columns]).drop(bind=engine)
+                except Exception as e:
+                    # e.g. MySQL refuses while the index backs a foreign key
+                    print(f"Could not drop stale index {index['name']} on {table.name}: {e}")
+        existing_names = {index["name"] for index in existing_indexes}
+        for index in table.indexes:
+            if index.name not in existing_names:
+                index.create(bind=engine)
+
 # Dependency
-def get_db():
-    db = SessionLocal()
+def get_db(tenant_id: int = Depends(get_tenant_id)):
+    """Session scoped to the tenant of the request's token (see app/tenancy.py)"""
+    db = scope(SessionLocal(), tenant_id)
     try:
         yield db
     finally:
@@ -1,39 +1,95 @@
 # dependencies.py
-from datetime import datetime  # ← Add this import
-from fastapi import Depends, HTTPException, status
+import os
+from typing import Optional
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-from .routes.auth import SECRET_KEY, ALGITHM
+from .cache import LRUCache
+from .security import SECRET_KEY, ALGITHM
+from .tenancy import DEFAULT_TENANT_ID, claim_tenant
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+# Verified token -> payload. Entries expire at the token's own `exp`, so a cached
+# token is never accepted for longer than jwt.decode would accept it
+token_cache = LRUCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "1024")))
+
+def verify_token(token: str) -> dict:
     """
-    Common dependency to verify and decode JWT token for all protected routes
+    Verify a JWT and return its payload, raising 401 if it is invalid.
+    Tokens that already passed verification are served from token_cache.
     """
-    token = credentials.credentials
+    payload = token_cache.get(token)
+    if payload is not None:
+        return payload
+
     try:
+        # jwt.decode verifies the signature and rejects expired tokens (exp is UTC epoch seconds)
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGITHM])
-        email = payload.get("sub")
-        exp = payload.get("exp")
-        
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload"
-            )
-            
-        # Check if token is expired
-        if exp and datetime.utcnow() > datetime.fromtimestamp(exp):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has expired"
-            )
-            
-        return payload
-        
     except JWTError as e:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=f"Invalid token: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+    if payload.get("sub") is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload"
+        )
+
+    # Tokens without an expiry are verified on every request rather than cached forever
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(token, payload, expires_at=exp)
+
+    return payload
+
+def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """
+    Common dependency to verify and decode JWT token for all protected routes
+    """
+    return verify_token(credentials.credentials)
+
+def get_tenant_admin(current_user: dict = Depends(get_current_user)):
+    """
+    Like get_current_user, but only for tokens of the default tenant, which administers
+    the others (creating and listing tenants); other tenants' tokens get 403
+    """
+    if claim_tenant(current_user) != DEFAULT_TENANT_ID:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Tenant administration requires a default-tenant token"
+        )
+    return current_user
+
+def get_stream_user(
+    token: Optional[str] = Query(None, description="JWT for clients that cannot set headers (EventSource)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
+    """
+    Like get_current_user, but also accepts the token as a ?token= query parameter,
+    since browsers' EventSource cannot send an Authorization header
+    """
+    if credentials is not None:
+        return verify_token(credentials.credentials)
+    if token:
+        return verify_token(token)
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Not authenticated"
+    )
+
+def get_tenant_id(request: Request) -> int:
+    """
+    Tenant of the request's token (Authorization header, or ?token= for event streams).
+    get_db scopes the request's session to it. Requests without a token get the
+    default tenant; protected routes reject them through get_current_user anyway.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = request.query_params.get("token")
+    if not token:
+        return DEFAULT_TENANT_ID
+    return claim_tenant(verify_token(token))
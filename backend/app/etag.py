@@ -0,0 +1,58 @@
+# app/etag.py
+import hashlib
+from typing import Dict
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from .data_versions import data_version
+from .database import get_db
+from .dependecies import get_current_user
+from .tenancy import tenant_of
+from .timezones import LocalClock
+
+# Clients must revalidate every time, and shared caches must not store per-user responses
+CACHE_CONTROL = "private, no-cache"
+
+
+def conditional_get(*models, daily: bool = False):
+    """
+    Dependency factory for strong ETags on read endpoints.
+
+    The tag hashes the request (path, query, encoding) with the data version of the
+    tables the response is built from, so it is computed without running the endpoint's
+    own queries. A matching If-None-Match short-circuits with 304 Not Modified.
+    `daily` adds the org-local date for responses with day-relative figures (the dashboard).
+
+    Returns the validator headers; endpoints that return a Response must pass them on.
+    """
+    def dependency(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        current_user: dict = Depends(get_current_user)
+    ) -> Dict[str, str]:
+        parts = [
+            # Tenants can have identical data versions; their tags must still differ
+            str(tenant_of(db)),
+            request.url.path,
+            str(sorted(request.query_params.multi_items())),
+            request.headers.get("accept-encoding", ""),
+            data_version(db, models),
+        ]
+        if daily:
+            parts.append(LocalClock().today.isoformat())
+        etag = '"' + hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32] + '"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            # If-None-Match uses weak comparison, so W/ prefixes added by proxies still match
+            candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in candidates or "*" in candidates:
+                raise HTTPException(status_code=304, headers=headers)
+
+        response.headers.update(headers)
+        return headers
+
+    return dependency
@@ -0,0 +1,18 @@
+from .bus import Event, EventBus, Subscription, RESYNC, dashboard_bus
+from .outbox import record
+from .dispatcher import OutboxDispatcher, outbox_dispatcher
+from . import dashboard as dashboard_events
+
+# The dashboard stream only serves this process's open connections, so it
+# follows the outbox live instead of keeping a stored offset
+outbox_dispatcher.register(
+    "dashboard_stream",
+    dashboard_events.handle,
+    event_types=dashboard_events.EVENT_TYPES,
+    durable=False
+)
+
+__all__ = [
+    "Event", "EventBus", "Subscription", "RESYNC", "dashboard_bus",
+    "record", "OutboxDispatcher", "outbox_dispatcher", "dashboard_events"
+]
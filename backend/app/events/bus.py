@@ -0,0 +1,101 @@
+# app/events/bus.py
+import asyncio
+import itertools
+import os
+import threading
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Set
+
+# Events a slow subscriber may fall behind by before it is told to resync
+SUBSCRIBER_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "256"))
+
+
+class Event(NamedTuple):
+    id: int
+    type: str
+    data: Dict[str, Any]
+
+
+# Sent in place of the backlog when a subscriber's queue overflows; the client
+# should re-fetch the full state and carry on from the next event
+RESYNC = "resync"
+
+
+class Subscription:
+    """One subscriber's queue, owned by the event loop it was created on"""
+
+    def __init__(self, bus: "EventBus", loop: asyncio.AbstractEventLoop, maxsize: int, channel: Hashable = None):
+        self._bus = bus
+        self._loop = loop
+        self.channel = channel
+        self._queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize)
+
+    def _deliver(self, event: Event) -> None:
+        # Runs on the subscriber's loop
+        if self._queue.full():
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            event = Event(event.id, RESYNC, {})
+        self._queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event, or None if nothing arrived within `timeout` seconds"""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._bus.unsubscribe(self)
+
+
+class EventBus:
+    """
+    In-process publish/subscribe fan-out.
+
+    publish() may be called from any thread (sync CRUD code runs in the threadpool);
+    each event is handed to every subscriber's own event loop, so delivery costs one
+    queue put per open connection and no extra work per subscriber. Events only reach
+    subscribers of the channel they were published on (the dashboard uses one per
+    tenant) and subscribers without a channel, which see every event.
+    """
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, channel: Hashable = None) -> Subscription:
+        """Register a subscriber; must be called from inside a running event loop"""
+        subscription = Subscription(self, asyncio.get_running_loop(), self.queue_size, channel)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, type: str, data: Dict[str, Any], channel: Hashable = None) -> Event:
+        with self._lock:
+            event = Event(next(self._ids), type, data)
+            subscribers = [
+                subscription for subscription in self._subscribers
+                if subscription.channel is None or subscription.channel == channel
+            ]
+        for subscription in subscribers:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._deliver, event)
+            except RuntimeError:
+                # The subscriber's loop has shut down without unsubscribing
+                self.unsubscribe(subscription)
+        return event
+
+
+# Live dashboard deltas, consumed by GET /api/dashboard/stream
+dashboard_bus = EventBus()
@@ -0,0 +1,178 @@
+# app/events/dashboard.py
+"""
+Dashboard deltas derived from outbox events.
+
+The dashboard stream is a live consumer of the outbox: each domain event becomes the
+pieces of /api/dashboard/dashboard-data it changes, so open dashboards patch their
+state instead of re-fetching it:
+
+    stats     {"changes": {"total_employees": 1, ...}}   counters to add
+    alert     a CertificationAlertItem for a new certification inside the 30 day outlook
+    progress  a TrainingProgressItem for a created or updated enrollment
+
+Derived figures (growth and completion percentages, status distribution) are left to
+the next full fetch. Nothing is loaded while no dashboard is connected. Deltas
+are published on the event's tenant channel, so dashboards only see their own tenant.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models import Certification, Enrollment, Training
+from ..models.outbox import OutboxEvent
+from ..timezones import LocalClock, get_zone, local_date, format_date
+from .bus import dashboard_bus
+
+ACTIVE_STATUSES = ("enrolled", "in_progress")
+
+EVENT_TYPES = (
+    "EmployeeCreated",
+    "EmployeesImported",
+    "EmployeeDeleted",
+    "EnrollmentCreated",
+    "EnrollmentUpdated",
+    "EnrollmentProgressed",
+    "EnrollmentDeleted",
+    "CertificationIssued",
+)
+
+Delta = Tuple[str, Dict[str, Any]]
+
+
+def _stats(**changes: float) -> List[Delta]:
+    changes = {name: value for name, value in changes.items() if value}
+    return [("stats", {"changes": changes})] if changes else []
+
+
+def _avatar_url(employee) -> str:
+    first_initial = employee.first_name[0] if employee.first_name else 'E'
+    last_initial = employee.last_name[0] if employee.last_name else 'm'
+    return f"https://ui-avatars.com/api/?name={first_initial}{last_initial}&background=random&color=fff&size=40"
+
+
+def _full_name(employee, fallback: str = "Unknown Employee") -> str:
+    return f"{employee.first_name or ''} {employee.last_name or ''}".strip() or fallback
+
+
+def _iso_date(value) -> Optional[str]:
+    return value.date().isoformat() if value else None
+
+
+def _training_hours(db: Session, training_id: Optional[int]) -> float:
+    training = db.get(Training, training_id) if training_id else None
+    return (training.duration_hours or 0) if training else 0
+
+
+def _progress_item(enrollment: Enrollment, clock: Optional[LocalClock] = None) -> Dict[str, Any]:
+    employee = enrollment.employee
+    training = enrollment.training
+    # Same boundary as /dashboard-data: overdue once the end date is before today (org timezone)
+    clock = clock or LocalClock()
+    is_overdue = (
+        enrollment.end_date is not None
+        and enrollment.end_date < clock.day_start(clock.today)
+        and enrollment.status not in ("completed", "cancelled")
+    )
+    return {
+        "id": str(enrollment.id),
+        "name": _full_name(employee),
+        "role": employee.position or "Employee",
+        "avatarUrl": _avatar_url(employee),
+        "trainingName": training.name or "Unknown Training",
+        "progress": min(100, max(0, enrollment.progress or 0)),
+        "status": "overdue" if is_overdue else (enrollment.status or "enrolled"),
+        "startDate": _iso_date(enrollment.start_date),
+        "endDate": _iso_date(enrollment.end_date),
+        "deadline": _iso_date(enrollment.end_date),
+        "completionDate": _iso_date(enrollment.completed_date),
+    }
+
+
+def _progress(db: Session, enrollment_id: int) -> List[Delta]:
+    # Current state of the row; it may have been deleted since the event
+    enrollment = db.get(Enrollment, enrollment_id)
+    if enrollment is None or enrollment.employee is None or enrollment.training is None:
+        return []
+    return [("progress", _progress_item(enrollment))]
+
+
+def _enrollment_changed(db: Session, event: OutboxEvent) -> List[Delta]:
+    payload = event.payload
+    status, previous_status = payload.get("status"), payload.get("previous_status")
+    hours = 0.0
+    if status != previous_status and "completed" in (status, previous_status):
+        sign = 1 if status == "completed" else -1
+        hours = sign * _training_hours(db, payload.get("training_id"))
+    active_change = int(status in ACTIVE_STATUSES) - int(previous_status in ACTIVE_STATUSES)
+    return _stats(active_enrollments=active_change, total_training_hours=hours) + _progress(db, event.aggregate_id)
+
+
+def _certification_issued(db: Session, event: OutboxEvent) -> List[Delta]:
+    certification = db.get(Certification, event.aggregate_id)
+    if certification is None:
+        return _stats(total_certifications=1)
+
+    now_utc = datetime.utcnow()
+    expires_at = certification.expires_at
+    outlook_end = now_utc + timedelta(days=30)
+    expiring = (
+        certification.status == "active"
+        and expires_at is not None
+        and now_utc < expires_at <= outlook_end
+    )
+    deltas = _stats(total_certifications=1, expiring_certifications=int(expiring))
+
+    # Same categories as the dashboard's certification alerts
+    if expires_at is None or expires_at > outlook_end or certification.status not in ("active", "expired"):
+        return deltas
+    if certification.status == "expired" or expires_at < now_utc:
+        status = "expired"
+    elif expires_at <= now_utc + timedelta(days=7):
+        status = "expiring_soon"
+    else:
+        status = "expiring_later"
+
+    employee = certification.employee
+    department = employee.department
+    return deltas + [("alert", {
+        "id": str(certification.id),
+        "name": _full_name(employee),
+        "role": employee.position or "Employee",
+        "department": department.name if department else "Unassigned",
+        "certificationName": certification.training.name or "Unknown Certification",
+        "expiryDate": format_date(local_date(expires_at, get_zone(department.timezone if department else None))),
+        "status": status,
+        "avatarUrl": _avatar_url(employee),
+    })]
+
+
+def deltas_for(db: Session, event: OutboxEvent) -> List[Delta]:
+    payload = event.payload
+    if event.event_type == "EmployeeCreated":
+        return _stats(total_employees=1)
+    if event.event_type == "EmployeesImported":
+        return _stats(total_employees=payload.get("count", 0))
+    if event.event_type == "EmployeeDeleted":
+        return _stats(total_employees=-1)
+    if event.event_type == "EnrollmentCreated":
+        active = int(payload.get("status") in ACTIVE_STATUSES)
+        return _stats(active_enrollments=active) + _progress(db, event.aggregate_id)
+    if event.event_type in ("EnrollmentUpdated", "EnrollmentProgressed"):
+        return _enrollment_changed(db, event)
+    if event.event_type == "EnrollmentDeleted":
+        status = payload.get("status")
+        hours = -_training_hours(db, payload.get("training_id")) if status == "completed" else 0
+        return _stats(active_enrollments=-int(status in ACTIVE_STATUSES), total_training_hours=hours)
+    if event.event_type == "CertificationIssued":
+        return _certification_issued(db, event)
+    return []
+
+
+def handle(db: Session, events: List[OutboxEvent]) -> None:
+    """Outbox handler: publish each event's deltas to the dashboard stream"""
+    if dashboard_bus.subscriber_count == 0:
+        return
+    for event in events:
+        for type, data in deltas_for(db, event):
+            dashboard_bus.publish(type, data, event.tenant_id)
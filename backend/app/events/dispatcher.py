@@ -0,0 +1,258 @@
+# app/events/dispatcher.py
+import asyncio
+import os
+import threading
+import traceback
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models.outbox import OutboxEvent, EventConsumerOffset
+from . import outbox
+
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "200"))
+OUTBOX_POLL_SECONDS = float(os.getenv("OUTBOX_POLL_SECONDS", "2"))
+# Ids are handed out at insert but become visible at commit, so a transaction that took a
+# lower id can commit after a higher id was read. Durable consumers only read events at
+# least this old, so transactions shorter than the lag can't be skipped (as the change feed)
+OUTBOX_VISIBILITY_LAG_SECONDS = float(os.getenv("OUTBOX_VISIBILITY_LAG_SECONDS", "2"))
+
+# handler(db, events): events are in id order and already filtered to the
+# consumer's event types. Raising leaves the batch to be delivered again.
+Handler = Callable[[Session, List[OutboxEvent]], None]
+
+
+class _Consumer:
+    def __init__(self, name: str, handler: Handler, event_types: Optional[Iterable[str]], durable: bool):
+        self.name = name
+        self.handler = handler
+        self.event_types = frozenset(event_types) if event_types else None
+        self.durable = durable
+        # Live consumers keep their offset in memory and start from the tail
+        self.offset: Optional[int] = None
+
+    def accepts(self, event: OutboxEvent) -> bool:
+        return self.event_types is None or event.event_type in self.event_types
+
+
+class OutboxDispatcher:
+    """
+    Delivers outbox events to in-process handlers, in batches, at least once.
+
+    Each handler is a named consumer with its own offset (the last event id it has
+    processed). Durable consumers store the offset in event_consumer_offsets, in the
+    same transaction as the handler's own writes, so they survive restarts and can be
+    replayed from any event id. Live consumers (such as the dashboard stream, which
+    only matters to this process's connections) start from the newest event.
+
+    A failing handler is retried from the same offset on the next pass, without
+    holding back other consumers. Durable consumers see an event once it is
+    `visibility_lag` seconds old; live consumers get it as soon as it is committed.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: int = OUTBOX_BATCH_SIZE,
+        poll_interval: float = OUTBOX_POLL_SECONDS,
+        visibility_lag: float = OUTBOX_VISIBILITY_LAG_SECONDS
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.visibility_lag = visibility_lag
+        self._consumers: Dict[str, _Consumer] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        outbox.on_commit(self.notify)
+
+    def register(
+        self,
+        name: str,
+        handler: Handler,
+        *,
+        event_types: Optional[Iterable[str]] = None,
+        durable: bool = True
+    ) -> None:
+        self._consumers[name] = _Consumer(name, handler, event_types, durable)
+
+    # Offsets ---------------------------------------------------------------
+
+    def _load_offset(self, db: Session, consumer: _Consumer) -> int:
+        if not consumer.durable:
+            if consumer.offset is None:
+                consumer.offset = db.query(func.max(OutboxEvent.id)).scalar() or 0
+            return consumer.offset
+        # Row lock: two workers never process the same durable consumer at once
+        row = (
+            db.query(EventConsumerOffset)
+            .filter(EventConsumerOffset.consumer == consumer.name)
+            .with_for_update()
+            .first()
+        )
+        if row is None:
+            row = EventConsumerOffset(consumer=consumer.name, last_event_id=0)
+            db.add(row)
+            db.flush()
+        return row.last_event_id
+
+    def _save_offset(self, db: Session, consumer: _Consumer, event_id: int) -> None:
+        if consumer.durable:
+            db.query(EventConsumerOffset).filter(
+                EventConsumerOffset.consumer == consumer.name
+            ).update({EventConsumerOffset.last_event_id: event_id})
+
+    def offsets(self) -> Dict[str, Optional[int]]:
+        db = self.session_factory()
+        try:
+            stored = dict(db.query(EventConsumerOffset.consumer, EventConsumerOffset.last_event_id).all())
+        finally:
+            db.close()
+        return {
+            name: stored.get(name, 0) if consumer.durable else consumer.offset
+            for name, consumer in self._consumers.items()
+        }
+
+    def replay(self, name: str, from_event_id: int) -> None:
+        """Deliver events again to one consumer, starting at `from_event_id`"""
+        consumer = self._consumers.get(name)
+        if consumer is None:
+            raise ValueError(f"Unknown event consumer: {name}")
+        if not consumer.durable:
+            consumer.offset = max(from_event_id - 1, 0)
+        else:
+            db = self.session_factory()
+            try:
+                self._load_offset(db, consumer)
+                self._save_offset(db, consumer, max(from_event_id - 1, 0))
+                db.commit()
+            finally:
+                db.close()
+        self.notify()
+
+    # Retention -------------------------------------------------------------
+
+    def prune(self, before: datetime, batch_size: int = 1000) -> int:
+        """
+        Delete events created before `before` that every registered durable consumer
+        has processed, `batch_size` per transaction; returns how many were deleted.
+        Live consumers only read the tail, so they never hold events back. Replays
+        can't go further back than the oldest event left.
+        """
+        db = self.session_factory()
+        try:
+            stored = dict(db.query(EventConsumerOffset.consumer, EventConsumerOffset.last_event_id).all())
+            durable_offsets = [stored.get(name, 0) for name, consumer in self._consumers.items() if consumer.durable]
+            query = db.query(OutboxEvent.id).filter(
+                OutboxEvent.created_at < before,
+                # SQLite and older MySQL reissue an id above the highest remaining one, so
+                # the newest event stays and offsets never point past a reused id
+                OutboxEvent.id < db.query(func.max(OutboxEvent.id)).scalar_subquery()
+            )
+            if durable_offsets:
+                query = query.filter(OutboxEvent.id <= min(durable_offsets))
+            query = query.order_by(OutboxEvent.id).limit(batch_size)
+
+            total = 0
+            while True:
+                ids = [event_id for (event_id,) in query.all()]
+                if not ids:
+                    return total
+                db.query(OutboxEvent).filter(OutboxEvent.id.in_(ids)).delete(synchronize_session=False)
+                db.commit()
+                total += len(ids)
+        finally:
+            db.close()
+
+    # Delivery --------------------------------------------------------------
+
+    def _dispatch_batch(self, consumer: _Consumer) -> int:
+        db = self.session_factory()
+        try:
+            offset = self._load_offset(db, consumer)
+            query = db.query(OutboxEvent).filter(OutboxEvent.id > offset)
+            if consumer.durable:
+                # Younger events may still have lower ids in flight; the next pass picks them up
+                horizon = datetime.utcnow() - timedelta(seconds=self.visibility_lag)
+                query = query.filter(OutboxEvent.created_at <= horizon)
+            events = query.order_by(OutboxEvent.id).limit(self.batch_size).all()
+            if not events:
+                db.rollback()
+                return 0
+
+            relevant = [event for event in events if consumer.accepts(event)]
+            if relevant:
+                consumer.handler(db, relevant)
+            self._save_offset(db, consumer, events[-1].id)
+            db.commit()
+            if not consumer.durable:
+                consumer.offset = events[-1].id
+            return len(events)
+        except Exception as e:
+            db.rollback()
+            print(f"Outbox handler {consumer.name} failed, will retry: {e}")
+            traceback.print_exc()
+            return 0
+        finally:
+            db.close()
+
+    def dispatch_pending(self) -> int:
+        """Deliver every pending event to every consumer; returns the number of events delivered"""
+        delivered = 0
+        # One pass at a time per process; consumers are independent of each other
+        with self._lock:
+            for consumer in list(self._consumers.values()):
+                while True:
+                    count = self._dispatch_batch(consumer)
+                    delivered += count
+                    if count < self.batch_size:
+                        break
+        return delivered
+
+    # Background loop -------------------------------------------------------
+
+    def notify(self) -> None:
+        """Wake the background loop; safe to call from any thread"""
+        if self._loop is not None and self._wake is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                pass
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            await asyncio.to_thread(self.dispatch_pending)
+            try:
+                # Commits that record events wake the loop; polling covers other workers' writes
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start delivering in the background on the running event loop"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+        self._wake = None
+
+
+outbox_dispatcher = OutboxDispatcher()
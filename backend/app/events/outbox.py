@@ -0,0 +1,60 @@
+# app/events/outbox.py
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from ..models.outbox import OutboxEvent
+
+# Called after a commit that recorded events, so the dispatcher can wake early
+_commit_listeners: List[Callable[[], None]] = []
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def record(
+    db: Session,
+    event_type: str,
+    aggregate_type: str,
+    aggregate_id: Optional[int],
+    payload: Optional[Dict[str, Any]] = None
+) -> OutboxEvent:
+    """
+    Add a domain event to the session. It is committed (or rolled back) together with
+    the change it describes, so handlers never see an event for a write that didn't happen.
+    Callers flush first when they need a new row's id.
+    """
+    outbox_event = OutboxEvent(
+        event_type=event_type,
+        aggregate_type=aggregate_type,
+        aggregate_id=aggregate_id,
+        payload=_jsonable(payload or {})
+    )
+    db.add(outbox_event)
+    db.info["outbox_pending"] = True
+    return outbox_event
+
+
+def on_commit(listener: Callable[[], None]) -> None:
+    _commit_listeners.append(listener)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_on_commit(session):
+    if session.info.pop("outbox_pending", False):
+        for listener in _commit_listeners:
+            listener()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("outbox_pending", None)
@@ -0,0 +1,2 @@
+# Scheduled/background jobs. Each module can be run directly, e.g.
+#   python -m app.jobs.daily_metrics
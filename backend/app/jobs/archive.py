@@ -0,0 +1,40 @@
+# app/jobs/archive.py
+"""
+Archival job.
+
+Moves completed/cancelled enrollments and expired/revoked certifications of every
+tenant that ended, and were last updated, more than ARCHIVE_HORIZON_DAYS ago into
+the archive tables, ARCHIVE_BATCH_SIZE rows per transaction (see crud.archive).
+Read APIs include archived rows only when asked (include_archived). Schedule it
+daily or weekly, off peak:
+
+    python -m app.jobs.archive                   # archive past the configured horizon
+    python -m app.jobs.archive --horizon-days 730
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..database import SessionLocal
+from ..crud import archive
+
+ARCHIVE_HORIZON_DAYS = int(os.getenv("ARCHIVE_HORIZON_DAYS", "365"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+def run(horizon_days: Optional[int] = None, batch_size: Optional[int] = None) -> None:
+    cutoff = datetime.utcnow() - timedelta(days=horizon_days or ARCHIVE_HORIZON_DAYS)
+    db = SessionLocal()
+    try:
+        moved = archive.run(db, cutoff, batch_size or ARCHIVE_BATCH_SIZE)
+        print(f"Archived {moved['enrollments']} enrollments and {moved['certifications']} certifications "
+              f"that ended before {cutoff:%Y-%m-%d}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move finished enrollments and certifications to the archive tables")
+    parser.add_argument("--horizon-days", type=int, help="Archive rows that ended more than this many days ago")
+    parser.add_argument("--batch-size", type=int, help="Rows moved per transaction")
+    args = parser.parse_args()
+    run(horizon_days=args.horizon_days, batch_size=args.batch_size)
@@ -0,0 +1,24 @@
+# app/jobs/compliance_snapshots.py
+"""
+Compliance snapshot job.
+
+Stores today's overall and per-department compliance figures of every tenant in
+compliance_snapshots, which backs GET /api/compliance/trends. Schedule it once a day:
+
+    python -m app.jobs.compliance_snapshots
+"""
+from ..database import SessionLocal
+from ..crud import compliance_trends, tenant
+from ..tenancy import scope
+
+def run() -> None:
+    db = SessionLocal()
+    try:
+        for tenant_id in tenant.ids(db):
+            rows = compliance_trends.snapshot(scope(db, tenant_id))
+            print(f"Stored {len(rows)} compliance snapshot rows for tenant {tenant_id} on {rows[0].snapshot_date}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run()
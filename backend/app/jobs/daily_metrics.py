@@ -0,0 +1,40 @@
+# app/jobs/daily_metrics.py
+"""
+Daily metrics rollup job.
+
+Writes one daily_metrics row per tenant and org-local day (ORG_TIMEZONE) with the cumulative
+totals the dashboard uses for its growth percentages. Schedule it shortly after local midnight, e.g.
+
+    python -m app.jobs.daily_metrics            # snapshot yesterday
+    python -m app.jobs.daily_metrics --days 30  # backfill the last 30 days
+"""
+import argparse
+from datetime import date, timedelta
+from typing import Optional
+
+from ..database import SessionLocal
+from ..crud import metrics, tenant
+from ..tenancy import scope
+from ..timezones import LocalClock
+
+def run(day: Optional[date] = None, days: int = 1) -> None:
+    """Snapshot `days` consecutive org-local days ending at `day` (default: yesterday) for every tenant"""
+    last_day = day or (LocalClock().today - timedelta(days=1))
+    db = SessionLocal()
+    try:
+        for tenant_id in tenant.ids(db):
+            scope(db, tenant_id)
+            for offset in range(days - 1, -1, -1):
+                local_date = last_day - timedelta(days=offset)
+                row = metrics.snapshot(db, local_date)
+                print(f"Daily metrics for tenant {tenant_id} on {local_date}: {row.total_employees} employees, "
+                      f"{row.total_enrollments} enrollments, {row.total_certifications} certifications")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write daily metrics rollup rows")
+    parser.add_argument("--date", type=date.fromisoformat, help="Last org-local day to snapshot (YYYY-MM-DD)")
+    parser.add_argument("--days", type=int, default=1, help="Number of days to snapshot ending at --date")
+    args = parser.parse_args()
+    run(day=args.date, days=args.days)
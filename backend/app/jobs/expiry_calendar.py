@@ -0,0 +1,26 @@
+# app/jobs/expiry_calendar.py
+"""
+Expiry calendar rebuild job.
+
+Certification and employee writes keep the expiry calendar current as they flush.
+Rebuild it after writes that bypass the ORM (bulk SQL, restores, manual fixes):
+
+    python -m app.jobs.expiry_calendar
+
+Each row records the zone its expiry day was bucketed in. After ORG_TIMEZONE changes,
+the API rebuilds the calendar at startup when it finds rows filed under the old zone;
+run this job instead to rebuild ahead of the restart (or where the API isn't restarted).
+"""
+from ..database import SessionLocal
+from ..crud import expiry_calendar
+
+def run() -> None:
+    db = SessionLocal()
+    try:
+        total = expiry_calendar.rebuild(db)
+        print(f"Expiry calendar rebuilt: {total} certifications")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,24 @@
+# app/jobs/expiry_notifications.py
+"""
+Certification expiry notification job.
+
+Emails employees and department managers when certifications cross the 30, 7 and
+1 day thresholds (see app/notifications.py). One run covers every tenant. Runs are
+incremental and idempotent, so schedule it as often as you like, e.g. hourly:
+
+    python -m app.jobs.expiry_notifications
+"""
+from ..database import SessionLocal
+from ..notifications import get_transport, send_expiry_notifications
+
+def run() -> None:
+    db = SessionLocal()
+    try:
+        result = send_expiry_notifications(db, get_transport())
+        print(f"Expiry notifications: {result['certifications']} certifications, "
+              f"{result['sent']}/{result['digests']} digests sent, {result['failed']} failed")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,57 @@
+# app/jobs/outbox.py
+"""
+Outbox maintenance job.
+
+API workers deliver outbox events in the background; this job inspects and
+drives durable consumers from the command line, and prunes delivered events older
+than OUTBOX_RETENTION_DAYS (schedule --prune daily; replays can only reach back
+that far):
+
+    python -m app.jobs.outbox                            # show consumer offsets
+    python -m app.jobs.outbox --dispatch                 # deliver pending events once
+    python -m app.jobs.outbox --replay NAME --from 1200  # redeliver from event 1200
+    python -m app.jobs.outbox --prune                    # delete delivered events past retention
+    python -m app.jobs.outbox --prune --retention-days 30
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from ..events import outbox_dispatcher
+
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+OUTBOX_PRUNE_BATCH_SIZE = int(os.getenv("OUTBOX_PRUNE_BATCH_SIZE", "1000"))
+
+def run(
+    dispatch: bool = False,
+    replay: Optional[str] = None,
+    from_event_id: int = 1,
+    prune: bool = False,
+    retention_days: Optional[int] = None
+) -> None:
+    if replay:
+        outbox_dispatcher.replay(replay, from_event_id)
+        print(f"Consumer {replay} will be redelivered events from id {from_event_id}")
+    if dispatch or replay:
+        delivered = outbox_dispatcher.dispatch_pending()
+        print(f"Delivered {delivered} outbox events")
+    if prune:
+        cutoff = datetime.utcnow() - timedelta(days=retention_days or OUTBOX_RETENTION_DAYS)
+        pruned = outbox_dispatcher.prune(cutoff, OUTBOX_PRUNE_BATCH_SIZE)
+        print(f"Pruned {pruned} delivered outbox events created before {cutoff:%Y-%m-%d}")
+    for name, offset in outbox_dispatcher.offsets().items():
+        print(f"{name}: last event {offset if offset is not None else 'n/a (live)'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deliver or replay outbox events")
+    parser.add_argument("--dispatch", action="store_true", help="Deliver pending events to all consumers")
+    parser.add_argument("--replay", metavar="NAME", help="Consumer to rewind")
+    parser.add_argument("--from", dest="from_event_id", type=int, default=1, help="First event id to redeliver")
+    parser.add_argument("--prune", action="store_true", help="Delete delivered events older than the retention")
+    parser.add_argument("--retention-days", type=int, help="Keep events created within this many days")
+    args = parser.parse_args()
+    run(
+        dispatch=args.dispatch, replay=args.replay, from_event_id=args.from_event_id,
+        prune=args.prune, retention_days=args.retention_days
+    )
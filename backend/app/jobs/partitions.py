@@ -0,0 +1,45 @@
+# app/jobs/partitions.py
+"""
+Partition maintenance job (MySQL only; see app/partitioning.py).
+
+Adds monthly partitions to the partitioned tables so they always cover the next
+PARTITION_MONTHS_AHEAD months. Schedule it at least monthly; --convert partitions
+tables that aren't yet (a table rebuild: run it once, in a maintenance window).
+
+    python -m app.jobs.partitions              # add upcoming months
+    python -m app.jobs.partitions --convert    # first time: partition the tables
+"""
+import argparse
+import os
+from typing import Optional
+
+from ..database import engine
+from ..partitioning import PARTITIONED_TABLES, add_future_partitions, convert as convert_table, existing_bounds
+from ..timezones import LocalClock
+
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+
+def run(convert: bool = False, months_ahead: Optional[int] = None) -> None:
+    if engine.dialect.name != "mysql":
+        print(f"Partitioning needs MySQL, not {engine.dialect.name}; nothing to do")
+        return
+    months_ahead = PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    today = LocalClock().today
+    for table in PARTITIONED_TABLES:
+        with engine.connect() as connection:
+            partitioned = bool(existing_bounds(connection, table))
+        if not partitioned:
+            if convert:
+                print(f"Partitioned {table} into {convert_table(engine, table, today, months_ahead)} partitions")
+            else:
+                print(f"{table} is not partitioned; run with --convert to partition it")
+            continue
+        added = add_future_partitions(engine, table, today, months_ahead)
+        print(f"{table}: added {', '.join(added)}" if added else f"{table}: partitions cover the next {months_ahead} months")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create upcoming monthly partitions (and optionally partition the tables)")
+    parser.add_argument("--convert", action="store_true", help="Partition tables that are not partitioned yet")
+    parser.add_argument("--months-ahead", type=int, help="Months past the current one to cover")
+    args = parser.parse_args()
+    run(convert=args.convert, months_ahead=args.months_ahead)
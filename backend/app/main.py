@@ -1,6 +1,8 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
+from fastapi.middleware.gzip import GZipMiddleware
+from app.database import engine, Base, SessionLocal, upgrade_schema
 import os
 
 from app.routes import (
@@ -11,10 +13,23 @@ from app.routes import (
     certification_router,
     dashboard_router,
     compliance_router,
+    changes_router,
+    tenant_router,
     auth
 )
+from app.crud import compliance, expiry_calendar, tenant
+from app.dependecies import get_current_user, token_cache
+from app.events import outbox_dispatcher
 
-app = FastAPI(title="Training & Certification Tracker")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Deliver outbox events to in-process handlers (dashboard stream, ...) in the background
+    if os.getenv("OUTBOX_DISPATCHER", "true").lower() in ("1", "true", "yes"):
+        outbox_dispatcher.start()
+    yield
+    await outbox_dispatcher.stop()
+
+app = FastAPI(title="Training & Certification Tracker", lifespan=lifespan)
 
 # Get FRONTEND_URL from environment or use defaults
 frontend_url = os.getenv(
@@ -37,8 +52,35 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses above a size threshold: brotli when brotli-asgi is
+# installed (it falls back to gzip for clients without br), gzip otherwise
+compression_min_size = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+try:
+    from brotli_asgi import BrotliMiddleware
+    # Event streams must not be buffered by the compressor
+    app.add_middleware(
+        BrotliMiddleware,
+        minimum_size=compression_min_size,
+        gzip_fallback=True,
+        excluded_handlers=[r"/stream$"]
+    )
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=compression_min_size)
+
+# Export workers can opt in to importing pandas/openpyxl/reportlab at boot
+# instead of on their first export; other workers stay lean
+if os.getenv("PRELOAD_EXPORT_LIBS", "").lower() in ("1", "true", "yes"):
+    compliance.preload_export_libraries()
+
 # Create DB tables
 Base.metadata.create_all(bind=engine)
+upgrade_schema()
+
+# Rows from before tenants existed belong to the default tenant. Then fill the expiry
+# calendar on the first start after upgrading; flushes keep it current from then on
+with SessionLocal() as db:
+    tenant.ensure_default(db)
+    expiry_calendar.ensure_built(db)
 
 # Include routers (NO prefix)
 app.include_router(employee_router)
@@ -48,6 +90,8 @@ app.include_router(enrollment_router)
 app.include_router(certification_router)
 app.include_router(dashboard_router)
 app.include_router(compliance_router)
+app.include_router(changes_router)
+app.include_router(tenant_router)
 app.include_router(auth.router)
 
 @app.get("/")
@@ -58,6 +102,11 @@ def root():
 def health_check():
     return {"status": "OK"}
 
+@app.get("/health/token-cache")
+def token_cache_stats(current_user: dict = Depends(get_current_user)):
+    """Hit/miss/expiry counters for the verified-token cache used by get_current_user"""
+    return token_cache.stats()
+
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", "8000"))
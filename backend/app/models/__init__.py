@@ -1,15 +1,37 @@
 #app/models/__init__.py
+from .tenant import Tenant
 from .employee import Employee
 from .department import Department
 from .training import Training
 from .certification import Certification
 from .enrollment import Enrollment
+from .tombstone import Tombstone
+from .metrics import DailyMetric
+from .compliance_snapshot import ComplianceSnapshot
+from .outbox import OutboxEvent, EventConsumerOffset
+from .notification import NotificationLog, NotificationWatermark
+from .expiry_calendar import ExpiryCalendarEntry
+from .archive import ArchivedEnrollment, ArchivedCertification, ArchiveCounter
+from .data_version import DataVersion
 
 __all__ = [
+    "Tenant",
     "Employee",
     "Department",
     "Training",
-    "Certification"
-    "Enrollment"
+    "Certification",
+    "Enrollment",
+    "Tombstone",
+    "DailyMetric",
+    "ComplianceSnapshot",
+    "OutboxEvent",
+    "EventConsumerOffset",
+    "NotificationLog",
+    "NotificationWatermark",
+    "ExpiryCalendarEntry",
+    "ArchivedEnrollment",
+    "ArchivedCertification",
+    "ArchiveCounter",
+    "DataVersion"
 ]
 
@@ -0,0 +1,71 @@
+from sqlalchemy import Column, Integer, Float, String, DateTime, Index
+from datetime import datetime
+from ..database import Base
+from ..tenancy import TenantScoped
+
+# Archive tables mirror the live columns and keep the live ids, so an id names the
+# same row in either tier. No foreign keys: archived rows outlive deleted employees
+# and trainings.
+
+class ArchivedEnrollment(TenantScoped, Base):
+    """A completed or cancelled enrollment moved out of `enrollments` by crud.archive"""
+    __tablename__ = "archived_enrollments"
+    __table_args__ = (
+        Index("ix_archived_enrollments_tenant_employee", "tenant_id", "employee_id"),
+        Index("ix_archived_enrollments_tenant_enrolled_date", "tenant_id", "enrolled_date"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    employee_id = Column(Integer)
+    training_id = Column(Integer)
+    status = Column(String(20))
+    progress = Column(Integer, default=0)
+    enrolled_date = Column(DateTime)
+    start_date = Column(DateTime)
+    end_date = Column(DateTime)
+    completed_date = Column(DateTime)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ArchivedCertification(TenantScoped, Base):
+    """An expired or revoked certification moved out of `certifications` by crud.archive"""
+    __tablename__ = "archived_certifications"
+    __table_args__ = (
+        # Also the lookup side of the missing-certification anti-join
+        Index("ix_archived_certifications_tenant_employee_training", "tenant_id", "employee_id", "training_id"),
+        Index("ix_archived_certifications_tenant_issued_date", "tenant_id", "issued_date"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    employee_id = Column(Integer)
+    training_id = Column(Integer)
+    enrollment_id = Column(Integer)
+    cert_number = Column(String(100), nullable=False)
+    issued_date = Column(DateTime)
+    expires_at = Column(DateTime)
+    status = Column(String(20))
+    file_url = Column(String(500))
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ArchiveCounter(TenantScoped, Base):
+    """
+    Running totals of the archived rows per tenant, kind ("enrollment"/"certification")
+    and status, so dashboard and rollup totals include archived history without
+    scanning the archive tables
+    """
+    __tablename__ = "archive_counters"
+    __table_args__ = (
+        Index("uq_archive_counters_tenant_kind_status", "tenant_id", "kind", "status", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(20), nullable=False)
+    status = Column(String(20))
+    row_count = Column(Integer, default=0)
+    training_hours = Column(Float, default=0.0)  # Sum of Training.duration_hours, enrollments only
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
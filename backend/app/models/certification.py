@@ -1,18 +1,29 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
+from ..tenancy import TenantScoped
 
-class Certification(Base):
+class Certification(TenantScoped, Base):
     __tablename__ = "certifications"
+    __table_args__ = (
+        # Watermark index for the change feed (updated_at, id), per tenant
+        Index("ix_certifications_tenant_updated_at_id", "tenant_id", "updated_at", "id"),
+        # Lookup side of the missing-certification anti-join
+        Index("ix_certifications_tenant_employee_training", "tenant_id", "employee_id", "training_id"),
+        Index("ix_certifications_tenant_issued_date", "tenant_id", "issued_date"),
+        Index("ix_certifications_tenant_expires_at", "tenant_id", "expires_at"),
+        Index("uq_certifications_tenant_cert_number", "tenant_id", "cert_number", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"))
     training_id = Column(Integer, ForeignKey("trainings.id"))
     enrollment_id = Column(Integer, ForeignKey("enrollments.id"))
-    cert_number = Column(String(100), unique=True, nullable=False)
+    cert_number = Column(String(100), nullable=False)
     issued_date = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime)
+    # Plain index too: the notification and archive jobs scan expiry ranges across all tenants
+    expires_at = Column(DateTime, index=True)
     status = Column(String(20), default="active")  # active, expired, revoked
     file_url = Column(String(500))
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Index
+from datetime import datetime
+from ..database import Base
+from ..tenancy import TenantScoped
+
+class ComplianceSnapshot(TenantScoped, Base):
+    """Periodic compliance figures, one row per day per department plus one overall row"""
+    __tablename__ = "compliance_snapshots"
+    __table_args__ = (
+        # Trend lookups: one department's series over a date range
+        Index("ix_compliance_snapshots_tenant_department_date", "tenant_id", "department_id", "snapshot_date"),
+        Index("ix_compliance_snapshots_tenant_date", "tenant_id", "snapshot_date"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    snapshot_date = Column(Date, nullable=False)
+    department_id = Column(Integer, nullable=True)  # NULL = organisation-wide row
+    department_name = Column(String(100), nullable=False)
+    total_employees = Column(Integer, default=0)
+    compliant_employees = Column(Integer, default=0)
+    compliance_rate = Column(Float, default=0.0)
+    completed_trainings = Column(Integer, default=0)
+    total_trainings = Column(Integer, default=0)
+    completion_rate = Column(Float, default=0.0)
+    expiring_soon = Column(Integer, default=0)
+    expired_certifications = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, String, Index
+from ..database import Base
+from ..tenancy import TenantScoped
+
+class DataVersion(TenantScoped, Base):
+    """
+    Write counter per tenant and table, bumped in the transaction of every write to
+    the table (see app/data_versions.py). Keys cached reports and ETags.
+    """
+    __tablename__ = "data_versions"
+    __table_args__ = (
+        Index("uq_data_versions_tenant_table", "tenant_id", "table_name", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    table_name = Column(String(64), nullable=False)
+    version = Column(Integer, nullable=False, default=0)
@@ -1,14 +1,21 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
+from ..tenancy import TenantScoped
 
-class Department(Base):
+class Department(TenantScoped, Base):
     __tablename__ = "departments"
+    __table_args__ = (
+        # Department names are unique within a tenant
+        Index("uq_departments_tenant_name", "tenant_id", "name", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), unique=True, nullable=False)
+    name = Column(String(100), nullable=False)
     description = Column(Text)
+    manager_email = Column(String(255), nullable=True)  # Receives the department's expiry digests
+    timezone = Column(String(64), nullable=True)  # IANA name; None means ORG_TIMEZONE
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
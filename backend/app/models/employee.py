@@ -1,16 +1,24 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
+from ..tenancy import TenantScoped
 
-class Employee(Base):
+class Employee(TenantScoped, Base):
     __tablename__ = "employees"
+    __table_args__ = (
+        # Watermark index for the change feed (updated_at, id), per tenant
+        Index("ix_employees_tenant_updated_at_id", "tenant_id", "updated_at", "id"),
+        # Employee IDs and emails are unique within a tenant
+        Index("uq_employees_tenant_employee_id", "tenant_id", "employee_id", unique=True),
+        Index("uq_employees_tenant_email", "tenant_id", "email", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    employee_id = Column(String(50), unique=True, index=True, nullable=False)
+    employee_id = Column(String(50), nullable=False)
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
-    email = Column(String(255), unique=True, index=True, nullable=False)
+    email = Column(String(255), nullable=False)
     department_id = Column(Integer, ForeignKey("departments.id"))
     position = Column(String(100))
     hire_date = Column(Date)
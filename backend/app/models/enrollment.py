@@ -1,11 +1,18 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
+from ..tenancy import TenantScoped
 
 # In your Enrollment model
-class Enrollment(Base):
+class Enrollment(TenantScoped, Base):
     __tablename__ = "enrollments"
+    __table_args__ = (
+        # Watermark index for the change feed (updated_at, id), per tenant
+        Index("ix_enrollments_tenant_updated_at_id", "tenant_id", "updated_at", "id"),
+        Index("ix_enrollments_tenant_enrolled_date", "tenant_id", "enrolled_date"),
+        Index("ix_enrollments_tenant_completed_date", "tenant_id", "completed_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     employee_id = Column(Integer, ForeignKey("employees.id"))
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Index
+from datetime import datetime
+from ..database import Base
+from ..tenancy import TenantScoped
+
+class ExpiryCalendarEntry(TenantScoped, Base):
+    """
+    One row per certification with an expiry date, bucketed by local day
+    (the department's timezone, else the org timezone).
+    Kept in step with certifications and employees by crud.expiry_calendar.
+    """
+    __tablename__ = "expiry_calendar"
+    __table_args__ = (
+        # "Expiring between day A and day B (in department D)" is one range scan per tenant
+        Index("ix_expiry_calendar_tenant_day_department", "tenant_id", "expiry_date", "department_id"),
+    )
+
+    # No foreign key: rows removed by bulk deletes are dropped by the joins that
+    # read the calendar and purged by the next rebuild
+    certification_id = Column(Integer, primary_key=True, autoincrement=False)
+    expiry_date = Column(Date, nullable=False)  # Local day of expires_at
+    expires_at = Column(DateTime, nullable=False)
+    employee_id = Column(Integer, nullable=False, index=True)
+    department_id = Column(Integer)
+    training_id = Column(Integer, nullable=False)
+    status = Column(String(20))
+    # Zone expiry_date was bucketed in; a changed ORG_TIMEZONE shows up as a mismatch
+    timezone = Column(String(64))
+    # When the row was (re)written
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, Float, Date, DateTime, Index
+from datetime import datetime
+from ..database import Base
+from ..tenancy import TenantScoped
+
+class DailyMetric(TenantScoped, Base):
+    """Per-day totals snapshot (end of the org-local day) used for growth percentages"""
+    __tablename__ = "daily_metrics"
+    __table_args__ = (
+        Index("uq_daily_metrics_tenant_date", "tenant_id", "metric_date", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    metric_date = Column(Date, nullable=False)
+    total_employees = Column(Integer, default=0)
+    total_trainings = Column(Integer, default=0)
+    total_enrollments = Column(Integer, default=0)
+    completed_enrollments = Column(Integer, default=0)
+    total_certifications = Column(Integer, default=0)
+    total_training_hours = Column(Float, default=0.0)
+    expiring_certifications = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
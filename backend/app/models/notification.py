@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from datetime import datetime
+from ..database import Base
+from ..tenancy import TenantScoped
+
+class NotificationLog(TenantScoped, Base):
+    """One expiry notice to one recipient and how sending it went; the unique key prevents duplicate sends"""
+    __tablename__ = "notification_log"
+    __table_args__ = (
+        UniqueConstraint(
+            "certification_id", "threshold_days", "recipient",
+            name="uq_notification_log_cert_threshold_recipient"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    certification_id = Column(Integer, nullable=False)
+    threshold_days = Column(Integer, nullable=False)  # 30, 7 or 1
+    recipient = Column(String(255), nullable=False)
+    recipient_type = Column(String(20), nullable=False)  # employee, manager
+    sent_at = Column(DateTime, default=datetime.utcnow, nullable=False)  # Last attempt
+    # sent; failed (transient, retried by the next run); rejected (5xx, not retried). NULL: sent
+    status = Column(String(20), default="sent", index=True)
+
+class NotificationWatermark(Base):
+    """
+    How far each threshold has been scanned, so runs only look at newly crossed expiries.
+    Not tenant scoped: one run scans every tenant.
+    """
+    __tablename__ = "notification_watermarks"
+
+    threshold_days = Column(Integer, primary_key=True, autoincrement=False)
+    scanned_until = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
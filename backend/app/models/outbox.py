@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from datetime import datetime
+from ..database import Base
+from ..tenancy import TenantScoped
+
+class OutboxEvent(TenantScoped, Base):
+    """Domain event written in the same transaction as the change it describes"""
+    __tablename__ = "outbox_events"
+
+    id = Column(Integer, primary_key=True, index=True)  # Delivery order and replay offset
+    event_type = Column(String(100), nullable=False)  # EmployeeCreated, EnrollmentProgressed, ...
+    aggregate_type = Column(String(50), nullable=False)  # employee, enrollment, certification
+    aggregate_id = Column(Integer, nullable=True)  # NULL for events spanning many rows (imports)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+class EventConsumerOffset(Base):
+    """Last outbox event id each durable handler has processed (across all tenants)"""
+    __tablename__ = "event_consumer_offsets"
+
+    consumer = Column(String(100), primary_key=True)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from ..database import Base
+
+class Tenant(Base):
+    """An organisation (subsidiary) served by this deployment; see app/tenancy.py"""
+    __tablename__ = "tenants"
+    __table_args__ = (
+        Index("uq_tenants_slug", "slug", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    slug = Column(String(50), nullable=False)  # Chosen at login, e.g. "acme-india"
+    name = Column(String(200), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from ..database import Base
+from ..tenancy import TenantScoped
+
+class Tombstone(TenantScoped, Base):
+    """Record of a deleted row so the change feed can report deletes"""
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index("ix_tombstones_tenant_deleted_at_id", "tenant_id", "deleted_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(50), nullable=False)  # employee, training, enrollment, certification
+    entity_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
\ No newline at end of file
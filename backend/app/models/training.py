@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..database import Base
+from ..tenancy import TenantScoped
 
-class Training(Base):
+class Training(TenantScoped, Base):
     __tablename__ = "trainings"
+    __table_args__ = (
+        # Watermark index for the change feed (updated_at, id), per tenant
+        Index("ix_trainings_tenant_updated_at_id", "tenant_id", "updated_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
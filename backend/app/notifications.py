@@ -0,0 +1,224 @@
+# app/notifications.py
+"""
+Certification expiry notifications.
+
+Each run finds certifications that crossed the 30/7/1-day thresholds since the last
+run (crud.notifications), groups them into one digest per employee and one per
+department manager, and sends the digests through a pluggable transport:
+
+    NOTIFY_TRANSPORT=file   append messages to an mbox file (NOTIFY_FILE_PATH)
+    NOTIFY_TRANSPORT=smtp   send through SMTP_HOST:SMTP_PORT
+
+For local SMTP testing point SMTP_HOST/SMTP_PORT at a debugging server that prints
+messages instead of delivering them, e.g. `python -m aiosmtpd -n -l localhost:1025`.
+"""
+import mailbox
+import os
+import smtplib
+import threading
+from collections import defaultdict
+from datetime import datetime
+from email.message import EmailMessage
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy.orm import Session
+
+from .crud.notifications import notifications
+
+NOTIFY_FROM = os.getenv("NOTIFY_FROM", "no-reply@skillflow.local")
+
+
+class Transport:
+    """Sends EmailMessages; used as a context manager around one run"""
+
+    def __enter__(self) -> "Transport":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def send(self, message: EmailMessage) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class SMTPTransport(Transport):
+    """SMTP delivery over one connection per run, opened on the first message"""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        starttls: bool = False,
+        timeout: float = 30
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def send(self, message: EmailMessage) -> None:
+        if self._smtp is None:
+            self._smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                self._smtp.starttls()
+            if self.username:
+                self._smtp.login(self.username, self.password or "")
+        self._smtp.send_message(message)
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            self._smtp = None
+
+
+class FileTransport(Transport):
+    """Appends messages to an mbox file; for development and for relaying by another tool"""
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, message: EmailMessage) -> None:
+        with self._lock:
+            box = mailbox.mbox(self.path)
+            box.lock()
+            try:
+                box.add(message)
+                box.flush()
+            finally:
+                box.unlock()
+                box.close()
+
+
+def get_transport() -> Transport:
+    """Transport configured by NOTIFY_TRANSPORT (default: file)"""
+    kind = os.getenv("NOTIFY_TRANSPORT", "file").lower()
+    if kind == "smtp":
+        return SMTPTransport(
+            host=os.getenv("SMTP_HOST", "localhost"),
+            port=int(os.getenv("SMTP_PORT", "1025")),
+            username=os.getenv("SMTP_USER") or None,
+            password=os.getenv("SMTP_PASSWORD") or None,
+            starttls=os.getenv("SMTP_STARTTLS", "").lower() in ("1", "true", "yes")
+        )
+    if kind == "file":
+        return FileTransport(os.getenv("NOTIFY_FILE_PATH", "notifications.mbox"))
+    raise ValueError(f"Unsupported NOTIFY_TRANSPORT: {kind}. Use smtp or file")
+
+
+class Digest(NamedTuple):
+    recipient: str
+    recipient_type: str  # employee, manager
+    notices: List[Dict]
+
+
+def build_digests(notices: List[Dict], sent: set) -> List[Digest]:
+    """
+    One digest per employee and one per department manager, leaving out
+    (certification, threshold, recipient) combinations that were already sent.
+    """
+    grouped: Dict[tuple, List[Dict]] = defaultdict(list)
+    for notice in notices:
+        recipients = [(notice["email"], "employee")]
+        # A manager's own certifications are already in their personal digest
+        if notice["manager_email"] and notice["manager_email"] != notice["email"]:
+            recipients.append((notice["manager_email"], "manager"))
+        for recipient, recipient_type in recipients:
+            if (notice["certification_id"], notice["threshold_days"], recipient) not in sent:
+                grouped[(recipient, recipient_type)].append(notice)
+    return [Digest(recipient, recipient_type, items) for (recipient, recipient_type), items in grouped.items()]
+
+
+def _line(notice: Dict, now: datetime, with_employee: bool) -> str:
+    days_left = max((notice["expires_at"] - now).days, 0)
+    who = f"{notice['first_name']} {notice['last_name']}: " if with_employee else ""
+    return (
+        f"- {who}{notice['training_name']} expires on {notice['expires_at']:%Y-%m-%d} "
+        f"({days_left} day{'s' if days_left != 1 else ''} left)"
+    )
+
+
+def render(digest: Digest, now: datetime) -> EmailMessage:
+    count = len(digest.notices)
+    plural = "s" if count != 1 else ""
+    message = EmailMessage()
+    message["From"] = NOTIFY_FROM
+    message["To"] = digest.recipient
+
+    if digest.recipient_type == "manager":
+        message["Subject"] = f"{count} certification{plural} expiring in your department"
+        lines = ["The following certifications in your department expire soon:", ""]
+        by_department = defaultdict(list)
+        for notice in digest.notices:
+            by_department[notice["department_name"]].append(notice)
+        for department, items in sorted(by_department.items()):
+            lines.append(f"{department}:")
+            lines.extend(_line(notice, now, with_employee=True) for notice in items)
+            lines.append("")
+    else:
+        first = digest.notices[0]
+        message["Subject"] = (
+            f"Your {first['training_name']} certification expires in {first['threshold_days']} "
+            f"day{'s' if first['threshold_days'] != 1 else ''}"
+            if count == 1 else f"{count} of your certifications expire soon"
+        )
+        lines = [f"Hi {first['first_name']},", "", "These certifications need renewing:"]
+        lines.extend(_line(notice, now, with_employee=False) for notice in digest.notices)
+        lines.append("")
+
+    message.set_content("\n".join(lines))
+    return message
+
+
+def is_permanent_failure(error: Exception) -> bool:
+    """5xx refusals of the recipients or the message: sending the same digest again can't succeed"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    return isinstance(error, smtplib.SMTPDataError) and error.smtp_code >= 500
+
+
+def send_expiry_notifications(db: Session, transport: Transport, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Send digests for every threshold crossed since the last run, plus earlier digests
+    whose send failed.
+
+    Each digest's outcome is logged as soon as it is known, so a retry never repeats a
+    sent digest, and the watermarks always advance. Transient failures are logged as
+    failed and retried by later runs; permanent (5xx) refusals are logged as rejected
+    and not retried, so one bad address can't hold every later run back.
+    """
+    now = now or datetime.utcnow()
+    notices = notifications.crossed_thresholds(db, now)
+    notices += notifications.retry_notices(db, now, skip=(notice["certification_id"] for notice in notices))
+    sent = notifications.sent_keys(db, (notice["certification_id"] for notice in notices))
+    digests = build_digests(notices, sent)
+
+    delivered = failed = 0
+    with transport:
+        for digest in digests:
+            try:
+                transport.send(render(digest, now))
+            except (smtplib.SMTPException, OSError) as e:
+                failed += 1
+                status = "rejected" if is_permanent_failure(e) else "failed"
+                print(f"Failed to send expiry digest to {digest.recipient} ({status}): {e}")
+                notifications.log_sent(db, digest.notices, digest.recipient, digest.recipient_type, status=status)
+                continue
+            notifications.log_sent(db, digest.notices, digest.recipient, digest.recipient_type)
+            delivered += 1
+
+    notifications.advance_watermarks(db, now)
+
+    return {"certifications": len(notices), "digests": len(digests), "sent": delivered, "failed": failed}
@@ -0,0 +1,132 @@
+# app/partitioning.py
+"""
+MySQL RANGE partitioning of the date-ranged tables.
+
+    enrollments       by enrolled_date   compliance date windows and daily rollups
+    expiry_calendar   by expiry_date     every "expiring between A and B" query
+
+History is split into one partition per year, the current year onwards into one per
+month, and p_future (MAXVALUE) catches anything beyond the last month. Queries that
+bound the partition column only read the partitions in range.
+
+Not every query can bound it, so not every query prunes:
+
+    expiry_calendar   expiring_between() and due_within() bound expiry_date on both
+                      sides; expiring_by() (dashboard alerts, expired included) only from above
+    enrollments       a compliance date window bounds enrolled_date from above only:
+                      an enrollment from years back that is still open is active in
+                      the window, so only partitions after the window's end are skipped.
+                      Daily rollups likewise skip only the future. "All history"
+                      reports, dashboard totals and status counts, listings, exports
+                      and lookups by id or employee read every partition: they cover
+                      all rows anyway, through each partition's indexes.
+
+Certifications themselves are not partitioned: expires_at is NULL for certificates
+that never expire, and MySQL requires the partition column in every unique key, which
+would make cert_number unique per month instead of per tenant. Their expiry range
+scans go through expiry_calendar instead.
+
+MySQL also refuses foreign keys on partitioned tables (in either direction), so
+convert() drops the database-level foreign keys to and from these tables; the ORM
+keeps its relationships. Converting rebuilds the table, so it is an explicit step
+(python -m app.jobs.partitions --convert); the same job adds future months.
+"""
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect, text
+
+# Partitioned table -> partition column (must be NOT NULL: it joins the primary key)
+PARTITIONED_TABLES: Dict[str, str] = {
+    "enrollments": "enrolled_date",
+    "expiry_calendar": "expiry_date",
+}
+
+FUTURE_PARTITION = "p_future"
+
+
+def _add_months(day: date, months: int) -> date:
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_bounds(first_day: date, today: date, months_ahead: int = 3) -> List[Tuple[str, date]]:
+    """
+    (name, exclusive upper bound) of every partition from the year of `first_day`
+    through the month `months_ahead` after today: yearly before today's year, monthly after
+    """
+    bounds = [(f"p{year}", date(year + 1, 1, 1)) for year in range(min(first_day.year, today.year), today.year)]
+    month = date(today.year, 1, 1)
+    last = _add_months(today, months_ahead)
+    while month <= last:
+        bounds.append((f"p{month:%Y_%m}", _add_months(month, 1)))
+        month = _add_months(month, 1)
+    return bounds
+
+
+def partition_definitions(bounds: List[Tuple[str, date]]) -> str:
+    """Partition list for PARTITION BY / REORGANIZE, ending with the MAXVALUE catch-all"""
+    partitions = [f"PARTITION {name} VALUES LESS THAN ('{bound.isoformat()}')" for name, bound in bounds]
+    partitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return "(\n    " + ",\n    ".join(partitions) + "\n)"
+
+
+def existing_bounds(connection, table: str) -> List[Tuple[str, Optional[date]]]:
+    """(name, upper bound) of the table's partitions in order; MAXVALUE is None. Empty if unpartitioned."""
+    rows = connection.execute(text(
+        "SELECT partition_name, partition_description FROM information_schema.partitions "
+        "WHERE table_schema = DATABASE() AND table_name = :table AND partition_name IS NOT NULL "
+        "ORDER BY partition_ordinal_position"
+    ), {"table": table}).all()
+    return [
+        (name, None if description == "MAXVALUE" else date.fromisoformat(description.strip("'")[:10]))
+        for name, description in rows
+    ]
+
+
+def convert(engine, table: str, today: date, months_ahead: int = 3) -> int:
+    """Partition an existing table in place; returns the number of partitions"""
+    column = PARTITIONED_TABLES[table]
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        # Foreign keys from the table and from every table that references it
+        for other in inspector.get_table_names():
+            for foreign_key in inspector.get_foreign_keys(other):
+                if (other == table or foreign_key["referred_table"] == table) and foreign_key.get("name"):
+                    connection.execute(text(f"ALTER TABLE {other} DROP FOREIGN KEY {foreign_key['name']}"))
+
+        if table == "enrollments":
+            connection.execute(text(
+                "UPDATE enrollments SET enrolled_date = COALESCE(created_at, UTC_TIMESTAMP()) WHERE enrolled_date IS NULL"
+            ))
+        first_day = connection.execute(text(f"SELECT MIN({column}) FROM {table}")).scalar() or today
+        primary_key = inspector.get_pk_constraint(table)["constrained_columns"]
+        column_type = next(c["type"] for c in inspector.get_columns(table) if c["name"] == column)
+        # Every unique key, the primary key included, must contain the partition column
+        connection.execute(text(
+            f"ALTER TABLE {table} MODIFY {column} {column_type.compile(dialect=engine.dialect)} NOT NULL, "
+            f"DROP PRIMARY KEY, ADD PRIMARY KEY ({', '.join(primary_key + [column])})"
+        ))
+        bounds = partition_bounds(first_day, today, months_ahead)
+        connection.execute(text(
+            f"ALTER TABLE {table} PARTITION BY RANGE COLUMNS({column}) {partition_definitions(bounds)}"
+        ))
+    return len(bounds) + 1
+
+
+def add_future_partitions(engine, table: str, today: date, months_ahead: int = 3) -> List[str]:
+    """Split p_future so monthly partitions cover today + months_ahead; returns the new partition names"""
+    with engine.begin() as connection:
+        bounds = [bound for _, bound in existing_bounds(connection, table) if bound is not None]
+        if not bounds:
+            return []
+        wanted = [
+            (name, bound) for name, bound in partition_bounds(today, today, months_ahead)
+            if bound > max(bounds)
+        ]
+        if wanted:
+            # p_future is empty while this runs on schedule, so the split moves no rows
+            connection.execute(text(
+                f"ALTER TABLE {table} REORGANIZE PARTITION {FUTURE_PARTITION} INTO {partition_definitions(wanted)}"
+            ))
+        return [name for name, _ in wanted]
@@ -0,0 +1,323 @@
+# app/pdf.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+import multiprocessing
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+try:
+    from pypdf import PdfWriter
+except ImportError:  # optional: without it department sections render sequentially
+    PdfWriter = None
+
+# Rows per table chunk. Roughly one letter page of 9pt rows, so reportlab never
+# has to split one huge table (which re-measures every remaining row per page)
+TABLE_CHUNK_ROWS = 40
+
+# Rows shown per detail section in the default (non-full) export
+PREVIEW_ROWS = 10
+
+# Process-pool rendering only pays off once a report has this many detail rows
+PARALLEL_MIN_ROWS = int(os.getenv("PDF_PARALLEL_MIN_ROWS", "2000"))
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", str(os.cpu_count() or 1)))
+
+EXPIRATION_HEADER = ['Employee', 'Certification', 'Days Left', 'Department']
+EXPIRATION_WIDTHS = [2*inch, 2*inch, 1*inch, 1.5*inch]
+MISSING_HEADER = ['Employee', 'Required Certification', 'Department', 'Status']
+MISSING_WIDTHS = [2*inch, 2*inch, 1.5*inch, 1.5*inch]
+
+
+@lru_cache(maxsize=None)
+def _styles() -> Dict[str, Any]:
+    """Paragraph and table styles, built once per process"""
+    sample = getSampleStyleSheet()
+
+    header = [
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ]
+
+    return {
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=sample['Heading1'],
+            fontSize=24,
+            spaceAfter=30,
+            alignment=1  # Center alignment
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=sample['Heading2'],
+            fontSize=16,
+            spaceAfter=12,
+            spaceBefore=20
+        ),
+        'normal': sample['Normal'],
+        'italic': sample['Italic'],
+        'summary_table': TableStyle(header + [
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ]),
+        'department_table': TableStyle(header + [
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ]),
+        'detail_table': TableStyle(header + [
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ]),
+    }
+
+
+def chunked_tables(
+    header: List[str],
+    rows: Sequence[List[str]],
+    col_widths: List[float],
+    style: str = 'detail_table'
+) -> List[Table]:
+    """Split rows into page-sized tables, each starting with the header row"""
+    table_style = _styles()[style]
+    tables = []
+    for start in range(0, max(len(rows), 1), TABLE_CHUNK_ROWS):
+        table = Table([header] + list(rows[start:start + TABLE_CHUNK_ROWS]), colWidths=col_widths, repeatRows=1)
+        table.setStyle(table_style)
+        tables.append(table)
+    return tables
+
+
+def _build(story: List[Any]) -> bytes:
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=72
+    )
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def _expiration_rows(expirations) -> List[List[str]]:
+    return [
+        [exp.employee_name, exp.certification_name[:30], str(exp.days_until_expiry), exp.department]
+        for exp in expirations
+    ]
+
+
+def _missing_rows(missing) -> List[List[str]]:
+    return [
+        [
+            miss.employee_name,
+            miss.required_certification[:30],
+            miss.department,
+            f"{miss.days_overdue} days overdue" if miss.days_overdue > 0 else "Missing"
+        ]
+        for miss in missing
+    ]
+
+
+def _overview_story(report, filters: Dict[str, Any]) -> List[Any]:
+    """Title, filters, summary, department and certification tables"""
+    styles = _styles()
+    story = [Paragraph("Compliance Report", styles['title'])]
+
+    date_range = filters.get('date_range') or {}
+    report_period = (
+        f"{date_range.get('start', 'N/A')} to {date_range.get('end', 'N/A')}"
+        if date_range else "All history"
+    )
+    story.append(Paragraph(f"Report Period: {report_period}", styles['normal']))
+
+    if filters.get('department') and filters['department'] != 'all':
+        story.append(Paragraph(f"Department: {filters['department']}", styles['normal']))
+
+    story.append(Spacer(1, 20))
+    story.append(Paragraph("Summary", styles['heading']))
+    summary_data = [
+        ['Metric', 'Value'],
+        ['Total Employees', str(report.total_employees)],
+        ['Compliant Employees', str(report.compliant_employees)],
+        ['Non-Compliant Employees', str(report.non_compliant_employees)],
+        ['Overall Compliance Rate', f"{report.overall_compliance_rate}%"],
+        ['Expiring Soon', str(report.expiring_soon)],
+        ['Expired Certifications', str(report.expired_certifications)],
+        ['Total Trainings', str(report.total_trainings)],
+        ['Completed Trainings', str(report.completed_trainings)],
+        ['Pending Trainings', str(report.pending_trainings)],
+    ]
+    story.extend(chunked_tables(summary_data[0], summary_data[1:], [3*inch, 2*inch], 'summary_table'))
+
+    if report.department_compliance:
+        story.append(Spacer(1, 20))
+        story.append(Paragraph("Department Compliance", styles['heading']))
+        story.extend(chunked_tables(
+            ['Department', 'Compliance Rate', 'Employees', 'Compliant'],
+            [
+                [dept.department, f"{dept.compliance_rate}%", str(dept.total_employees), str(dept.compliant_employees)]
+                for dept in report.department_compliance
+            ],
+            [2*inch, 1.5*inch, 1*inch, 1*inch],
+            'department_table'
+        ))
+
+    if report.certification_status:
+        story.append(Spacer(1, 20))
+        story.append(Paragraph("Certification Status", styles['heading']))
+        story.extend(chunked_tables(
+            ['Certification', 'Total', 'Valid', 'Expiring Soon', 'Expired', 'Rate'],
+            [
+                [
+                    cert.certification[:30],  # Limit name length
+                    str(cert.total),
+                    str(cert.valid),
+                    str(cert.expiring_soon),
+                    str(cert.expired),
+                    f"{cert.compliance_rate}%"
+                ]
+                for cert in report.certification_status
+            ],
+            [2*inch, 0.8*inch, 0.8*inch, 1*inch, 0.8*inch, 0.8*inch]
+        ))
+
+    return story
+
+
+def _detail_story(
+    title: Optional[str],
+    expiration_rows: List[List[str]],
+    missing_rows: List[List[str]]
+) -> List[Any]:
+    """Upcoming expiration and missing certification tables, optionally under a department heading"""
+    styles = _styles()
+    story: List[Any] = []
+    if title:
+        story.append(Spacer(1, 20))
+        story.append(Paragraph(title, styles['heading']))
+
+    if expiration_rows:
+        story.append(Spacer(1, 20))
+        story.append(Paragraph("Upcoming Expirations (Next 30 Days)", styles['heading']))
+        story.extend(chunked_tables(EXPIRATION_HEADER, expiration_rows, EXPIRATION_WIDTHS))
+
+    if missing_rows:
+        story.append(Spacer(1, 20))
+        story.append(Paragraph("Missing Required Certifications", styles['heading']))
+        story.extend(chunked_tables(MISSING_HEADER, missing_rows, MISSING_WIDTHS))
+
+    return story
+
+
+def _footer_story() -> List[Any]:
+    return [
+        Spacer(1, 20),
+        Paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", _styles()['italic'])
+    ]
+
+
+def _render_department_part(
+    title: str,
+    expiration_rows: List[List[str]],
+    missing_rows: List[List[str]],
+    footer: bool = False
+) -> bytes:
+    """Process-pool entry point: render one department's detail sections to standalone PDF bytes"""
+    story = _detail_story(title, expiration_rows, missing_rows)
+    return _build(story + _footer_story() if footer else story)
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    """Worker processes are started once and reused across exports"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # spawn: forking a process that holds DB connections and server threads is unsafe
+            _executor = ProcessPoolExecutor(
+                max_workers=PDF_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def _department_parts(report) -> Dict[str, Dict[str, List[List[str]]]]:
+    """Full detail rows grouped by department, in department order"""
+    parts: Dict[str, Dict[str, List[List[str]]]] = {}
+    for row in _expiration_rows(report.upcoming_expirations):
+        parts.setdefault(row[3], {"expirations": [], "missing": []})["expirations"].append(row)
+    for row in _missing_rows(report.missing_certifications):
+        parts.setdefault(row[2], {"expirations": [], "missing": []})["missing"].append(row)
+    return dict(sorted(parts.items()))
+
+
+def render_compliance_report(report, filters: Dict[str, Any], *, full: bool = False, parallel: bool = True) -> bytes:
+    """
+    Render a ComplianceMetrics report to PDF bytes.
+
+    By default the detail sections show the first PREVIEW_ROWS rows. With full=True
+    every row is rendered, grouped into one section per department; large reports
+    then render those sections in a process pool and merge the results with pypdf.
+    """
+    if not full:
+        story = _overview_story(report, filters)
+        story.extend(_detail_story(
+            None,
+            _expiration_rows(report.upcoming_expirations[:PREVIEW_ROWS]),
+            _missing_rows(report.missing_certifications[:PREVIEW_ROWS])
+        ))
+        return _build(story + _footer_story())
+
+    parts = _department_parts(report)
+    detail_rows = len(report.upcoming_expirations) + len(report.missing_certifications)
+    use_pool = (
+        parallel
+        and PdfWriter is not None
+        and PDF_RENDER_WORKERS > 1
+        and len(parts) > 1
+        and detail_rows >= PARALLEL_MIN_ROWS
+    )
+
+    if not use_pool:
+        story = _overview_story(report, filters)
+        for department, rows in parts.items():
+            story.extend(_detail_story(f"Department: {department}", rows["expirations"], rows["missing"]))
+        return _build(story + _footer_story())
+
+    executor = _get_executor()
+    futures = [
+        executor.submit(
+            _render_department_part,
+            f"Department: {department}",
+            rows["expirations"],
+            rows["missing"],
+            index == len(parts) - 1
+        )
+        for index, (department, rows) in enumerate(parts.items())
+    ]
+    # The overview renders here while the workers handle the department sections
+    overview = _build(_overview_story(report, filters))
+
+    writer = PdfWriter()
+    writer.append(BytesIO(overview))
+    for future in futures:
+        writer.append(BytesIO(future.result()))
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
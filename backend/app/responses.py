@@ -0,0 +1,49 @@
+# app/responses.py
+import json
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+
+from .streaming import _json_default
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when it is installed.
+    Accepts already-encoded bytes as content, which are sent untouched.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        if orjson is not None:
+            # orjson handles datetimes itself and calls default for the rest (Decimal from MySQL SUM/AVG)
+            return orjson.dumps(content, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_json_default).encode("utf-8")
+
+
+def model_response(
+    model: BaseModel,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None
+) -> Response:
+    """
+    Serialize a Pydantic model straight to JSON bytes with pydantic-core.
+
+    Returning a Response skips FastAPI's response_model pass (re-validation,
+    jsonable_encoder and stdlib json.dumps); the route's response_model still
+    documents the schema. Only use it where the model returned is already the
+    declared response_model, so the output is identical.
+    """
+    return Response(
+        content=model.model_dump_json(by_alias=True),
+        status_code=status_code,
+        headers=dict(headers) if headers else None,
+        media_type="application/json"
+    )
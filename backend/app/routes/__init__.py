@@ -5,6 +5,8 @@ from .certifications import router as certification_router
 from .enrollments import router as enrollment_router  # NEW
 from .dashboard import router as dashboard_router
 from .compliance import router as compliance_router
+from .changes import router as changes_router
+from .tenants import router as tenant_router
 
 __all__ = [
     "employee_router",
@@ -13,5 +15,7 @@ __all__ = [
     "certification_router",
     "enrollment_router",  # NEW
     "dashboard_router",
-    "compliance_router"
+    "compliance_router",
+    "changes_router",
+    "tenant_router"
 ]
\ No newline at end of file
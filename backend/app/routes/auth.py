@@ -2,13 +2,14 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
+from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from jose import jwt, JWTError
 from typing import Optional
-
-SECRET_KEY = "supersecretkey"  # use .env in production
-ALGITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 60
+from ..database import get_db
+from ..crud.tenant import tenant as crud_tenant
+from ..security import SECRET_KEY, ALGITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from ..tenancy import DEFAULT_TENANT_ID, TENANT_CLAIM
 
 router = APIRouter(tags=["auth"], prefix="/auth")
 
@@ -21,18 +22,29 @@ USER = {
 class LoginRequest(BaseModel):
     email: str
     password: str
+    tenant: Optional[str] = None  # Tenant slug; the default tenant when omitted
 
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
 
 @router.post("/login", response_model=TokenResponse)
-def login(data: LoginRequest):  
+def login(data: LoginRequest, db: Session = Depends(get_db)):  
     if data.email.strip().lower() != USER["email"].lower() or data.password != USER["password"]:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
     
+    # The token's tenant scopes every request made with it (see app/tenancy.py). Any
+    # user may pick any tenant: credentials aren't tied to tenants yet, so the claim
+    # is not an authorization boundary
+    tenant_id = DEFAULT_TENANT_ID
+    if data.tenant:
+        tenant = crud_tenant.get_by_slug(db, data.tenant)
+        if tenant is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Unknown tenant")
+        tenant_id = tenant.id
+    
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    payload = {"sub": USER["email"], "exp": expire}
+    payload = {"sub": USER["email"], "exp": expire, TENANT_CLAIM: tenant_id}
     token = jwt.encode(payload, SECRET_KEY, algorithm=ALGITHM)
     
     return {"access_token": token}
\ No newline at end of file
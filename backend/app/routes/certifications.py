@@ -1,10 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
 from ..database import get_db
 from ..crud import certification as crud_certification
 from ..schemas.certification import Certification, CertificationCreate, CertificationUpdate, CertificationList
 from ..dependecies import get_current_user
+from ..streaming import export_response
+from ..responses import model_response
+from ..etag import conditional_get
+from ..models import Certification as CertificationModel
 
 router = APIRouter(prefix="/certifications", tags=["certifications"])
 
@@ -14,10 +19,12 @@ def read_certifications(
     limit: int = Query(100, ge=1, le=1000),
     status: Optional[str] = Query(None, description="Filter by status"),
     employee_id: Optional[int] = Query(None, description="Filter by employee ID"),
+    include_archived: bool = Query(False, description="Also list rows moved to the archive"),
     db: Session = Depends(get_db), 
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    validators: dict = Depends(conditional_get(CertificationModel))
 ):
-    items = crud_certification.get_multi(db, skip, limit)
+    items = crud_certification.get_multi(db, skip, limit, include_archived=include_archived)
     
     # Apply filters if provided
     if status:
@@ -25,8 +32,18 @@ def read_certifications(
     if employee_id:
         items = [item for item in items if item.employee_id == employee_id]
     
-    total = crud_certification.get_total_count(db)
-    return CertificationList(certifications=items, total=total, skip=skip, limit=limit)
+    total = crud_certification.get_total_count(db, include_archived=include_archived)
+    return model_response(CertificationList(certifications=items, total=total, skip=skip, limit=limit), headers=validators)
+
+@router.get("/export")
+def export_certifications(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+    updated_since: Optional[datetime] = Query(None, description="Only export rows updated at or after this time"),
+    db: Session = Depends(get_db), 
+    current_user: dict = Depends(get_current_user)):
+    """Stream every certification row as NDJSON or CSV for bulk/incremental extraction"""
+    columns, rows = crud_certification.stream(db, updated_since=updated_since)
+    return export_response(rows, columns, format, filename="certifications")
 
 @router.get("/{certification_id}", response_model=Certification)
 def read_certification(
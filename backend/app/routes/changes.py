@@ -0,0 +1,28 @@
+# app/routes/changes.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import Optional
+from ..database import get_db
+from ..crud import changes as crud_changes
+from ..schemas.changes import ChangeFeed
+from ..dependecies import get_current_user
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+@router.get("", response_model=ChangeFeed)
+def read_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous call; omit for a full sync"),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db), 
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Incremental change feed across employees, trainings, enrollments and certifications.
+
+    Returns upserts (full rows) and deletes in (updated_at, id) order. Pass the returned
+    next_token as `since` on the next call; keep paging while has_more is true.
+    """
+    try:
+        return crud_changes.get_changes(db, since=since, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
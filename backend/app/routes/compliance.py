@@ -1,23 +1,35 @@
 # app/routes/compliance.py
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
 from fastapi.responses import StreamingResponse, JSONResponse
 from sqlalchemy.orm import Session
-from typing import Dict, Any
-from datetime import datetime
+from typing import Dict, Any, Optional, Union
+from datetime import datetime, date, timedelta
 
 from app.database import get_db
 from app.schemas import (
     ReportFilters, 
     ComplianceMetrics,
+    ComplianceTrends,
+    MissingCertificationPage,
+    UpcomingExpirationPage,
+    DepartmentCompliancePage,
+    ComplianceSummary,
 )
 from ..crud import compliance  # Changed from app.crud to app.services
+from ..crud import compliance_trends
+from ..crud import compliance_sections
+from ..crud.compliance import COLUMNAR_FORMATS, REPORT_MODELS
 from ..dependecies import get_current_user
+from ..cache import report_cache
+from ..data_versions import data_version
+from ..responses import FastJSONResponse, model_response
 
 router = APIRouter(prefix="/api/compliance", tags=["compliance"])
 
-@router.post("/report", response_model=ComplianceMetrics)
+@router.post("/report", response_model=Union[ComplianceMetrics, ComplianceSummary])
 async def generate_compliance_report(
     filters: ReportFilters,
+    summary: bool = Query(False, description="Return only the headline counts, without the per-row sections"),
     db: Session = Depends(get_db), 
     current_user: dict = Depends(get_current_user)
 ):
@@ -38,14 +50,20 @@ async def generate_compliance_report(
     - Upcoming expirations
     - Missing certifications
     - Training statistics
+    
+    With **summary=true** only the counts are returned; page through the rows with
+    the /upcoming-expirations, /missing-certifications and /department-compliance endpoints.
     """
     try:
         # Convert filters to dict for the service
         filters_dict = filters.dict()
         
+        if summary:
+            return model_response(compliance.get_compliance_summary(db, filters_dict))
+        
         # Generate the report
         report = compliance.get_compliance_report(db, filters_dict)
-        return report
+        return model_response(report)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -58,14 +76,16 @@ async def generate_compliance_report(
 async def export_compliance_report(
     format: str,
     filters: ReportFilters,
+    full: bool = Query(False, description="PDF only: include every upcoming expiration and missing certification, grouped by department"),
     db: Session = Depends(get_db), 
     current_user: dict = Depends(get_current_user)
 ):
     """
     Export compliance report in specified format
     
-    - **format**: Export format (excel or pdf)
+    - **format**: Export format (excel, pdf, or parquet/arrow/csv for a zip with one file per section)
     - **filters**: Same filters as the compliance report endpoint
+    - **full**: For PDF, render the complete detail sections instead of the first 10 rows
     
     Returns a downloadable file in the specified format.
     """
@@ -87,7 +107,7 @@ async def export_compliance_report(
                 }
             )
         elif format.lower() == "pdf":
-            pdf_data = compliance.export_to_pdf(db, filters_dict)
+            pdf_data = compliance.export_to_pdf(db, filters_dict, full=full)
             
             filename = f"compliance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
             
@@ -98,10 +118,22 @@ async def export_compliance_report(
                     "Content-Disposition": f'attachment; filename="{filename}"'
                 }
             )
+        elif format.lower() in COLUMNAR_FORMATS:
+            archive = compliance.export_columnar(db, filters_dict, format.lower())
+            
+            filename = f"compliance_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{format.lower()}.zip"
+            
+            return StreamingResponse(
+                archive,
+                media_type="application/zip",
+                headers={
+                    "Content-Disposition": f'attachment; filename="{filename}"'
+                }
+            )
         else:
             raise HTTPException(
                 status_code=400, 
-                detail=f"Unsupported format: {format}. Supported formats: excel (for .xlsx), pdf"
+                detail=f"Unsupported format: {format}. Supported formats: excel (for .xlsx), pdf, parquet, arrow, csv"
             )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -109,4 +141,111 @@ async def export_compliance_report(
         raise HTTPException(
             status_code=500, 
             detail=f"Failed to export compliance report: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+@router.get("/cache-stats", response_class=FastJSONResponse)
+def get_report_cache_stats(db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)):
+    """Hit/miss/eviction counters for the compliance report cache shared by /report and /export"""
+    return {**report_cache.stats(), "data_version": data_version(db, REPORT_MODELS)}
+
+@router.get("/trends", response_model=ComplianceTrends)
+def get_compliance_trends(
+    start: Optional[date] = Query(None, description="First day of the range (default: 12 months ago)"),
+    end: Optional[date] = Query(None, description="Last day of the range (default: today)"),
+    bucket: str = Query("month", pattern="^(day|week|month)$", description="Bucket size: day, week or month"),
+    department: str = Query("all", description='Department name, or "all" for the organisation-wide series'),
+    include_departments: bool = Query(False, description="Return every department's series plus the overall one"),
+    db: Session = Depends(get_db), 
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Compliance rate, completion rate and expiring certification trends
+    
+    Answers from the precomputed compliance_snapshots series (written daily by
+    app.jobs.compliance_snapshots), so no report has to be recomputed per past day.
+    """
+    end = end or datetime.now().date()
+    start = start or (end - timedelta(days=365))
+    try:
+        return compliance_trends.get_trends(
+            db,
+            start=start,
+            end=end,
+            bucket=bucket,
+            department=department,
+            include_departments=include_departments
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _section_filters(department: str, start: Optional[date], end: Optional[date]) -> Dict[str, Any]:
+    """Build the report filters dict the section queries share with /report"""
+    filters_dict: Dict[str, Any] = {"department": department}
+    if start or end:
+        filters_dict["date_range"] = {"start": start, "end": end}
+    return filters_dict
+
+@router.get("/upcoming-expirations", response_model=UpcomingExpirationPage)
+def get_upcoming_expirations(
+    department: str = Query("all", description='Department name, or "all"'),
+    start: Optional[date] = Query(None, description="Only certifications valid on or after this day"),
+    end: Optional[date] = Query(None, description="Only certifications valid on or before this day"),
+    days: int = Query(30, ge=1, le=365, description="Look-ahead window in days"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db), 
+    current_user: dict = Depends(get_current_user)
+):
+    """Certifications expiring soon, soonest first, one keyset page at a time"""
+    try:
+        return compliance_sections.upcoming_expirations(
+            db, _section_filters(department, start, end), days=days, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/missing-certifications", response_model=MissingCertificationPage)
+def get_missing_certifications(
+    department: str = Query("all", description='Department name, or "all"'),
+    start: Optional[date] = Query(None, description="Only enrollments active on or after this day"),
+    end: Optional[date] = Query(None, description="Only enrollments active on or before this day"),
+    sort: str = Query("days_overdue_desc", pattern="^days_overdue_(asc|desc)$", description="Sort by days overdue"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over skip)"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db), 
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Completed trainings with no matching certification, one page at a time
+    
+    Only the missing rows are read from the database (a single anti-join),
+    so large organisations can page through them without building a full report.
+    """
+    try:
+        return compliance_sections.missing_certifications(
+            db, _section_filters(department, start, end), sort=sort, limit=limit, skip=skip, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/department-compliance", response_model=DepartmentCompliancePage)
+def get_department_compliance(
+    department: str = Query("all", description='Department name, or "all"'),
+    start: Optional[date] = Query(None, description="Only records active on or after this day"),
+    end: Optional[date] = Query(None, description="Only records active on or before this day"),
+    min_rate: Optional[float] = Query(None, ge=0, le=100, description="Only departments at or above this compliance rate"),
+    max_rate: Optional[float] = Query(None, ge=0, le=100, description="Only departments at or below this compliance rate"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db), 
+    current_user: dict = Depends(get_current_user)
+):
+    """Per-department compliance aggregated in the database, ordered by department name"""
+    try:
+        return compliance_sections.department_compliance(
+            db, _section_filters(department, start, end),
+            min_rate=min_rate, max_rate=max_rate, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -1,23 +1,32 @@
 from sqlalchemy import func, case, and_, or_
 from datetime import datetime, timedelta
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-import pytz
+import os
 from typing import Dict, List, Any
 from ..database import get_db
-from ..models import Employee, Training, Department, Enrollment, Certification
+from ..models import Employee, Training, Department, Enrollment, Certification, ExpiryCalendarEntry
 from ..schemas.dashboard import DashboardDataResponse
-from ..dependecies import get_current_user
+from ..crud import metrics as crud_metrics, expiry_calendar, archive
+from ..dependecies import get_current_user, get_stream_user
+from ..events import dashboard_bus
+from ..streaming import iter_sse
+from ..responses import model_response
+from ..etag import conditional_get
+from ..tenancy import claim_tenant
+from ..timezones import LocalClock, format_date
 
 router = APIRouter(prefix="/api/dashboard", tags=["dashboard"])
 
-# Your timezone (Asia/Kolkata = IST = UTC+5:30)
-IST = pytz.timezone('Asia/Kolkata')
+# Idle seconds between SSE keep-alive comments
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
 
 @router.get("/dashboard-data", response_model=DashboardDataResponse)
 async def get_dashboard_data(
     db: Session = Depends(get_db), 
-    current_user: dict = Depends(get_current_user)):
+    current_user: dict = Depends(get_current_user),
+    validators: dict = Depends(conditional_get(Employee, Training, Department, Enrollment, Certification, daily=True))):
     """
     Returns fully processed dashboard data including:
     - Stats with growth percentages
@@ -27,20 +36,13 @@ async def get_dashboard_data(
     - HR metrics
     """
     try:
-        # Get current time in IST
-        now_ist = datetime.now(IST)
-        today_ist = now_ist.date()
-        yesterday_ist = today_ist - timedelta(days=1)
+        # Current time in the org timezone; every day boundary below is computed once from it, as naive UTC
+        clock = LocalClock()
+        yesterday_ist = clock.today - timedelta(days=1)
         
         # ===== 1. DASHBOARD STATS =====
-        def count_up_to_ist_date(model, date_field, ist_date):
-            local_end_of_day = IST.localize(
-                datetime.combine(ist_date, datetime.max.time())
-            )
-            utc_end_of_day = local_end_of_day.astimezone(pytz.utc)
-            return db.query(func.count(model.id)).filter(
-                getattr(model, date_field) <= utc_end_of_day
-            ).scalar() or 0
+        # Yesterday's totals come from the daily rollup instead of re-scanning history
+        yesterday_metrics = crud_metrics.get_or_snapshot(db, yesterday_ist)
         
         # Total counts
         total_employees = db.query(func.count(Employee.id)).scalar() or 0
@@ -49,46 +51,43 @@ async def get_dashboard_data(
         active_enrollments = db.query(func.count(Enrollment.id)).filter(
             Enrollment.status.in_(["enrolled", "in_progress"])
         ).scalar() or 0
-        total_certifications = db.query(func.count(Certification.id)).scalar() or 0
+        # Archived enrollments and certifications still count towards the totals
+        archived = archive.totals(db)
+        total_certifications = (db.query(func.count(Certification.id)).scalar() or 0) + archived["certifications"]
         
         # Growth calculations
-        employees_yesterday = count_up_to_ist_date(Employee, 'created_at', yesterday_ist)
-        employee_growth_percentage = calculate_growth(total_employees, employees_yesterday)
+        employee_growth_percentage = calculate_growth(total_employees, yesterday_metrics.total_employees)
         
-        trainings_yesterday = count_up_to_ist_date(Training, 'created_at', yesterday_ist)
-        training_growth_percentage = calculate_growth(total_trainings, trainings_yesterday)
+        training_growth_percentage = calculate_growth(total_trainings, yesterday_metrics.total_trainings)
         
-        enrollments_yesterday = count_up_to_ist_date(Enrollment, 'enrolled_date', yesterday_ist)
-        total_enrollments = db.query(func.count(Enrollment.id)).scalar() or 0
-        enrollment_growth_percentage = calculate_growth(total_enrollments, enrollments_yesterday)
+        total_enrollments = (db.query(func.count(Enrollment.id)).scalar() or 0) + archived["enrollments"]
+        enrollment_growth_percentage = calculate_growth(total_enrollments, yesterday_metrics.total_enrollments)
         
-        certifications_yesterday = count_up_to_ist_date(Certification, 'issued_date', yesterday_ist)
-        certification_growth_percentage = calculate_growth(total_certifications, certifications_yesterday)
+        certification_growth_percentage = calculate_growth(total_certifications, yesterday_metrics.total_certifications)
         
         # Expiring certifications (next 30 days)
-        thirty_days_from_now_ist = now_ist + timedelta(days=30)
-        thirty_days_from_now_utc = thirty_days_from_now_ist.astimezone(pytz.utc)
-        
-        expiring_certifications = db.query(func.count(Certification.id)).filter(
-            Certification.expires_at <= thirty_days_from_now_utc,
-            Certification.expires_at > now_ist.astimezone(pytz.utc),
-            Certification.status == "active"
+        expiring_certifications = expiry_calendar.expiring_between(
+            db.query(func.count(ExpiryCalendarEntry.certification_id)).join(
+                Certification, Certification.id == ExpiryCalendarEntry.certification_id
+            ),
+            clock.now_utc, clock.days_from_now(30)
+        ).filter(
+            ExpiryCalendarEntry.status == "active"
         ).scalar() or 0
         
         # Expired certifications
-        expired_certifications = db.query(func.count(Certification.id)).filter(
+        expired_certifications = (db.query(func.count(Certification.id)).filter(
             Certification.status == "expired"
-        ).scalar() or 0
+        ).scalar() or 0) + archived["expired_certifications"]
         
         # Completion rate
-        completed_enrollments = db.query(func.count(Enrollment.id)).filter(
+        completed_enrollments = (db.query(func.count(Enrollment.id)).filter(
             Enrollment.status == "completed"
-        ).scalar() or 0
-        total_enrollments_count = db.query(func.count(Enrollment.id)).scalar() or 1
+        ).scalar() or 0) + archived["completed_enrollments"]
+        total_enrollments_count = total_enrollments or 1
         completion_rate = round((completed_enrollments / total_enrollments_count) * 100, 1)
         
-        completed_yesterday = count_up_to_ist_date(Enrollment, 'completed_date', yesterday_ist)
-        completion_change_percentage = calculate_growth(completed_enrollments, completed_yesterday)
+        completion_change_percentage = calculate_growth(completed_enrollments, yesterday_metrics.completed_enrollments)
         
         # Total training hours
         total_training_hours_result = db.query(
@@ -98,7 +97,10 @@ async def get_dashboard_data(
         ).filter(
             Enrollment.status == "completed"
         ).scalar()
-        total_training_hours = total_training_hours_result or 0
+        total_training_hours = (total_training_hours_result or 0) + archived["training_hours"]
+        
+        expiring_change_percentage = calculate_growth(expiring_certifications, yesterday_metrics.expiring_certifications)
+        training_hours_growth_percentage = calculate_growth(total_training_hours, yesterday_metrics.total_training_hours)
         
         stats = {
             "total_employees": total_employees,
@@ -112,9 +114,9 @@ async def get_dashboard_data(
             "employee_growth_percentage": employee_growth_percentage,
             "enrollment_growth_percentage": enrollment_growth_percentage,
             "certification_growth_percentage": certification_growth_percentage,
-            "expiring_change_percentage": 0.0,
+            "expiring_change_percentage": expiring_change_percentage,
             "completion_change_percentage": completion_change_percentage,
-            "training_hours_growth_percentage": 0.0,
+            "training_hours_growth_percentage": training_hours_growth_percentage,
             "training_growth_percentage": training_growth_percentage
         }
         
@@ -133,17 +135,18 @@ async def get_dashboard_data(
         # 2. Certified (if not training but has active certifications)
         # 3. Available (if not training and no certifications)
         
-        # Count employees in each category (mutually exclusive)
-        in_training_count = db.query(func.count()).filter(
+        # Count employees in each category (mutually exclusive); select_from(Employee)
+        # names the entity, so the tenant criteria applies to the counts
+        in_training_count = db.query(func.count()).select_from(Employee).filter(
             Employee.id.in_(db.query(in_training_subq.c.employee_id))
         ).scalar() or 0
         
-        certified_count = db.query(func.count()).filter(
+        certified_count = db.query(func.count()).select_from(Employee).filter(
             ~Employee.id.in_(db.query(in_training_subq.c.employee_id)),  # Not in training
             Employee.id.in_(db.query(certified_subq.c.employee_id))      # But certified
         ).scalar() or 0
         
-        available_count = db.query(func.count()).filter(
+        available_count = db.query(func.count()).select_from(Employee).filter(
             ~Employee.id.in_(db.query(in_training_subq.c.employee_id)),  # Not in training
             ~Employee.id.in_(db.query(certified_subq.c.employee_id))     # Not certified
         ).scalar() or 0
@@ -207,21 +210,21 @@ async def get_dashboard_data(
         }
         
         # ===== 3. CERTIFICATION ALERTS (replacing Training Certifications) =====
-        certification_alerts = get_certification_alerts_data(db, now_ist)
+        certification_alerts = get_certification_alerts_data(db, clock)
         
         # ===== 4. TRAINING PROGRESS =====
-        training_progress = get_training_progress_data(db)
+        training_progress = get_training_progress_data(db, clock)
         
         # ===== 5. HR METRICS =====
         hr_metrics = get_hr_metrics_data(db)
         
-        return {
+        return model_response(DashboardDataResponse.model_validate({
             "stats": stats,
             "employeeStatus": employee_status,
             "certificationAlerts": certification_alerts,
             "trainingProgress": training_progress,
             "hrMetrics": hr_metrics
-        }
+        }), headers=validators)
         
     except Exception as e:
         print(f"Dashboard processed data error: {str(e)}")
@@ -230,6 +233,29 @@ async def get_dashboard_data(
         raise HTTPException(status_code=500, detail=f"Failed to process dashboard data: {str(e)}")
     
 
+@router.get("/stream")
+async def stream_dashboard_updates(
+    request: Request,
+    current_user: dict = Depends(get_stream_user)):
+    """
+    Server-Sent Events stream of dashboard deltas (see app/events/dashboard.py):
+    `stats` counter changes, new certification `alert`s and training `progress`
+    updates, pushed once per committed write. Load /dashboard-data first, then
+    apply deltas; on a `resync` event re-fetch it.
+
+    Browsers' EventSource cannot set headers, so the token may be passed as ?token=.
+    """
+    return StreamingResponse(
+        iter_sse(
+            dashboard_bus,
+            request.is_disconnected,
+            heartbeat=SSE_HEARTBEAT_SECONDS,
+            channel=claim_tenant(current_user)
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Helper functions
 def calculate_growth(today_total: int, yesterday_total: int) -> float:
     """Calculate percentage growth from yesterday to today"""
@@ -244,26 +270,19 @@ def calculate_growth(today_total: int, yesterday_total: int) -> float:
     else:
         return 0.0
 
-def get_certification_alerts_data(db: Session, now_ist: datetime) -> Dict[str, Any]:
+def get_certification_alerts_data(db: Session, clock: LocalClock) -> Dict[str, Any]:
     """Get categorized certification alerts for expiring/expired certifications"""
     try:
-        now_utc = now_ist.astimezone(pytz.utc)
-        thirty_days_from_now_utc = (now_ist + timedelta(days=30)).astimezone(pytz.utc)
-        
-        # Query certifications that are expiring or expired
-        certifications = db.query(
-            Certification,
-            Employee,
-            Training
-        ).join(
-            Employee, Employee.id == Certification.employee_id
-        ).join(
-            Training, Training.id == Certification.training_id
+        # Calendar rows are naive UTC, bucketed by local day, so no per-row timezone work is needed
+        now_utc = clock.now_utc
+        thirty_days_from_now_utc = clock.days_from_now(30)
+        expiring_soon_until = clock.days_from_now(7)
+        
+        # Everything expiring up to 30 days from now; expiryDate is the department's local day
+        certifications = expiry_calendar.expiring_by(
+            expiry_calendar.entries(db), thirty_days_from_now_utc
         ).filter(
-            Certification.expires_at <= thirty_days_from_now_utc,
-            Certification.status.in_(["active", "expired"])
-        ).order_by(
-            Certification.expires_at.asc()
+            ExpiryCalendarEntry.status.in_(["active", "expired"])
         ).all()
         
         # Initialize categorized lists
@@ -271,58 +290,27 @@ def get_certification_alerts_data(db: Session, now_ist: datetime) -> Dict[str, A
         expiring_soon_alerts = []
         expiring_later_alerts = []
         
-        for cert, employee, training in certifications:
-            # Handle timezone comparison properly
-            if cert.expires_at:
-                # Make both datetimes offset-aware for comparison
-                expires_at_aware = cert.expires_at
-                if cert.expires_at.tzinfo is None:
-                    # If expires_at is naive, assume it's UTC
-                    expires_at_aware = pytz.utc.localize(cert.expires_at)
-                
-                # Determine status
-                if cert.status == "expired" or expires_at_aware < now_utc:
-                    status = "expired"
-                elif expires_at_aware <= (now_utc + timedelta(days=7)):
-                    status = "expiring_soon"
-                else:
-                    status = "expiring_later"
+        for cert in certifications:
+            # Determine status
+            if cert.status == "expired" or cert.expires_at < now_utc:
+                status = "expired"
+            elif cert.expires_at <= expiring_soon_until:
+                status = "expiring_soon"
             else:
-                # If no expiry date, treat as not expiring
-                if cert.status == "expired":
-                    status = "expired"
-                else:
-                    # Skip certifications without expiry dates (they shouldn't be in alerts)
-                    continue
-            
-            # Get department
-            dept_name = "Unassigned"
-            if employee.department_id:
-                dept = db.query(Department).filter(Department.id == employee.department_id).first()
-                dept_name = dept.name if dept else "Unknown"
+                status = "expiring_later"
             
             # Get avatar
-            first_initial = employee.first_name[0] if employee.first_name else 'E'
-            last_initial = employee.last_name[0] if employee.last_name else 'm'
+            first_initial = cert.first_name[0] if cert.first_name else 'E'
+            last_initial = cert.last_name[0] if cert.last_name else 'm'
             avatar_url = f"https://ui-avatars.com/api/?name={first_initial}{last_initial}&background=random&color=fff&size=40"
             
-            # Format date
-            expiry_date = ""
-            if cert.expires_at:
-                # Convert to IST for display
-                if cert.expires_at.tzinfo is None:
-                    expires_at_local = pytz.utc.localize(cert.expires_at).astimezone(IST)
-                else:
-                    expires_at_local = cert.expires_at.astimezone(IST)
-                expiry_date = expires_at_local.strftime("%Y-%m-%d")
-            
             alert_item = {
                 "id": str(cert.id),
-                "name": f"{employee.first_name or ''} {employee.last_name or ''}".strip() or "Unknown Employee",
-                "role": employee.position or "Employee",
-                "department": dept_name,
-                "certificationName": training.name or "Unknown Certification",
-                "expiryDate": expiry_date,
+                "name": f"{cert.first_name or ''} {cert.last_name or ''}".strip() or "Unknown Employee",
+                "role": cert.position or "Employee",
+                "department": cert.department_name or ("Unknown" if cert.department_id else "Unassigned"),
+                "certificationName": cert.training_name or "Unknown Certification",
+                "expiryDate": format_date(cert.expiry_date),
                 "status": status,
                 "avatarUrl": avatar_url
             }
@@ -332,7 +320,7 @@ def get_certification_alerts_data(db: Session, now_ist: datetime) -> Dict[str, A
                 expired_alerts.append(alert_item)
             elif status == "expiring_soon":
                 expiring_soon_alerts.append(alert_item)
-            elif status == "expiring_later":
+            else:
                 expiring_later_alerts.append(alert_item)
         
         return {
@@ -391,22 +379,23 @@ def get_top_performer(db: Session, total_trainings: int) -> Dict[str, Any]:
         "performance": 0
     }
 
-def get_expiring_avatars(db: Session, now_ist: datetime) -> List[str]:
+def get_expiring_avatars(db: Session, clock: LocalClock) -> List[str]:
     """Get avatar URLs for employees with expiring certifications"""
     try:
-        thirty_days_from_now_ist = now_ist + timedelta(days=30)
-        thirty_days_from_now_utc = thirty_days_from_now_ist.astimezone(pytz.utc)
-        
-        expiring_employees = db.query(
-            Employee.id,
-            Employee.first_name,
-            Employee.last_name
-        ).join(
-            Certification, Certification.employee_id == Employee.id
+
+        expiring_employees = expiry_calendar.expiring_between(
+            db.query(
+                Employee.id,
+                Employee.first_name,
+                Employee.last_name
+            ).join(
+                ExpiryCalendarEntry, ExpiryCalendarEntry.employee_id == Employee.id
+            ).join(
+                Certification, Certification.id == ExpiryCalendarEntry.certification_id
+            ),
+            clock.now_utc, clock.days_from_now(30)
         ).filter(
-            Certification.expires_at <= thirty_days_from_now_utc,
-            Certification.expires_at > now_ist.astimezone(pytz.utc),
-            Certification.status == "active"
+            ExpiryCalendarEntry.status == "active"
         ).distinct().limit(4).all()
         
         avatars = []
@@ -421,16 +410,12 @@ def get_expiring_avatars(db: Session, now_ist: datetime) -> List[str]:
         print(f"Error getting expiring avatars: {e}")
         return []
 
-def get_upcoming_deadlines_count(db: Session, now_ist: datetime) -> int:
+def get_upcoming_deadlines_count(db: Session, clock: LocalClock) -> int:
     """Count enrollments with deadlines within 7 days"""
     try:
-        seven_days_from_now_ist = now_ist + timedelta(days=7)
-        seven_days_from_now_utc = seven_days_from_now_ist.astimezone(pytz.utc)
-        now_utc = now_ist.astimezone(pytz.utc)
-        
         count = db.query(func.count(Enrollment.id)).filter(
-            Enrollment.end_date <= seven_days_from_now_utc,
-            Enrollment.end_date > now_utc,
+            Enrollment.end_date <= clock.days_from_now(7),
+            Enrollment.end_date > clock.now_utc,
             Enrollment.status.in_(["enrolled", "in_progress"])
         ).scalar() or 0
         
@@ -439,7 +424,7 @@ def get_upcoming_deadlines_count(db: Session, now_ist: datetime) -> int:
         print(f"Error getting upcoming deadlines: {e}")
         return 0
 
-def get_training_progress_data(db: Session) -> List[Dict[str, Any]]:
+def get_training_progress_data(db: Session, clock: LocalClock) -> List[Dict[str, Any]]:
     """Get training progress data for recent enrollments"""
     try:
         enrollments = db.query(
@@ -456,8 +441,9 @@ def get_training_progress_data(db: Session) -> List[Dict[str, Any]]:
         
         progress_data = []
         
-        # Get current time once
-        now = datetime.now()
+        # An enrollment is overdue once its end date is before today (org timezone); compare
+        # stored values against today's start once instead of converting each row
+        today_start_utc = clock.day_start(clock.today)
         
         for enrollment, employee, training in enrollments:
             # Check if employee has certification for this training
@@ -467,20 +453,12 @@ def get_training_progress_data(db: Session) -> List[Dict[str, Any]]:
                 Certification.status == "active"
             ).first() is not None
             
-            # Check if overdue - Compare dates only (ignore timezone)
-            is_overdue = False
-            if enrollment.end_date:
-                # Convert both to date objects for comparison
-                end_date = enrollment.end_date
-                if hasattr(end_date, 'date'):
-                    end_date_date = end_date.date() if hasattr(end_date, 'date') else end_date
-                else:
-                    end_date_date = end_date
-                
-                current_date = now.date()
-                
-                if end_date_date < current_date and enrollment.status not in ["completed", "cancelled"]:
-                    is_overdue = True
+            # Check if overdue
+            is_overdue = (
+                enrollment.end_date is not None
+                and enrollment.end_date < today_start_utc
+                and enrollment.status not in ["completed", "cancelled"]
+            )
             
             # Get avatar
             first_initial = employee.first_name[0] if employee.first_name else 'E'
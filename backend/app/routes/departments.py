@@ -11,6 +11,9 @@ from ..schemas.department import (
     DepartmentList
 )
 from ..dependecies import get_current_user
+from ..responses import model_response
+from ..etag import conditional_get
+from ..models import Department as DepartmentModel, Employee as EmployeeModel
 
 router = APIRouter(prefix="/departments", tags=["departments"])
 
@@ -28,17 +31,18 @@ def read_departments(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1),
     db: Session = Depends(get_db), 
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    validators: dict = Depends(conditional_get(DepartmentModel, EmployeeModel))  # counts come from employees
 ):
     # Use the new method that includes employee counts
     depts = crud_department.get_all_with_employee_counts(db, skip, limit)
     total = crud_department.get_total_count(db)
-    return DepartmentList(
+    return model_response(DepartmentList(
         departments=depts,
         total=total,
         skip=skip,
         limit=limit
-    )
+    ), headers=validators)
 
 @router.put("/{dept_id}", response_model=Department)
 def update_department(
@@ -1,11 +1,18 @@
 # app/api/employees.py - FIXED VERSION
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
 from sqlalchemy.orm import Session
 from typing import List, Optional
+from datetime import datetime
+import csv
+import io
 from ..database import get_db
 from ..crud import employee as crud_employee
-from ..schemas.employee import Employee, EmployeeCreate, EmployeeUpdate, EmployeeList
+from ..schemas.employee import Employee, EmployeeCreate, EmployeeUpdate, EmployeeList, EmployeeImportResult
 from ..dependecies import get_current_user
+from ..streaming import export_response
+from ..responses import model_response
+from ..etag import conditional_get
+from ..models import Employee as EmployeeModel, Department as DepartmentModel
 
 router = APIRouter(prefix="/employees", tags=["employees"])
 
@@ -32,6 +39,38 @@ def create_employee(
     
     return crud_employee.create(db, obj_in=employee)
 
+@router.post("/import", response_model=EmployeeImportResult)
+def import_employees(
+    file: UploadFile = File(..., description="CSV file with a header row matching the employee fields"),
+    chunk_size: int = Query(500, ge=1, le=5000, description="Rows validated and inserted per batch"),
+    db: Session = Depends(get_db), 
+    current_user: dict = Depends(get_current_user)):
+    """
+    Bulk import employees from a CSV upload.
+
+    The file is read row by row and written in chunks, so large uploads are never
+    held in memory. Valid rows are imported; invalid or duplicate rows are skipped
+    and reported with their line number.
+    """
+    # utf-8-sig strips the BOM that spreadsheet tools add to exported CSVs
+    text_stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        reader = csv.DictReader(text_stream)
+        if not reader.fieldnames:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CSV file is empty or missing a header row"
+            )
+        return crud_employee.import_rows(db, rows=reader, chunk_size=chunk_size)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV file must be UTF-8 encoded"
+        )
+    finally:
+        # Detach so closing the wrapper does not close the upload's spooled file
+        text_stream.detach()
+
 @router.get("", response_model=EmployeeList)
 def read_employees(
     skip: int = Query(0, ge=0),
@@ -39,19 +78,30 @@ def read_employees(
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     department_id: Optional[int] = Query(None, description="Filter by department ID"),  
     db: Session = Depends(get_db), 
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    validators: dict = Depends(conditional_get(EmployeeModel, DepartmentModel))
 ):
     employees = crud_employee.get_multi(
         db, skip=skip, limit=limit, is_active=is_active, department_id=department_id  # Fixed parameter name
     )
     total = crud_employee.get_total_count(db, is_active=is_active, department_id=department_id)  # Fixed parameter name
     
-    return EmployeeList(
+    return model_response(EmployeeList(
         employees=employees,
         total=total,
         skip=skip,
         limit=limit
-    )
+    ), headers=validators)
+
+@router.get("/export")
+def export_employees(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+    updated_since: Optional[datetime] = Query(None, description="Only export rows updated at or after this time"),
+    db: Session = Depends(get_db), 
+    current_user: dict = Depends(get_current_user)):
+    """Stream every employee row as NDJSON or CSV for bulk/incremental extraction"""
+    columns, rows = crud_employee.stream(db, updated_since=updated_since)
+    return export_response(rows, columns, format, filename="employees")
 
 @router.get("/{employee_id}", response_model=Employee)
 def read_employee(
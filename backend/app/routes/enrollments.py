@@ -8,6 +8,8 @@ from ..schemas.certification import CertificationCreate
 from datetime import datetime, timedelta
 from ..schemas.enrollment import Enrollment, EnrollmentCreate, EnrollmentUpdate, EnrollmentList
 from ..dependecies import get_current_user
+from ..streaming import export_response
+from ..responses import model_response
 
 router = APIRouter(prefix="/enrollments", tags=["enrollments"])
 
@@ -36,10 +38,11 @@ def read_enrollments(
     training_id: Optional[int] = Query(None, description="Filter by training ID"),
     min_progress: Optional[int] = Query(None, ge=0, le=100, description="Minimum progress percentage"),
     max_progress: Optional[int] = Query(None, ge=0, le=100, description="Maximum progress percentage"),
+    include_archived: bool = Query(False, description="Also list rows moved to the archive"),
     db: Session = Depends(get_db), 
     current_user: dict = Depends(get_current_user)
 ):
-    items = crud_enrollment.get_multi(db, skip, limit)
+    items = crud_enrollment.get_multi(db, skip, limit, include_archived=include_archived)
     
     # Apply filters
     if status:
@@ -53,8 +56,18 @@ def read_enrollments(
     if max_progress is not None:
         items = [item for item in items if item.progress <= max_progress]
     
-    total = crud_enrollment.get_total_count(db)
-    return EnrollmentList(enrollments=items, total=total, skip=skip, limit=limit)
+    total = crud_enrollment.get_total_count(db, include_archived=include_archived)
+    return model_response(EnrollmentList(enrollments=items, total=total, skip=skip, limit=limit))
+
+@router.get("/export")
+def export_enrollments(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv"),
+    updated_since: Optional[datetime] = Query(None, description="Only export rows updated at or after this time"),
+    db: Session = Depends(get_db), 
+    current_user: dict = Depends(get_current_user)):
+    """Stream every enrollment row as NDJSON or CSV for bulk/incremental extraction"""
+    columns, rows = crud_enrollment.stream(db, updated_since=updated_since)
+    return export_response(rows, columns, format, filename="enrollments")
 
 @router.put("/{enrollment_id}", response_model=Enrollment)
 def update_enrollment(
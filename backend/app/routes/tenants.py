@@ -0,0 +1,28 @@
+# api/tenants.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import List
+from ..database import get_db
+from ..crud import tenant as crud_tenant
+from ..schemas.tenant import Tenant, TenantCreate
+from ..dependecies import get_tenant_admin
+
+# Default-tenant tokens only: a token from any other tenant could otherwise list every
+# tenant's slug and sign in to it (see the note in app/tenancy.py)
+router = APIRouter(prefix="/tenants", tags=["tenants"])
+
+@router.post("", response_model=Tenant, status_code=status.HTTP_201_CREATED)
+def create_tenant(
+    obj_in: TenantCreate,
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_tenant_admin)):
+    """Add a tenant; users sign in to it with {"tenant": slug} at /auth/login"""
+    if crud_tenant.get_by_slug(db, obj_in.slug):
+        raise HTTPException(status_code=400, detail="Tenant already exists")
+    return crud_tenant.create(db, obj_in=obj_in)
+
+@router.get("", response_model=List[Tenant])
+def read_tenants(
+    db: Session = Depends(get_db),
+    current_user: dict = Depends(get_tenant_admin)):
+    return crud_tenant.get_multi(db)
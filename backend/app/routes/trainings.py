@@ -5,6 +5,9 @@ from ..database import get_db
 from ..crud import training as crud_training
 from ..schemas.training import Training, TrainingCreate, TrainingUpdate, TrainingList
 from ..dependecies import get_current_user
+from ..responses import model_response
+from ..etag import conditional_get
+from ..models import Training as TrainingModel
 
 router = APIRouter(prefix="/trainings", tags=["trainings"])
 
@@ -21,7 +24,8 @@ def read_trainings(
     limit: int = Query(100, ge=1, le=1000),
     name: Optional[str] = Query(None, description="Search by name"),
     db: Session = Depends(get_db), 
-    current_user: dict = Depends(get_current_user)
+    current_user: dict = Depends(get_current_user),
+    validators: dict = Depends(conditional_get(TrainingModel))
 ):
     if name:
         items = crud_training.search_by_name(db, name)
@@ -31,7 +35,7 @@ def read_trainings(
         items = crud_training.get_multi(db, skip, limit)
         total = crud_training.get_total_count(db)
     
-    return TrainingList(trainings=items, total=total, skip=skip, limit=limit)
+    return model_response(TrainingList(trainings=items, total=total, skip=skip, limit=limit), headers=validators)
 
 @router.get("/{training_id}", response_model=Training)
 def read_training(
@@ -21,10 +21,19 @@ from .compliance import (
     CertificationStatus,
     UpcomingExpiration,
     MissingCertification,
+    MissingCertificationPage,
+    UpcomingExpirationPage,
+    DepartmentCompliancePage,
     ReportFilters,
-    ComplianceMetrics
+    ComplianceMetrics,
+    ComplianceSummary,
+    ComplianceTrendPoint,
+    ComplianceTrendSeries,
+    ComplianceTrends
 )
 
+from .changes import ChangeItem, ChangeFeed
+
 __all__ = [
     # Employee
     "Employee",
@@ -66,6 +75,17 @@ __all__ = [
     "CertificationStatus",
     "UpcomingExpiration",
     "MissingCertification",
+    "MissingCertificationPage",
+    "UpcomingExpirationPage",
+    "DepartmentCompliancePage",
     "ReportFilters",
-    "ComplianceMetrics"
+    "ComplianceMetrics",
+    "ComplianceSummary",
+    "ComplianceTrendPoint",
+    "ComplianceTrendSeries",
+    "ComplianceTrends",
+    
+    # Change feed
+    "ChangeItem",
+    "ChangeFeed"
 ]
\ No newline at end of file
@@ -0,0 +1,16 @@
+# app/schemas/changes.py
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+class ChangeItem(BaseModel):
+    entity: str  # employee, training, enrollment, certification
+    id: int
+    operation: str  # upsert, delete
+    changed_at: datetime
+    data: Optional[Dict[str, Any]] = None  # Full row for upserts, None for deletes
+
+class ChangeFeed(BaseModel):
+    changes: List[ChangeItem]
+    next_token: str
+    has_more: bool
\ No newline at end of file
@@ -11,10 +11,10 @@ def to_camel(string: str) -> str:
 
 class ReportFilters(BaseModel):
     department: str = "all"
-    date_range: Optional[dict] = {
-        "start": "2024-01-01",
-        "end": "2024-12-31"
-    }
+    # {"start": "YYYY-MM-DD", "end": "YYYY-MM-DD"}; None reports on all history
+    date_range: Optional[dict] = None
+    # Also count enrollments and certifications moved to the archive (slower)
+    include_archived: bool = False
     model_config = ConfigDict(
         alias_generator=to_camel,
         populate_by_name=True
@@ -72,6 +72,58 @@ class MissingCertification(BaseModel):
         populate_by_name=True
     )
 
+class MissingCertificationPage(BaseModel):
+    items: List[MissingCertification]
+    total: int
+    skip: int
+    limit: int
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+class UpcomingExpirationPage(BaseModel):
+    items: List[UpcomingExpiration]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+class DepartmentCompliancePage(BaseModel):
+    items: List[DepartmentCompliance]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+    
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+class ComplianceSummary(BaseModel):
+    """Headline counts of a compliance report, without the per-row sections"""
+    total_employees: int
+    compliant_employees: int
+    non_compliant_employees: int
+    expiring_soon: int
+    expired_certifications: int
+    total_trainings: int
+    completed_trainings: int
+    pending_trainings: int
+    overall_compliance_rate: float
+    upcoming_expirations_count: int
+    missing_certifications_count: int
+    
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
 class ComplianceMetrics(BaseModel):
     total_employees: int
     compliant_employees: int
@@ -90,4 +142,38 @@ class ComplianceMetrics(BaseModel):
     model_config = ConfigDict(
         alias_generator=to_camel,
         populate_by_name=True
-    )
\ No newline at end of file
+    )
+
+class ComplianceTrendPoint(BaseModel):
+    period_start: date
+    compliance_rate: float
+    completion_rate: float
+    expiring_soon: int
+    expired_certifications: int
+    total_employees: int
+    compliant_employees: int
+    
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+class ComplianceTrendSeries(BaseModel):
+    department: str  # "all" for the organisation-wide series
+    points: List[ComplianceTrendPoint]
+    
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
+
+class ComplianceTrends(BaseModel):
+    bucket: str
+    start: date
+    end: date
+    series: List[ComplianceTrendSeries]
+    
+    model_config = ConfigDict(
+        alias_generator=to_camel,
+        populate_by_name=True
+    )
@@ -1,11 +1,22 @@
 # schemas/department.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from datetime import datetime
+from ..timezones import get_zone
+
+def _check_timezone(v):
+    if v:
+        get_zone(v)  # raises ValueError for unknown zones
+    return v or None
 
 class DepartmentBase(BaseModel):
     name: str
     description: Optional[str] = None
+    manager_email: Optional[str] = None
+    # Local days (expiry dates, "today") for this department; None follows ORG_TIMEZONE
+    timezone: Optional[str] = Field(None, max_length=64)
+
+    _timezone = validator('timezone', allow_reuse=True)(_check_timezone)
 
 class DepartmentCreate(DepartmentBase):
     pass
@@ -13,6 +24,10 @@ class DepartmentCreate(DepartmentBase):
 class DepartmentUpdate(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
+    manager_email: Optional[str] = None
+    timezone: Optional[str] = Field(None, max_length=64)
+
+    _timezone = validator('timezone', allow_reuse=True)(_check_timezone)
 
 class Department(DepartmentBase):
     id: int
@@ -1,6 +1,6 @@
 # app/schemas/employee.py
 from pydantic import BaseModel, EmailStr, Field, validator, ConfigDict
-from typing import Optional
+from typing import Optional, List
 from datetime import date, datetime
 
 # Create a base Department schema
@@ -50,4 +50,17 @@ class EmployeeList(BaseModel):
     employees: list[Employee]
     total: int
     skip: int
-    limit: int
\ No newline at end of file
+    limit: int
+
+# Bulk CSV import report
+class EmployeeImportError(BaseModel):
+    row: int
+    employee_id: Optional[str] = None
+    email: Optional[str] = None
+    errors: List[str]
+
+class EmployeeImportResult(BaseModel):
+    total_rows: int
+    imported: int
+    failed: int
+    errors: List[EmployeeImportError]
\ No newline at end of file
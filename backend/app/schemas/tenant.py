@@ -0,0 +1,16 @@
+# schemas/tenant.py
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+
+class TenantCreate(BaseModel):
+    # Lowercase letters, digits and hyphens; users pick the tenant by slug at login
+    slug: str = Field(..., min_length=2, max_length=50, pattern=r"^[a-z0-9][a-z0-9-]*$")
+    name: str = Field(..., min_length=1, max_length=200)
+
+class Tenant(TenantCreate):
+    id: int
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,5 @@
+# app/security.py
+# JWT settings shared by the login route (issuing) and app.dependecies (verifying)
+SECRET_KEY = "supersecretkey"  # use .env in production
+ALGITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 60
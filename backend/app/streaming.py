@@ -0,0 +1,157 @@
+# app/streaming.py
+import csv
+import io
+import json
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi.responses import StreamingResponse
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+# Rows are buffered and flushed in batches so each network write carries
+# a reasonable amount of data instead of one tiny chunk per row
+FLUSH_EVERY = 500
+
+
+def _json_default(value: Any):
+    """JSON encoder for the column types our models use"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_ndjson(rows: Iterable[Sequence[Any]], columns: List[str]) -> Iterator[str]:
+    """Serialize rows to newline-delimited JSON, one object per line"""
+    buffer = []
+    for row in rows:
+        buffer.append(json.dumps(dict(zip(columns, row)), default=_json_default))
+        if len(buffer) >= FLUSH_EVERY:
+            yield "\n".join(buffer) + "\n"
+            buffer = []
+    if buffer:
+        yield "\n".join(buffer) + "\n"
+
+
+def iter_csv(rows: Iterable[Sequence[Any]], columns: List[str]) -> Iterator[str]:
+    """Serialize rows to CSV with a header line"""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([
+            value.isoformat() if isinstance(value, (datetime, date)) else value
+            for value in row
+        ])
+        pending += 1
+        if pending >= FLUSH_EVERY:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            pending = 0
+    yield output.getvalue()
+
+
+def export_response(
+    rows: Iterable[Sequence[Any]],
+    columns: List[str],
+    format: str,
+    filename: str
+) -> StreamingResponse:
+    """Wrap a row iterator in a StreamingResponse in the requested format"""
+    if format == "csv":
+        body = iter_csv(rows, columns)
+        media_type = "text/csv"
+    else:
+        body = iter_ndjson(rows, columns)
+        media_type = "application/x-ndjson"
+        format = "ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.{format}"'
+        }
+    )
+
+
+class _ChunkSink:
+    """Write-only, unseekable file object; zipfile falls back to data descriptors for it"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def iter_zip(members: Iterable[Tuple[str, Callable[[], bytes], bool]]) -> Iterator[bytes]:
+    """
+    Stream a zip archive member by member.
+
+    Each member is (name, render, compress). Members are rendered lazily, so only
+    one file is held in memory at a time; already-compressed payloads (parquet)
+    should pass compress=False to skip a pointless deflate pass.
+    """
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w") as archive:
+        for name, render, compress in members:
+            archive.writestr(
+                zipfile.ZipInfo(name, date_time=datetime.now().timetuple()[:6]),
+                render(),
+                compress_type=zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            )
+            yield sink.drain()
+    yield sink.drain()
+
+
+def format_sse(event: str, data: Any, id: Optional[int] = None) -> str:
+    """One Server-Sent Events message; data is JSON-encoded on a single line"""
+    lines = [f"id: {id}"] if id is not None else []
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=_json_default, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def iter_sse(
+    bus,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    heartbeat: float = 15.0,
+    retry_ms: int = 5000,
+    channel: Hashable = None
+) -> AsyncIterator[str]:
+    """
+    Relay events from an EventBus as an SSE stream.
+
+    The subscription is opened when the stream starts and closed when the client
+    goes away. A comment line is sent after `heartbeat` idle seconds so proxies
+    keep the connection open and disconnected clients are noticed.
+    """
+    subscription = bus.subscribe(channel)
+    try:
+        yield f"retry: {retry_ms}\n" + format_sse("ready", {})
+        while True:
+            event = await subscription.get(timeout=heartbeat)
+            if event is not None:
+                yield format_sse(event.type, event.data, event.id)
+                continue
+            if await is_disconnected():
+                break
+            yield ": ping\n\n"
+    finally:
+        subscription.close()
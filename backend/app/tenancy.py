@@ -0,0 +1,90 @@
+# app/tenancy.py
+"""
+Tenant scoping for sessions.
+
+Every business table carries a tenant_id (TenantScoped). A session scoped to a tenant
+(get_db scopes each request to the tenant in its token) only ever sees and writes
+that tenant's rows:
+
+    reads    every ORM SELECT/UPDATE/DELETE gets `tenant_id = :tenant` on each scoped
+             entity it touches (joins and subqueries included) via with_loader_criteria.
+             Only mapped entities and attributes count: select Model.column rather
+             than Model.__table__.c.column, and give func.count() a select_from(Model)
+    writes   new objects and ORM bulk inserts are stamped with the session's tenant
+
+Sessions that were never scoped (jobs, the outbox dispatcher, startup) see every
+tenant; rows they insert without a tenant_id land in the default tenant.
+
+The tenant claim separates data, it is not an authorization boundary: users don't
+belong to tenants yet, so anyone who can sign in can ask /auth/login for any tenant
+by slug. Until users are tied to tenants, only /tenants itself is restricted (to
+default-tenant tokens, see dependecies.get_tenant_admin).
+"""
+import os
+from typing import Optional
+
+from sqlalchemy import Column, ForeignKey, Integer, event
+from sqlalchemy.orm import Session, declared_attr, with_loader_criteria
+
+# Tenant of tokens issued before tenants existed, and of unscoped writes
+DEFAULT_TENANT_ID = int(os.getenv("DEFAULT_TENANT_ID", "1"))
+
+# JWT claim carrying the tenant id
+TENANT_CLAIM = "tenant_id"
+
+
+class TenantScoped:
+    """Mixin for models whose rows belong to one tenant"""
+
+    @declared_attr
+    def tenant_id(cls):
+        # Nullable so upgrade_schema can add it to existing tables; startup backfills NULLs
+        return Column(Integer, ForeignKey("tenants.id"), nullable=True, default=DEFAULT_TENANT_ID)
+
+
+def scope(db: Session, tenant_id: int) -> Session:
+    """Restrict the session to one tenant's rows from its next statement on"""
+    db.info["tenant_id"] = tenant_id
+    return db
+
+
+def tenant_of(db: Session) -> Optional[int]:
+    """The session's tenant, or None for an unscoped session"""
+    return db.info.get("tenant_id")
+
+
+def claim_tenant(payload: dict) -> int:
+    """Tenant id from a verified token payload"""
+    tenant_id = payload.get(TENANT_CLAIM)
+    return int(tenant_id) if tenant_id is not None else DEFAULT_TENANT_ID
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _apply_tenant_criteria(orm_execute_state):
+    tenant_id = orm_execute_state.session.info.get("tenant_id")
+    if tenant_id is None:
+        return
+    if orm_execute_state.is_insert:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, TenantScoped):
+            # Bulk insert(Model) rows carry no tenant of their own
+            orm_execute_state.statement = orm_execute_state.statement.values(tenant_id=tenant_id)
+    elif (
+        (orm_execute_state.is_select or orm_execute_state.is_update or orm_execute_state.is_delete)
+        # Lazy and refresh loads inherit the criteria of the query that loaded the parent
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(
+            with_loader_criteria(TenantScoped, lambda cls: cls.tenant_id == tenant_id, include_aliases=True)
+        )
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_tenant(session, flush_context, instances):
+    tenant_id = session.info.get("tenant_id")
+    if tenant_id is None:
+        return
+    for obj in session.new:
+        if isinstance(obj, TenantScoped):
+            obj.tenant_id = tenant_id
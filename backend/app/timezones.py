@@ -0,0 +1,144 @@
+# app/timezones.py
+"""
+Org-local day bucketing for naive UTC datetimes.
+
+Datetimes are stored as naive UTC, while days (alerts, rollups, "today") are local
+days: the organisation's zone (ORG_TIMEZONE, default Asia/Kolkata) or a department's
+own zone (Department.timezone). Rather than localizing and converting every row with
+pytz, compute each local day's boundaries once, as naive UTC, and compare stored
+values against them directly:
+
+    clock = LocalClock()
+    rows.filter(Certification.expires_at < clock.days_from_now(30))
+    clock.local_date(cert.expires_at)       # org-local day of a stored value
+    format_date(clock.local_date(value))    # "YYYY-MM-DD", cached per day
+
+Day boundaries are cached per (day, zone), so every request on a given day reuses them.
+"""
+import os
+from datetime import date, datetime, time, timedelta, tzinfo
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import pytz
+
+ONE_DAY = timedelta(days=1)
+
+
+@lru_cache(maxsize=256)
+def get_zone(name: Optional[str] = None) -> tzinfo:
+    """pytz zone by IANA name; None or "" means the org zone. Raises ValueError for unknown names"""
+    if not name:
+        return ORG_TZ
+    try:
+        return pytz.timezone(name)
+    except pytz.UnknownTimeZoneError:
+        raise ValueError(f"Unknown timezone: {name}. Use an IANA name such as Asia/Kolkata")
+
+
+# Zone for org-wide days (dashboard, daily rollups) and for departments without their own
+ORG_TIMEZONE = os.getenv("ORG_TIMEZONE", "Asia/Kolkata")
+ORG_TZ = pytz.timezone(ORG_TIMEZONE)
+
+
+@lru_cache(maxsize=8192)
+def day_start_utc(day: date, tz: tzinfo = ORG_TZ) -> datetime:
+    """Naive UTC instant at which local `day` starts in `tz`"""
+    return tz.localize(datetime.combine(day, time.min)).astimezone(pytz.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=8192)
+def _offset_near(utc_day: date, tz: tzinfo) -> timedelta:
+    return tz.utcoffset(datetime.combine(utc_day, time(12)))
+
+
+def local_date(value: datetime, tz: tzinfo = ORG_TZ) -> date:
+    """
+    Local day in `tz` of a naive UTC datetime.
+
+    Guesses the day with the zone's offset around that UTC day, then checks the
+    guess against the cached day boundaries, which corrects it on the days a DST
+    change moves the offset. No per-value pytz localize/astimezone.
+    """
+    guess = (value + _offset_near(value.date(), tz)).date()
+    if value < day_start_utc(guess, tz):
+        return guess - ONE_DAY
+    if value >= day_start_utc(guess + ONE_DAY, tz):
+        return guess + ONE_DAY
+    return guess
+
+
+@lru_cache(maxsize=4096)
+def format_date(day: date) -> str:
+    """ISO "YYYY-MM-DD" for a day; reports repeat the same few dozen days many times"""
+    return day.isoformat()
+
+
+class LocalClock:
+    """
+    One request's "now" in one zone (the org zone by default). Bounds are computed
+    once per request as naive UTC, so they compare directly with stored columns.
+    """
+
+    def __init__(self, tz: tzinfo = ORG_TZ, now: Optional[datetime] = None):
+        self.tz = tz
+        # `now` is naive UTC (tests pin it); defaults to the current instant
+        self.now_utc = now or datetime.utcnow()
+        self.today = local_date(self.now_utc, tz)
+        # Start of the local day: stored values before it expired on an earlier day
+        self.today_start = day_start_utc(self.today, tz)
+
+    @property
+    def now_local(self) -> datetime:
+        return pytz.utc.localize(self.now_utc).astimezone(self.tz)
+
+    def days_from_now(self, days: float) -> datetime:
+        """Naive UTC instant `days` from now"""
+        return self.now_utc + timedelta(days=days)
+
+    def day_start(self, day: date) -> datetime:
+        """Naive UTC start of a local day"""
+        return day_start_utc(day, self.tz)
+
+    def day_end(self, day: date) -> datetime:
+        """Naive UTC start of the local day after `day` (exclusive end)"""
+        return day_start_utc(day + ONE_DAY, self.tz)
+
+    def local_date(self, value: datetime) -> date:
+        return local_date(value, self.tz)
+
+
+class ZoneClocks:
+    """
+    LocalClocks for every zone departments use, sharing one "now". Departments
+    without a timezone (and rows without a department) follow the org zone.
+    """
+
+    def __init__(self, department_zones: Dict[int, Optional[str]], now: Optional[datetime] = None):
+        self.now_utc = now or datetime.utcnow()
+        self.org = LocalClock(ORG_TZ, self.now_utc)
+        self._clocks: Dict[tzinfo, LocalClock] = {ORG_TZ: self.org}
+        self._departments: Dict[int, LocalClock] = {
+            department_id: self.for_zone(get_zone(name)) for department_id, name in department_zones.items()
+        }
+
+    def for_zone(self, tz: tzinfo) -> LocalClock:
+        clock = self._clocks.get(tz)
+        if clock is None:
+            clock = self._clocks[tz] = LocalClock(tz, self.now_utc)
+        return clock
+
+    def for_department(self, department_id: Optional[int]) -> LocalClock:
+        return self._departments.get(department_id, self.org)
+
+    def departments_by_clock(self) -> List[tuple]:
+        """(clock, department ids) per zone other than the org zone; everything else uses self.org"""
+        grouped: Dict[tzinfo, List[int]] = {}
+        for department_id, clock in self._departments.items():
+            if clock is not self.org:
+                grouped.setdefault(clock.tz, []).append(department_id)
+        return [(self._clocks[tz], ids) for tz, ids in grouped.items()]
+
+    def today_key(self) -> tuple:
+        """Every zone's local date; changes whenever any zone starts a new day (for cache keys)"""
+        return tuple(sorted((str(tz), clock.today.isoformat()) for tz, clock in self._clocks.items()))
@@ -0,0 +1,73 @@
+# benchmarks/bench_import.py
+"""
+Measure what a worker pays at startup to import the API.
+
+Each measurement runs in a fresh interpreter so module caches don't carry over.
+app.main itself connects to the database at import (create_all), so this imports
+app.routes - every router, CRUD module and schema - with placeholder DB settings.
+
+    python benchmarks/bench_import.py            # default lazy startup
+    python benchmarks/bench_import.py --preload  # export worker (PRELOAD_EXPORT_LIBS=1)
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["pandas", "openpyxl", "reportlab", "pyarrow"]
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+import app.routes
+if {preload}:
+    from app.crud import compliance
+    compliance.preload_export_libraries()
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(preload: bool) -> dict:
+    env = dict(os.environ)
+    # Placeholders so the engine can be built; nothing connects during import
+    env.update({
+        "DB_HOST": env.get("DB_HOST") or "localhost",
+        "DB_PORT": env.get("DB_PORT") or "3306",
+        "DB_USER": env.get("DB_USER") or "bench",
+        "DB_NAME": env.get("DB_NAME") or "bench",
+    })
+    code = CHILD.format(preload=preload, heavy=HEAVY_MODULES)
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--preload", action="store_true", help="Also preload the export stack")
+    args = parser.parse_args()
+
+    results = [measure(args.preload) for _ in range(args.runs)]
+    seconds = [r["seconds"] for r in results]
+    rss = [r["max_rss_mb"] for r in results]
+
+    print(f"import app.routes ({'preloaded exports' if args.preload else 'lazy exports'}), {args.runs} runs")
+    print(f"  time:    median {statistics.median(seconds) * 1000:.0f} ms (min {min(seconds) * 1000:.0f} ms)")
+    print(f"  max RSS: median {statistics.median(rss):.1f} MB")
+    print(f"  heavy modules loaded: {', '.join(results[-1]['loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
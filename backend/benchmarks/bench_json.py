@@ -0,0 +1,120 @@
+# benchmarks/bench_json.py
+"""
+Encode time for large list/report responses: FastAPI's default response_model
+path versus the fast paths in app/responses.py.
+
+    python benchmarks/bench_json.py            # 10k rows
+    python benchmarks/bench_json.py --rows 50000
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.responses import FastJSONResponse, model_response, orjson
+from app.schemas.employee import Employee, EmployeeList
+from app.schemas.compliance import ComplianceMetrics, UpcomingExpiration, MissingCertification
+
+
+def employee_list(rows: int) -> EmployeeList:
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    return EmployeeList(
+        employees=[
+            Employee(
+                id=i,
+                employee_id=f"EMP{i:06d}",
+                first_name="First",
+                last_name=f"Last{i}",
+                email=f"employee{i}@example.com",
+                department_id=i % 20,
+                position="Engineer",
+                hire_date=date(2020, 1, 1) + timedelta(days=i % 1000),
+                is_active=True,
+                department={"id": i % 20, "name": f"Department {i % 20}", "description": None},
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(rows)
+        ],
+        total=rows,
+        skip=0,
+        limit=rows,
+    )
+
+
+def compliance_report(rows: int) -> ComplianceMetrics:
+    return ComplianceMetrics(
+        total_employees=rows, compliant_employees=rows // 2, non_compliant_employees=rows // 2,
+        expiring_soon=rows // 10, expired_certifications=rows // 20, total_trainings=50,
+        completed_trainings=rows, pending_trainings=rows // 3, overall_compliance_rate=50.0,
+        department_compliance=[], certification_status=[],
+        upcoming_expirations=[
+            UpcomingExpiration(
+                id=i, employee_name=f"Employee {i}", certification_name="Safety",
+                expiry_date=date(2024, 2, 1), days_until_expiry=i % 30, department="Operations"
+            )
+            for i in range(rows // 2)
+        ],
+        missing_certifications=[
+            MissingCertification(
+                id=i, employee_name=f"Employee {i}", required_certification="First Aid",
+                department="Operations", days_overdue=i % 90
+            )
+            for i in range(rows // 2)
+        ],
+    )
+
+
+def default_path(model, field) -> bytes:
+    """What FastAPI does for a route returning a model with response_model set"""
+    content = asyncio.run(serialize_response(field=field, response_content=model))
+    return JSONResponse(content).body
+
+
+def orjson_dump(model) -> bytes:
+    return FastJSONResponse(model.model_dump(mode="json", by_alias=True)).body
+
+
+def timed(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for label, model in (("EmployeeList", employee_list(args.rows)), ("ComplianceMetrics", compliance_report(args.rows))):
+        field = create_model_field(name="response", type_=type(model), mode="serialization")
+        candidates = {
+            "default (validate + jsonable + json)": lambda: default_path(model, field),
+            "model_response (model_dump_json)": lambda: model_response(model).body,
+        }
+        if orjson is not None:
+            candidates["FastJSONResponse (model_dump + orjson)"] = lambda: orjson_dump(model)
+
+        size = len(model_response(model).body)
+        print(f"{label}: {args.rows} rows, {size / 1024:.0f} KiB, best of {args.repeat}")
+        baseline = None
+        for name, fn in candidates.items():
+            seconds = timed(fn, args.repeat)
+            baseline = baseline or seconds
+            print(f"  {name:<42} {seconds * 1000:8.1f} ms  {baseline / seconds:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
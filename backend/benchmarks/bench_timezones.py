@@ -0,0 +1,91 @@
+# benchmarks/bench_timezones.py
+"""
+Per-row timezone cost of classifying and formatting certification expiries, the
+loop behind the dashboard alerts: the old per-row pytz path (localize, astimezone,
+strftime, aware comparisons) versus app/timezones.py (bounds computed once as
+naive UTC, cached day boundaries and formatting).
+
+    python benchmarks/bench_timezones.py               # 100k rows, Asia/Kolkata
+    python benchmarks/bench_timezones.py --rows 500000 --zone America/New_York
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytz
+
+from app.timezones import LocalClock, format_date, local_date
+
+
+def make_rows(rows: int, now: datetime):
+    rng = random.Random(42)
+    # Naive UTC expiries spread over the 90 days around now, as stored in the database
+    return [now + timedelta(seconds=rng.randint(-45 * 86400, 45 * 86400)) for _ in range(rows)]
+
+
+def per_row_pytz(values, tz, now_local):
+    """The pre-existing pattern: convert every row, compare aware datetimes, strftime"""
+    now_utc = now_local.astimezone(pytz.utc)
+    soon = now_utc + timedelta(days=7)
+    out = []
+    for value in values:
+        aware = pytz.utc.localize(value)
+        if aware < now_utc:
+            status = "expired"
+        elif aware <= soon:
+            status = "expiring_soon"
+        else:
+            status = "expiring_later"
+        out.append((status, aware.astimezone(tz).strftime("%Y-%m-%d")))
+    return out
+
+
+def bucketed(values, clock):
+    """Bounds once per request as naive UTC; cached local day and formatting per row"""
+    now_utc = clock.now_utc
+    soon = clock.days_from_now(7)
+    tz = clock.tz
+    out = []
+    for value in values:
+        if value < now_utc:
+            status = "expired"
+        elif value <= soon:
+            status = "expiring_soon"
+        else:
+            status = "expiring_later"
+        out.append((status, format_date(local_date(value, tz))))
+    return out
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--zone", default="Asia/Kolkata")
+    args = parser.parse_args()
+
+    tz = pytz.timezone(args.zone)
+    clock = LocalClock(tz)
+    values = make_rows(args.rows, clock.now_utc)
+
+    old_s, old = timed(per_row_pytz, values, tz, clock.now_local)
+    new_s, new = timed(bucketed, values, clock)
+    assert old == new, "both paths must classify and format identically"
+
+    print(f"Classify + format {args.rows} expiries in {args.zone}")
+    print(f"  {'per-row pytz':<24} {old_s * 1000:8.1f} ms  {old_s / args.rows * 1e6:6.2f} us/row")
+    print(f"  {'app.timezones':<24} {new_s * 1000:8.1f} ms  {new_s / args.rows * 1e6:6.2f} us/row  {old_s / new_s:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+# tests/test_archive.py
+import sys
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from datetime import date, datetime, timedelta
+from jose import jwt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.database import Base, get_db
+from app.models import (
+    Employee, Department, Training, Enrollment, Certification, ExpiryCalendarEntry,
+    ArchivedEnrollment, ArchivedCertification, ArchiveCounter, Tombstone
+)
+from app.crud import archive, metrics as crud_metrics
+from app.crud.compliance import compliance
+
+# Create test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_archive.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Override the get_db dependency
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+# Authentication constants
+SECRET_KEY = "supersecretkey"
+ALGORITHM = "HS256"
+USER_EMAIL = "skillflow@gmail.com"
+
+@pytest.fixture(autouse=True)
+def setup_test():
+    """Setup and teardown for each test"""
+    Base.metadata.create_all(bind=engine)
+    cleanup_database()
+    yield
+
+def get_auth_headers():
+    """Generate authentication headers with a valid JWT token"""
+    expire = datetime.utcnow() + timedelta(minutes=60)
+    payload = {"sub": USER_EMAIL, "exp": expire}
+    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+
+    return {"Authorization": f"Bearer {token}"}
+
+def cleanup_database():
+    """Clean up test database"""
+    db = TestingSessionLocal()
+    try:
+        for model in (
+            Tombstone, ArchiveCounter, ArchivedCertification, ArchivedEnrollment, ExpiryCalendarEntry,
+            Certification, Enrollment, Employee, Training, Department
+        ):
+            db.query(model).delete()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Cleanup error: {e}")
+    finally:
+        db.close()
+
+def create_archive_data():
+    """
+    Two years of history for one employee: two finished enrollments and an expired
+    certification old enough to archive, plus rows that must stay live
+    """
+    db = TestingSessionLocal()
+    try:
+        old = datetime.utcnow() - timedelta(days=730)
+        department = Department(name="Archive Dept")
+        training = Training(name="Archive Training", duration_hours=8.0)
+        db.add_all([department, training])
+        db.flush()
+        employee = Employee(
+            employee_id="AR001", first_name="Ari", last_name="Chive",
+            email="ari.chive@test.com", department_id=department.id, position="Clerk"
+        )
+        db.add(employee)
+        db.flush()
+
+        def enrollment(status, when, completed=None):
+            row = Enrollment(
+                employee_id=employee.id, training_id=training.id, status=status, progress=100,
+                enrolled_date=when, completed_date=completed, created_at=when, updated_at=when
+            )
+            db.add(row)
+            db.flush()
+            return row
+
+        old_completed = enrollment("completed", old, old + timedelta(days=5))
+        enrollment("cancelled", old)
+        # Completed long ago, but its certification is still active
+        pinned = enrollment("completed", old, old + timedelta(days=5))
+        enrollment("in_progress", old)
+        enrollment("completed", datetime.utcnow(), datetime.utcnow())
+
+        db.add_all([
+            Certification(
+                employee_id=employee.id, training_id=training.id, enrollment_id=old_completed.id,
+                cert_number="AR-OLD", issued_date=old, expires_at=old + timedelta(days=30),
+                status="expired", created_at=old, updated_at=old
+            ),
+            Certification(
+                employee_id=employee.id, training_id=training.id, enrollment_id=pinned.id,
+                cert_number="AR-LIVE", issued_date=old, expires_at=datetime.utcnow() + timedelta(days=365),
+                status="active", created_at=old, updated_at=old
+            )
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+def archive_now(batch_size=1):
+    db = TestingSessionLocal()
+    try:
+        return archive.run(db, datetime.utcnow() - timedelta(days=365), batch_size)
+    finally:
+        db.close()
+
+def test_archive_moves_finished_rows_and_counts_them():
+    """Old finished rows move in batches; pinned, unfinished and recent rows stay live"""
+    create_archive_data()
+    assert archive_now() == {"certifications": 1, "enrollments": 2}
+    # Nothing left to move on the next run
+    assert archive_now() == {"certifications": 0, "enrollments": 0}
+
+    db = TestingSessionLocal()
+    try:
+        assert sorted(e.status for e in db.query(Enrollment).all()) == ["completed", "completed", "in_progress"]
+        assert [c.cert_number for c in db.query(Certification).all()] == ["AR-LIVE"]
+        assert sorted(e.status for e in db.query(ArchivedEnrollment).all()) == ["cancelled", "completed"]
+        assert [c.cert_number for c in db.query(ArchivedCertification).all()] == ["AR-OLD"]
+        assert db.query(ExpiryCalendarEntry).count() == 1
+        # Change feed consumers see the archived rows leave the live tables
+        tombstones = {(t.entity_type, t.entity_id) for t in db.query(Tombstone).all()}
+        archived = {("enrollment", e.id) for e in db.query(ArchivedEnrollment).all()}
+        archived |= {("certification", c.id) for c in db.query(ArchivedCertification).all()}
+        assert tombstones == archived
+
+        totals = archive.totals(db)
+        assert totals["enrollments"] == 2
+        assert totals["completed_enrollments"] == 1
+        assert totals["certifications"] == 1
+        assert totals["expired_certifications"] == 1
+        assert totals["training_hours"] == 8.0
+
+        # Rollups keep counting archived history
+        day_totals = crud_metrics.compute_totals(db, date.today() + timedelta(days=1))
+        assert day_totals["total_enrollments"] == 5
+        assert day_totals["total_certifications"] == 2
+    finally:
+        db.close()
+    print("✅ Finished rows archived with counters")
+
+def test_lapsed_active_certifications_archive_as_expired():
+    """Active certifications long past expires_at archive as expired and release their enrollment"""
+    create_archive_data()
+    db = TestingSessionLocal()
+    try:
+        old = datetime.utcnow() - timedelta(days=730)
+        employee, training = db.query(Employee).one(), db.query(Training).one()
+        lapsed = Enrollment(
+            employee_id=employee.id, training_id=training.id, status="completed", progress=100,
+            enrolled_date=old, completed_date=old, created_at=old, updated_at=old
+        )
+        current = Enrollment(employee_id=employee.id, training_id=training.id, status="in_progress")
+        db.add_all([lapsed, current])
+        db.flush()
+        db.add_all([
+            Certification(
+                employee_id=employee.id, training_id=training.id, enrollment_id=lapsed.id,
+                cert_number="AR-LAPSED", issued_date=old, expires_at=old + timedelta(days=30),
+                status="active", created_at=old, updated_at=old
+            ),
+            # Newest row, so it stays live; never expires
+            Certification(
+                employee_id=employee.id, training_id=training.id, enrollment_id=current.id,
+                cert_number="AR-NEW", status="active"
+            )
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    assert archive_now() == {"certifications": 2, "enrollments": 3}
+
+    db = TestingSessionLocal()
+    try:
+        assert sorted(c.cert_number for c in db.query(Certification).all()) == ["AR-LIVE", "AR-NEW"]
+        archived = {c.cert_number: c.status for c in db.query(ArchivedCertification).all()}
+        assert archived == {"AR-OLD": "expired", "AR-LAPSED": "expired"}
+        assert db.query(ExpiryCalendarEntry).count() == 1
+        assert archive.totals(db)["expired_certifications"] == 2
+    finally:
+        db.close()
+    print("✅ Lapsed certifications archived as expired")
+
+def test_archived_certification_still_covers_live_enrollment():
+    """Archiving a certification doesn't turn its still-live enrollment into a missing certification"""
+    create_archive_data()
+    db = TestingSessionLocal()
+    try:
+        # Touched recently, so the AR-OLD enrollment stays live while its certification archives
+        enrollment = db.query(Certification).filter(Certification.cert_number == "AR-OLD").one().enrollment
+        enrollment.updated_at = datetime.utcnow()
+        # AR-OLD is then the only certification for this employee and training
+        other = Training(name="Other Training", duration_hours=1.0)
+        db.add(other)
+        db.flush()
+        db.query(Certification).filter(Certification.cert_number == "AR-LIVE").one().training_id = other.id
+        db.commit()
+        before = compliance._missing_certifications_query(db, {"department": "all"}).count()
+    finally:
+        db.close()
+
+    assert archive_now() == {"certifications": 1, "enrollments": 1}
+
+    db = TestingSessionLocal()
+    try:
+        assert [c.cert_number for c in db.query(ArchivedCertification).all()] == ["AR-OLD"]
+        assert compliance._missing_certifications_query(db, {"department": "all"}).count() == before == 0
+    finally:
+        db.close()
+    print("✅ Archived certifications still count against missing ones")
+
+def test_reads_include_archived_only_on_request():
+    """Listings and the compliance report show archived rows only when asked"""
+    create_archive_data()
+    headers = get_auth_headers()
+
+    def summary(**filters):
+        response = client.post("/api/compliance/report?summary=true", json={"department": "all", **filters}, headers=headers)
+        assert response.status_code == 200
+        return response.json()
+
+    before = summary()
+    dashboard_before = client.get("/api/dashboard/dashboard-data", headers=headers).json()["stats"]
+    archive_now()
+
+    response = client.get("/enrollments", headers=headers)
+    assert response.json()["total"] == 3
+    response = client.get("/enrollments?include_archived=true", headers=headers)
+    assert response.json()["total"] == 5
+    assert [e["id"] for e in response.json()["enrollments"]] == sorted(e["id"] for e in response.json()["enrollments"])
+
+    response = client.get("/certifications?include_archived=true&status=expired", headers=headers)
+    assert [c["cert_number"] for c in response.json()["certifications"]] == ["AR-OLD"]
+    assert client.get("/certifications", headers=headers).json()["total"] == 1
+
+    assert summary()["completedTrainings"] == before["completedTrainings"] - 1
+    assert summary(includeArchived=True)["completedTrainings"] == before["completedTrainings"]
+
+    # Dashboard totals come out the same from the counters
+    stats = client.get("/api/dashboard/dashboard-data", headers=headers).json()["stats"]
+    for key in ("total_certifications", "total_training_hours", "completion_rate"):
+        assert stats[key] == dashboard_before[key]
+    print("✅ Archived rows read on request")
@@ -5,6 +5,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from fastapi.testclient import TestClient
 from app.main import app
+from app.dependecies import token_cache
 
 client = TestClient(app)
 
@@ -73,6 +74,32 @@ def test_login_missing_fields():
     assert response.status_code == 422
     print("✅ Missing password test passed")
 
+def test_verified_token_cache():
+    """Test repeat requests with the same token are served from the token cache"""
+    token = client.post("/auth/login", json={
+        "email": "skillflow@gmail.com",
+        "password": "skillflow1"
+    }).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    before = dict(token_cache.stats())
+    first = client.get("/health/token-cache", headers=headers)
+    assert first.status_code == 200
+    second = client.get("/health/token-cache", headers=headers).json()
+    
+    # First request verifies the signature, the second is a cache hit
+    assert second["misses"] == before["misses"] + 1
+    assert second["hits"] == before["hits"] + 1
+    print("✅ Token cache hit test passed")
+    
+    # A cached entry is dropped once the token's exp has passed
+    token_cache.set("expired-token", {"sub": "skillflow@gmail.com"}, expires_at=0)
+    assert token_cache.get("expired-token") is None
+    assert token_cache.stats()["expirations"] == second["expirations"] + 1
+    response = client.get("/health/token-cache", headers={"Authorization": "Bearer expired-token"})
+    assert response.status_code == 401
+    print("✅ Expired cache entry test passed")
+
 if __name__ == "__main__":
     print("=" * 50)
     print("Running auth tests...")
@@ -84,6 +111,7 @@ if __name__ == "__main__":
         test_login_wrong_email()
         test_login_empty_data()
         test_login_missing_fields()
+        test_verified_token_cache()
         print("\n" + "=" * 50)
         print("✅ All tests passed!")
         print("=" * 50)
@@ -7,6 +7,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
 from jose import jwt
+import json
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -497,6 +498,29 @@ def test_certification_fields():
         print(f"❌ Error: {e}")
         raise
 
+def test_export_certifications_ndjson():
+    """Test GET /certifications/export streams NDJSON rows"""
+    print("\nTest 13: Exporting certifications as NDJSON...")
+    
+    cert_data = create_test_certification_directly()
+    headers = get_auth_headers()
+    
+    response = client.get("/certifications/export", params={"format": "ndjson"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    
+    lines = [json.loads(line) for line in response.text.splitlines() if line]
+    assert len(lines) == 1
+    assert lines[0]["id"] == cert_data["id"]
+    assert lines[0]["cert_number"] == cert_data["cert_number"]
+    
+    # Nothing has been updated since tomorrow
+    tomorrow = (datetime.utcnow() + timedelta(days=1)).isoformat()
+    response = client.get("/certifications/export", params={"updated_since": tomorrow}, headers=headers)
+    assert response.status_code == 200
+    assert response.text == ""
+    print("✅ Certifications exported as NDJSON")
+
 def test_invalid_token():
     """Test with invalid JWT token"""
     print("\nTest 12: Testing with invalid token...")
@@ -535,6 +559,7 @@ if __name__ == "__main__":
         ("Default Pagination", test_certification_default_pagination),
         ("Response Fields", test_certification_fields),
         ("Invalid Token", test_invalid_token),
+        ("Export NDJSON", test_export_certifications_ndjson),
     ]
     
     passed = 0
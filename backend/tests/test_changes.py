@@ -0,0 +1,150 @@
+# tests/test_changes.py
+import sys
+import os
+import importlib
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from datetime import datetime, timedelta
+from jose import jwt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.database import Base, get_db
+from app.models import Employee, Department, Training, Enrollment, Certification, Tombstone
+
+# app.crud re-exports the CRUD instance under the module's name, so fetch the module itself
+changes_module = importlib.import_module("app.crud.changes")
+
+# Create test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_changes.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Override the get_db dependency
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+# Authentication constants
+SECRET_KEY = "supersecretkey"
+ALGORITHM = "HS256"
+USER_EMAIL = "skillflow@gmail.com"
+
+@pytest.fixture(autouse=True)
+def setup_test(monkeypatch):
+    """Setup and teardown for each test"""
+    Base.metadata.create_all(bind=engine)
+    cleanup_database()
+    # Don't hold back freshly written rows in tests
+    monkeypatch.setattr(changes_module, "CHANGE_FEED_LAG_SECONDS", 0)
+    yield
+
+def get_auth_headers():
+    """Generate authentication headers with a valid JWT token"""
+    expire = datetime.utcnow() + timedelta(minutes=60)
+    payload = {"sub": USER_EMAIL, "exp": expire}
+    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+    
+    return {"Authorization": f"Bearer {token}"}
+
+def cleanup_database():
+    """Clean up test database"""
+    db = TestingSessionLocal()
+    try:
+        db.query(Tombstone).delete()
+        db.query(Certification).delete()
+        db.query(Enrollment).delete()
+        db.query(Employee).delete()
+        db.query(Training).delete()
+        db.query(Department).delete()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Cleanup error: {e}")
+    finally:
+        db.close()
+
+def create_trainings(count: int):
+    """Create trainings with distinct, increasing updated_at values"""
+    db = TestingSessionLocal()
+    try:
+        base = datetime.utcnow() - timedelta(hours=1)
+        ids = []
+        for i in range(count):
+            training = Training(
+                name=f"Training {i}",
+                duration_hours=1.0,
+                created_at=base + timedelta(seconds=i),
+                updated_at=base + timedelta(seconds=i)
+            )
+            db.add(training)
+            db.commit()
+            ids.append(training.id)
+        return ids
+    finally:
+        db.close()
+
+def test_unauthorized_access():
+    """Test that the change feed requires authentication"""
+    response = client.get("/changes")
+    assert response.status_code == 401 or response.status_code == 403
+
+def test_changes_full_sync_then_incremental():
+    """Test paging through the feed and resuming from next_token"""
+    training_ids = create_trainings(3)
+    headers = get_auth_headers()
+    
+    response = client.get("/changes", params={"limit": 2}, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert [c["id"] for c in data["changes"]] == training_ids[:2]
+    assert data["has_more"] is True
+    assert data["changes"][0]["operation"] == "upsert"
+    assert data["changes"][0]["data"]["name"] == "Training 0"
+    
+    response = client.get("/changes", params={"since": data["next_token"], "limit": 2}, headers=headers)
+    data = response.json()
+    assert [c["id"] for c in data["changes"]] == training_ids[2:]
+    assert data["has_more"] is False
+    
+    # Nothing new since the last token
+    response = client.get("/changes", params={"since": data["next_token"]}, headers=headers)
+    assert response.json()["changes"] == []
+    print("✅ Change feed pages and resumes from token")
+
+def test_changes_reports_deletes():
+    """Test that deleting through the API produces a delete change"""
+    training_ids = create_trainings(1)
+    headers = get_auth_headers()
+    
+    token = client.get("/changes", headers=headers).json()["next_token"]
+    
+    response = client.delete(f"/trainings/{training_ids[0]}", headers=headers)
+    assert response.status_code == 204
+    
+    data = client.get("/changes", params={"since": token}, headers=headers).json()
+    assert len(data["changes"]) == 1
+    change = data["changes"][0]
+    assert change["entity"] == "training"
+    assert change["id"] == training_ids[0]
+    assert change["operation"] == "delete"
+    assert change["data"] is None
+    print("✅ Deletes appear in the change feed")
+
+def test_changes_invalid_token():
+    """Test that a malformed token is rejected"""
+    headers = get_auth_headers()
+    response = client.get("/changes", params={"since": "not-a-token"}, headers=headers)
+    assert response.status_code == 400
@@ -3,7 +3,7 @@ import sys
 import os
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, date, timedelta
 import json
@@ -13,7 +13,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.main import app
 from app.database import Base, get_db
-from app.models import Employee, Department, Training, Enrollment, Certification
+from app.models import Employee, Department, Training, Enrollment, Certification, ComplianceSnapshot
+from app.crud import compliance_trends, expiry_calendar
+from app.crud.compliance import compliance as crud_compliance
+from app.timezones import ZoneClocks
+from app.responses import FastJSONResponse
+from decimal import Decimal
 
 # Create test database
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test_compliance.db"
@@ -61,6 +66,7 @@ def cleanup_database():
     db = TestingSessionLocal()
     try:
         # Delete in correct order to avoid foreign key constraints
+        db.query(ComplianceSnapshot).delete()
         db.query(Certification).delete()
         db.query(Enrollment).delete()
         db.query(Employee).delete()
@@ -870,6 +876,399 @@ def test_invalid_token_compliance():
         print(f"❌ Error: {e}")
         raise
 
+def test_compliance_trends_from_snapshots():
+    """Test GET /api/compliance/trends buckets precomputed snapshots"""
+    print("\nTest 15: Reading compliance trends...")
+    
+    create_test_compliance_data()
+    headers = get_auth_headers()
+    
+    today = datetime.now().date()
+    db = TestingSessionLocal()
+    try:
+        # Two consecutive days about two months ago, plus today
+        compliance_trends.snapshot(db, today - timedelta(days=62))
+        compliance_trends.snapshot(db, today - timedelta(days=61))
+        compliance_trends.snapshot(db, today)
+    finally:
+        db.close()
+    
+    response = client.get(
+        "/api/compliance/trends",
+        params={"bucket": "day", "start": str(today - timedelta(days=90)), "end": str(today)},
+        headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["bucket"] == "day"
+    assert len(data["series"]) == 1
+    assert data["series"][0]["department"] == "all"
+    assert len(data["series"][0]["points"]) == 3
+    assert "complianceRate" in data["series"][0]["points"][0]
+    
+    response = client.get(
+        "/api/compliance/trends",
+        params={"bucket": "month", "include_departments": True},
+        headers=headers
+    )
+    assert response.status_code == 200
+    series = {s["department"]: s for s in response.json()["series"]}
+    assert {"all", "Engineering", "Sales"} <= set(series)
+    assert series["Engineering"]["points"][-1]["totalEmployees"] == 2
+    
+    response = client.get("/api/compliance/trends", params={"department": "Nope"}, headers=headers)
+    assert response.status_code == 400
+    print("✅ Compliance trends served from snapshots")
+
+def test_compliance_report_date_range_bounds_data():
+    """Test that date_range excludes certifications and enrollments outside the window"""
+    print("\nTest 16: Checking date_range bounds the report queries...")
+    
+    create_test_compliance_data()
+    headers = get_auth_headers()
+    
+    filters = {
+        "department": "all",
+        "date_range": {"start": "2015-01-01", "end": "2015-12-31"}
+    }
+    response = client.post("/api/compliance/report", json=filters, headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    
+    # Employees are still counted, but nothing was active back then
+    assert data["totalEmployees"] == 3
+    assert data["certificationStatus"] == []
+    assert data["missingCertifications"] == []
+    assert data["completedTrainings"] == 0
+    assert data["pendingTrainings"] == 0
+    
+    filters["date_range"] = {"start": "2024-12-31", "end": "2024-01-01"}
+    response = client.post("/api/compliance/report", json=filters, headers=headers)
+    assert response.status_code == 400
+    
+    filters["date_range"] = {"start": "yesterday", "end": "today"}
+    response = client.post("/api/compliance/report", json=filters, headers=headers)
+    assert response.status_code == 400
+    print("✅ date_range bounds the compliance report")
+
+def test_compliance_report_query_count_is_constant():
+    """Test that the report loads its data once instead of querying per employee"""
+    print("\nTest 17: Checking report query count does not grow with employees...")
+    
+    create_test_compliance_data()
+    headers = get_auth_headers()
+    statements = []
+    
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        response = client.post("/api/compliance/report", json={"department": "all"}, headers=headers)
+        assert response.status_code == 200
+        baseline = len(statements)
+        
+        db = TestingSessionLocal()
+        dept = db.query(Department).first()
+        training = db.query(Training).first()
+        for i in range(10):
+            emp = Employee(
+                employee_id=f"EMPQ{i:03d}",
+                first_name="Query",
+                last_name=f"Count{i}",
+                email=f"query.count{i}@test.com",
+                position="Analyst",
+                department_id=dept.id,
+                is_active=True
+            )
+            db.add(emp)
+            db.flush()
+            db.add(Enrollment(employee_id=emp.id, training_id=training.id, status="completed",
+                              progress=100, completed_date=datetime.now() - timedelta(days=40)))
+        db.commit()
+        db.close()
+        
+        statements.clear()
+        response = client.post("/api/compliance/report", json={"department": "all"}, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["totalEmployees"] == 13
+        assert len(statements) == baseline
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+    print(f"✅ Report issued {baseline} SELECTs regardless of employee count")
+
+def test_missing_certifications_paginated():
+    """Test GET /api/compliance/missing-certifications - paging and sorting"""
+    print("\nTest 18: Paging missing certifications...")
+    
+    create_test_compliance_data()
+    headers = get_auth_headers()
+    
+    db = TestingSessionLocal()
+    dept = db.query(Department).first()
+    trainings = db.query(Training).all()
+    emp = Employee(
+        employee_id="GAP-001",
+        first_name="Gap",
+        last_name="Filler",
+        email="gap.filler@example.com",
+        position="Analyst",
+        department_id=dept.id,
+        is_active=True
+    )
+    db.add(emp)
+    db.flush()
+    for i, training in enumerate(trainings):
+        db.add(Enrollment(employee_id=emp.id, training_id=training.id, status="completed",
+                          progress=100, completed_date=datetime.utcnow() - timedelta(days=40 + i * 10)))
+    db.commit()
+    db.close()
+    
+    report = client.post("/api/compliance/report", json={"department": "all"}, headers=headers).json()
+    
+    response = client.get("/api/compliance/missing-certifications?limit=2", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == len(report["missingCertifications"])
+    assert data["total"] >= len(trainings)
+    assert len(data["items"]) == 2
+    assert data["items"][0]["daysOverdue"] >= data["items"][1]["daysOverdue"]
+    
+    response = client.get(f"/api/compliance/missing-certifications?skip={data['total'] - 1}&sort=days_overdue_asc", headers=headers)
+    assert response.status_code == 200
+    last = response.json()["items"]
+    assert len(last) == 1
+    assert last[0]["daysOverdue"] == max(item["daysOverdue"] for item in report["missingCertifications"])
+    
+    # Keyset cursors walk the same rows in the same order as offset paging, in both directions
+    for sort in ("days_overdue_desc", "days_overdue_asc"):
+        offset_items = client.get(f"/api/compliance/missing-certifications?limit=500&sort={sort}", headers=headers).json()["items"]
+        walked, cursor = [], None
+        while True:
+            url = f"/api/compliance/missing-certifications?limit=1&sort={sort}" + (f"&cursor={cursor}" if cursor else "")
+            page = client.get(url, headers=headers).json()
+            walked.extend(page["items"])
+            if not page["hasMore"]:
+                break
+            cursor = page["nextCursor"]
+        assert walked == offset_items
+    
+    response = client.get("/api/compliance/missing-certifications?sort=name", headers=headers)
+    assert response.status_code == 422
+    print(f"✅ Missing certifications paginated ({data['total']} total)")
+
+def test_missing_certification_days_overdue_in_department_zone():
+    """Days overdue counts local days in the department's zone, else the org zone (IST)"""
+    # 10:30 UTC: already 2 Jan in Kiritimati (UTC+14), still 1 Jan in IST
+    clocks = ZoneClocks({7: "Pacific/Kiritimati"}, now=datetime(2026, 1, 1, 10, 30))
+
+    def overdue(department_id):
+        row = type("Row", (), {
+            "employee_id": 1, "department_id": department_id, "completed_date": datetime(2025, 11, 30, 9, 0),
+            "first_name": "Zone", "last_name": "Tester", "training_name": "Safety", "department_name": "Ops"
+        })
+        return crud_compliance._missing_certification_item(row, clocks).days_overdue
+
+    # Completed 30 Nov 23:00 in Kiritimati, 33 local days ago; 30 Nov 14:30 IST, 32 days ago
+    assert overdue(7) == 3
+    assert overdue(None) == 2
+    print("✅ Days overdue in the department's zone")
+
+def test_compliance_report_cache():
+    """Test that repeated reports and exports reuse the cached report until data changes"""
+    print("\nTest 19: Checking the compliance report cache...")
+    
+    create_test_compliance_data()
+    headers = get_auth_headers()
+    filters = {"department": "all"}
+    
+    first = client.post("/api/compliance/report", json=filters, headers=headers)
+    assert first.status_code == 200
+    stats = client.get("/api/compliance/cache-stats", headers=headers).json()
+    
+    # Same filters again, then an export of the same report: both served from cache
+    second = client.post("/api/compliance/report", json=filters, headers=headers)
+    assert second.json() == first.json()
+    export = client.post("/api/compliance/export/excel", json=filters, headers=headers)
+    assert export.status_code == 200
+    after = client.get("/api/compliance/cache-stats", headers=headers).json()
+    assert after["hits"] == stats["hits"] + 2
+    assert after["misses"] == stats["misses"]
+    
+    # A committed write from another session moves the data version and the next report is recomputed
+    db = TestingSessionLocal()
+    emp = db.query(Employee).first()
+    emp.first_name = "Renamed"
+    db.commit()
+    db.close()
+    
+    third = client.post("/api/compliance/report", json=filters, headers=headers)
+    assert third.status_code == 200
+    final = client.get("/api/compliance/cache-stats", headers=headers).json()
+    assert final["data_version"] != after["data_version"]
+    assert final["misses"] == after["misses"] + 1
+    
+    # A second edit in the same second, with row counts unchanged, moves it again;
+    # a rolled back write doesn't
+    db = TestingSessionLocal()
+    db.query(Employee).first().first_name = "Renamed Again"
+    db.commit()
+    renamed = client.get("/api/compliance/cache-stats", headers=headers).json()["data_version"]
+    assert renamed != final["data_version"]
+    db.query(Employee).first().first_name = "Rolled Back"
+    db.flush()
+    db.rollback()
+    db.close()
+    assert client.get("/api/compliance/cache-stats", headers=headers).json()["data_version"] == renamed
+    
+    # Writes that bypass the ORM (a calendar rebuild by the jobs process) invalidate it too
+    db = TestingSessionLocal()
+    expiry_calendar.rebuild(db)
+    db.close()
+    client.post("/api/compliance/report", json=filters, headers=headers)
+    rebuilt = client.get("/api/compliance/cache-stats", headers=headers).json()
+    assert rebuilt["misses"] == final["misses"] + 1
+    print(f"✅ Report cache stats: {rebuilt}")
+
+def test_fast_json_response_encodes_decimals():
+    """MySQL SUM/AVG aggregates come back as Decimal; both encoders render them as numbers"""
+    response = FastJSONResponse({"hours": Decimal("12.5"), "day": date(2024, 6, 1), 1: "non-string key"})
+    assert json.loads(response.body) == {"hours": 12.5, "day": "2024-06-01", "1": "non-string key"}
+
+def test_compliance_sections_and_summary():
+    """Test section endpoints page through the same rows as the full report, and summary mode"""
+    print("\nTest 20: Paging report sections with keyset cursors...")
+    
+    create_test_compliance_data()
+    headers = get_auth_headers()
+    report = client.post("/api/compliance/report", json={"department": "all"}, headers=headers).json()
+    
+    def walk(path):
+        items, cursor = [], None
+        while True:
+            url = f"{path}?limit=1" + (f"&cursor={cursor}" if cursor else "")
+            response = client.get(url, headers=headers)
+            assert response.status_code == 200
+            page = response.json()
+            items.extend(page["items"])
+            if not page["hasMore"]:
+                return items
+            cursor = page["nextCursor"]
+    
+    upcoming = walk("/api/compliance/upcoming-expirations")
+    assert sorted(item["id"] for item in upcoming) == sorted(item["id"] for item in report["upcomingExpirations"])
+    assert [item["daysUntilExpiry"] for item in upcoming] == sorted(item["daysUntilExpiry"] for item in upcoming)
+    
+    missing = walk("/api/compliance/missing-certifications")
+    assert len(missing) == len(report["missingCertifications"])
+    
+    departments = walk("/api/compliance/department-compliance")
+    by_name = {dept["department"]: dept for dept in report["departmentCompliance"]}
+    assert [dept["department"] for dept in departments] == sorted(by_name)
+    for dept in departments:
+        assert dept == by_name[dept["department"]]
+    
+    response = client.get("/api/compliance/upcoming-expirations?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+    
+    response = client.post("/api/compliance/report?summary=true", json={"department": "all"}, headers=headers)
+    assert response.status_code == 200
+    summary = response.json()
+    assert "upcomingExpirations" not in summary
+    assert summary["totalEmployees"] == report["totalEmployees"]
+    assert summary["overallComplianceRate"] == report["overallComplianceRate"]
+    assert summary["upcomingExpirationsCount"] == len(report["upcomingExpirations"])
+    assert summary["missingCertificationsCount"] == len(report["missingCertifications"])
+    print(f"✅ Sections match the report ({len(upcoming)} upcoming, {len(missing)} missing, {len(departments)} departments)")
+
+def test_export_compliance_report_pdf_full():
+    """Test full PDF export, rendered sequentially and through the process pool"""
+    print("\nTest 21: Exporting the full compliance report to PDF...")
+    pytest.importorskip("reportlab")
+    pypdf = pytest.importorskip("pypdf")
+    import app.pdf as pdf
+    from io import BytesIO
+    from app.crud import compliance
+    
+    create_test_compliance_data()
+    headers = get_auth_headers()
+    
+    response = client.post("/api/compliance/export/pdf?full=true", json={"department": "all"}, headers=headers)
+    assert response.status_code == 200
+    assert "application/pdf" in response.headers["content-type"]
+    assert response.content.startswith(b"%PDF")
+    
+    # Spread enough rows over two departments to need several pages each
+    db = TestingSessionLocal()
+    try:
+        report = compliance.get_compliance_report(db, {"department": "all"})
+    finally:
+        db.close()
+    template = report.upcoming_expirations[0]
+    report = report.model_copy(update={
+        "upcoming_expirations": [
+            template.model_copy(update={"id": i, "department": dept})
+            for i, dept in enumerate(["Engineering", "Sales"] * 60)
+        ]
+    })
+    
+    # Force the process-pool path and compare with a sequential render
+    workers, min_rows = pdf.PDF_RENDER_WORKERS, pdf.PARALLEL_MIN_ROWS
+    pdf.PDF_RENDER_WORKERS, pdf.PARALLEL_MIN_ROWS = 2, 0
+    try:
+        merged = pdf.render_compliance_report(report, {"department": "all"}, full=True)
+    finally:
+        pdf.PDF_RENDER_WORKERS, pdf.PARALLEL_MIN_ROWS = workers, min_rows
+    sequential = pdf.render_compliance_report(report, {"department": "all"}, full=True, parallel=False)
+    
+    # Each department part starts on a fresh page when merged
+    assert len(pypdf.PdfReader(BytesIO(merged)).pages) >= len(pypdf.PdfReader(BytesIO(sequential)).pages) > 1
+    print(f"✅ Full PDF export ({len(response.content)} bytes, merged {len(merged)} bytes)")
+
+def test_export_compliance_report_columnar():
+    """Test POST /api/compliance/export/{parquet,arrow,csv} - zip of per-section files"""
+    print("\nTest 22: Exporting compliance report sections as columnar files...")
+    import zipfile
+    from io import BytesIO
+    import pandas as pd
+    
+    create_test_compliance_data()
+    headers = get_auth_headers()
+    report = client.post("/api/compliance/report", json={"department": "all"}, headers=headers).json()
+    
+    response = client.post("/api/compliance/export/csv", json={"department": "all"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    assert "_csv.zip" in response.headers["content-disposition"]
+    
+    archive = zipfile.ZipFile(BytesIO(response.content))
+    assert sorted(archive.namelist()) == sorted([
+        "summary.csv", "department_compliance.csv", "certification_status.csv",
+        "upcoming_expirations.csv", "missing_certifications.csv"
+    ])
+    departments = pd.read_csv(archive.open("department_compliance.csv"))
+    assert len(departments) == len(report["departmentCompliance"])
+    assert departments["compliance_rate"].dtype.kind == "f"
+    
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        response = client.post("/api/compliance/export/parquet", json={"department": "all"}, headers=headers)
+        assert response.status_code == 400
+        print("✅ CSV export OK; parquet rejected without pyarrow")
+        return
+    
+    for format, reader in (("parquet", pd.read_parquet), ("arrow", pd.read_feather)):
+        response = client.post(f"/api/compliance/export/{format}", json={"department": "all"}, headers=headers)
+        assert response.status_code == 200
+        archive = zipfile.ZipFile(BytesIO(response.content))
+        certs = reader(BytesIO(archive.read(f"certification_status.{format}")))
+        assert list(certs["certification"]) == [c["certification"] for c in report["certificationStatus"]]
+        missing = reader(BytesIO(archive.read(f"missing_certifications.{format}")))
+        assert list(missing.columns) == ["id", "employee_name", "required_certification", "department", "days_overdue"]
+    print("✅ Exported sections as csv, parquet and arrow")
+
 # Run tests with pytest
 if __name__ == "__main__":
     print("=" * 60)
@@ -891,6 +1290,14 @@ if __name__ == "__main__":
         ("Generate Report - Empty Database", test_compliance_report_empty_database),
         ("Generate Report - Certification Types", test_compliance_report_certification_types),
         ("Invalid Token", test_invalid_token_compliance),
+        ("Compliance Trends", test_compliance_trends_from_snapshots),
+        ("Generate Report - Date Range Bounds", test_compliance_report_date_range_bounds_data),
+        ("Generate Report - Constant Query Count", test_compliance_report_query_count_is_constant),
+        ("Missing Certifications - Paginated", test_missing_certifications_paginated),
+        ("Report Cache", test_compliance_report_cache),
+        ("Report Sections and Summary", test_compliance_sections_and_summary),
+        ("Export Report - Full PDF", test_export_compliance_report_pdf_full),
+        ("Export Report - Columnar", test_export_compliance_report_columnar),
     ]
     
     passed = 0
@@ -8,8 +8,15 @@ from jose import jwt
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
+import json
 from fastapi.testclient import TestClient
 from app.main import app
+from app.events import dashboard_bus, outbox_dispatcher
+from app.streaming import iter_sse
+from app.database import SessionLocal
+from app.models import Certification, ExpiryCalendarEntry
+from app.crud import expiry_calendar
 
 client = TestClient(app)
 
@@ -280,6 +287,161 @@ def test_invalid_token():
     assert response.status_code == 401 or response.status_code == 403
     print("✅ Expired token correctly rejected")
 
+def test_dashboard_stream():
+    """Test the SSE stream pushes deltas for CRUD writes"""
+    print("\nTest 9: Testing dashboard update stream...")
+    headers = get_auth_headers()
+    
+    # EventSource cannot send headers, so ?token= is accepted too
+    response = client.get("/api/dashboard/stream")
+    assert response.status_code == 401
+    response = client.get("/api/dashboard/stream?token=invalid_token")
+    assert response.status_code == 401
+    print("✅ Stream requires a valid token")
+    
+    def parse(chunk):
+        fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines() if not line.startswith(("retry", ":")))
+        return fields["event"], json.loads(fields["data"])
+    
+    async def scenario():
+        async def is_disconnected():
+            return False
+        
+        stream = iter_sse(dashboard_bus, is_disconnected, heartbeat=0.05)
+        assert parse(await stream.__anext__())[0] == "ready"
+        
+        # The dashboard stream follows the outbox from its current tail. Events
+        # are delivered by the background dispatcher, which tests drive by hand
+        dispatch = lambda: asyncio.to_thread(outbox_dispatcher.dispatch_pending)
+        await dispatch()
+        
+        # Writes run in a worker thread, as sync routes do in the threadpool
+        post = lambda url, body: asyncio.to_thread(client.post, url, json=body, headers=headers)
+        employee = (await post("/employees/", {
+            "employee_id": "SSE001",
+            "first_name": "Stream",
+            "last_name": "Tester",
+            "email": "stream.tester@test.com",
+            "position": "Analyst",
+            "is_active": True
+        })).json()
+        await dispatch()
+        assert parse(await stream.__anext__()) == ("stats", {"changes": {"total_employees": 1}})
+        
+        training = (await post("/trainings", {"name": "Streaming 101", "duration_hours": 3.0})).json()
+        enrollment = (await post("/enrollments", {"employee_id": employee["id"], "training_id": training["id"]})).json()
+        await dispatch()
+        assert parse(await stream.__anext__()) == ("stats", {"changes": {"active_enrollments": 1}})
+        event, item = parse(await stream.__anext__())
+        assert event == "progress" and item["id"] == str(enrollment["id"]) and item["progress"] == 0
+        
+        await asyncio.to_thread(client.patch, f"/enrollments/{enrollment['id']}/progress?progress=100", headers=headers)
+        await dispatch()
+        assert parse(await stream.__anext__()) == (
+            "stats", {"changes": {"active_enrollments": -1, "total_training_hours": 3.0}}
+        )
+        event, item = parse(await stream.__anext__())
+        assert event == "progress" and item["status"] == "completed"
+        # Completion issues a certificate (valid for a year, so no alert)
+        assert parse(await stream.__anext__()) == ("stats", {"changes": {"total_certifications": 1}})
+        
+        # Idle streams send keep-alive comments
+        assert await stream.__anext__() == ": ping\n\n"
+        await stream.aclose()
+        assert dashboard_bus.subscriber_count == 0
+        return employee, training, enrollment
+    
+    employee, training, enrollment = asyncio.run(scenario())
+    client.delete(f"/enrollments/{enrollment['id']}", headers=headers)
+    client.delete(f"/trainings/{training['id']}", headers=headers)
+    client.delete(f"/employees/{employee['id']}", headers=headers)
+    print("✅ Stats and progress deltas streamed for employee and enrollment writes")
+    return True
+
+def test_certification_alerts_follow_expiry_calendar():
+    """Test certification alerts are read from the expiry calendar and follow employee changes"""
+    print("\nTest 10: Testing certification alerts from the expiry calendar...")
+    headers = get_auth_headers()
+    
+    ops = client.post("/departments", json={"name": "Calendar Ops", "timezone": "America/New_York"}, headers=headers).json()
+    qa = client.post("/departments", json={"name": "Calendar QA"}, headers=headers).json()
+    employee = client.post("/employees/", json={
+        "employee_id": "CAL001",
+        "first_name": "Calendar",
+        "last_name": "Tester",
+        "email": "calendar.tester@test.com",
+        "department_id": ops["id"],
+        "position": "Inspector"
+    }, headers=headers).json()
+    training = client.post("/trainings", json={"name": "Calendar Safety", "duration_hours": 1.0}, headers=headers).json()
+    
+    # 20:00 UTC three days out is still that day in New York but already the next day in IST
+    expires_at = (datetime.utcnow() + timedelta(days=3)).replace(hour=20, minute=0, second=0, microsecond=0)
+    db = SessionLocal()
+    try:
+        cert = Certification(employee_id=employee["id"], training_id=training["id"],
+                             cert_number="CAL-CERT-001", expires_at=expires_at)
+        db.add(cert)
+        db.commit()
+        cert_id = str(cert.id)
+    finally:
+        db.close()
+    
+    def alert():
+        alerts = client.get("/api/dashboard/dashboard-data", headers=headers).json()["certificationAlerts"]
+        matches = [item for item in alerts["expiring_soon"] + alerts["expiring_later"] + alerts["expired"] if item["id"] == cert_id]
+        return matches[0] if matches else None
+    
+    item = alert()
+    assert item["status"] == "expiring_soon"
+    assert item["department"] == "Calendar Ops"
+    assert item["expiryDate"] == expires_at.strftime("%Y-%m-%d")
+    
+    # Moving the employee, then deleting their department, updates the calendar rows
+    client.put(f"/employees/{employee['id']}", json={"department_id": qa["id"]}, headers=headers)
+    item = alert()
+    assert item["department"] == "Calendar QA"
+    # QA has no timezone of its own, so the org zone (IST) applies
+    assert item["expiryDate"] == (expires_at + timedelta(days=1)).strftime("%Y-%m-%d")
+    client.delete(f"/departments/{qa['id']}", headers=headers)
+    assert alert()["department"] == "Unassigned"
+    
+    # A rebuild produces the same rows the flushes maintained
+    db = SessionLocal()
+    try:
+        before = db.query(ExpiryCalendarEntry).filter(ExpiryCalendarEntry.certification_id == int(cert_id)).one()
+        before = (before.expiry_date, before.expires_at, before.department_id, before.status)
+        expiry_calendar.rebuild(db)
+        after = db.query(ExpiryCalendarEntry).filter(ExpiryCalendarEntry.certification_id == int(cert_id)).one()
+        assert (after.expiry_date, after.expires_at, after.department_id, after.status) == before
+        assert after.timezone == "Asia/Kolkata"
+        assert expiry_calendar.ensure_built(db) is None
+
+        # Rows bucketed under a previous ORG_TIMEZONE are rebuilt at the next startup
+        after.timezone = "UTC"
+        after.expiry_date = expires_at.date()
+        db.commit()
+        assert expiry_calendar.ensure_built(db) >= 1
+        rebuilt = db.query(ExpiryCalendarEntry).filter(ExpiryCalendarEntry.certification_id == int(cert_id)).one()
+        assert (rebuilt.expiry_date, rebuilt.timezone) == (before[0], "Asia/Kolkata")
+    finally:
+        db.close()
+    
+    # Deleting the employee drops their alerts
+    client.delete(f"/employees/{employee['id']}", headers=headers)
+    assert alert() is None
+    
+    db = SessionLocal()
+    try:
+        db.query(Certification).filter(Certification.cert_number == "CAL-CERT-001").delete()
+        db.commit()
+    finally:
+        db.close()
+    client.delete(f"/trainings/{training['id']}", headers=headers)
+    client.delete(f"/departments/{ops['id']}", headers=headers)
+    print("✅ Certification alerts follow the expiry calendar")
+    return True
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Running Dashboard API Tests (with Authentication)")
@@ -294,6 +456,8 @@ if __name__ == "__main__":
         ("Dashboard Performance", test_dashboard_performance),
         ("Invalid Endpoints", test_invalid_dashboard_endpoint),
         ("Invalid Token", test_invalid_token),
+        ("Dashboard Stream", test_dashboard_stream),
+        ("Alerts From Expiry Calendar", test_certification_alerts_follow_expiry_calendar),
     ]
     
     tests_passed = 0
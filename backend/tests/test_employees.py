@@ -492,6 +492,74 @@ def test_invalid_token():
     assert response.status_code == 401 or response.status_code == 403
     print("✅ Expired token correctly rejected for list endpoint")
 
+def test_import_employees_csv():
+    """Test bulk importing employees from a CSV upload"""
+    print("\nTest 15: Testing CSV bulk import...")
+    
+    headers = get_auth_headers()
+    csv_content = (
+        "employee_id,first_name,last_name,email,position,hire_date\n"
+        "IMP001,Alice,Import,alice.import@test.com,Analyst,2024-02-01\n"
+        "IMP002,Bob,Import,bob.import@test.com,,\n"
+    )
+    
+    response = client.post(
+        "/employees/import",
+        files={"file": ("employees.csv", csv_content, "text/csv")},
+        headers=headers
+    )
+    
+    print(f"Status code: {response.status_code}")
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["total_rows"] == 2
+    assert data["imported"] == 2
+    assert data["failed"] == 0
+    assert data["errors"] == []
+    print("✅ Imported 2 employees from CSV")
+    
+    # Clean up
+    existing = client.get("/employees/", headers=headers, params={"limit": 1000})
+    for emp in existing.json().get("employees", []):
+        if emp.get("employee_id") in ("IMP001", "IMP002"):
+            delete_test_employee(emp["id"])
+
+def test_import_employees_csv_reports_row_errors():
+    """Test that invalid and duplicate CSV rows are reported per row"""
+    print("\nTest 16: Testing CSV bulk import error report...")
+    
+    headers = get_auth_headers()
+    csv_content = (
+        "employee_id,first_name,last_name,email\n"
+        "IMP101,Carol,Import,carol.import@test.com\n"
+        "IMP102,Dan,Import,not-an-email\n"
+        "IMP101,Erin,Import,erin.import@test.com\n"
+    )
+    
+    response = client.post(
+        "/employees/import",
+        files={"file": ("employees.csv", csv_content, "text/csv")},
+        headers=headers
+    )
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_rows"] == 3
+    assert data["imported"] == 1
+    assert data["failed"] == 2
+    
+    errors_by_row = {error["row"]: error for error in data["errors"]}
+    assert any("email" in message for message in errors_by_row[3]["errors"])
+    assert "Duplicate employee ID in file" in errors_by_row[4]["errors"]
+    print("✅ Row-level import errors reported")
+    
+    # Clean up
+    existing = client.get("/employees/", headers=headers, params={"limit": 1000})
+    for emp in existing.json().get("employees", []):
+        if emp.get("employee_id") == "IMP101":
+            delete_test_employee(emp["id"])
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Running Employees API Tests (with Authentication)")
@@ -512,6 +580,8 @@ if __name__ == "__main__":
         ("Employee Pagination", test_employee_pagination),
         ("Invalid Email Format", test_employee_invalid_email),
         ("Invalid Token", test_invalid_token),
+        ("CSV Import", test_import_employees_csv),
+        ("CSV Import Row Errors", test_import_employees_csv_reports_row_errors),
     ]
     
     tests_passed = 0
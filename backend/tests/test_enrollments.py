@@ -564,6 +564,34 @@ def test_enrollment_invalid_progress():
     except Exception as e:
         print(f"⚠️  Progress validation note: {e}")
 
+def test_export_enrollments_csv():
+    """Test GET /enrollments/export streams CSV rows"""
+    print("\nTest 15: Exporting enrollments as CSV...")
+    
+    employee, training = setup_test_data()
+    headers = get_auth_headers()
+    
+    enrollment_data = {
+        "employee_id": employee["id"],
+        "training_id": training["id"],
+        "status": "enrolled",
+        "progress": 0
+    }
+    create_response = client.post("/enrollments/", json=enrollment_data, headers=headers)
+    assert create_response.status_code == 201
+    
+    response = client.get("/enrollments/export", params={"format": "csv"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    
+    lines = response.text.strip().splitlines()
+    assert lines[0].split(",")[:3] == ["id", "employee_id", "training_id"]
+    assert len(lines) == 2
+    
+    response = client.get("/enrollments/export", params={"format": "xml"}, headers=headers)
+    assert response.status_code == 422
+    print("✅ Enrollments exported as CSV")
+
 def test_invalid_token():
     """Test enrollment endpoints with invalid JWT token"""
     print("\nTest 13: Testing enrollment endpoints with invalid token...")
@@ -611,6 +639,7 @@ if __name__ == "__main__":
         ("Delete Not Found", test_enrollment_delete_not_found),
         ("Invalid Progress", test_enrollment_invalid_progress),
         ("Invalid Token", test_invalid_token),
+        ("Export CSV", test_export_enrollments_csv),
     ]
     
     passed = 0
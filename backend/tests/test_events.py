@@ -0,0 +1,253 @@
+# tests/test_events.py
+import sys
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from datetime import datetime, timedelta
+from jose import jwt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.database import Base, get_db
+from app.models import Employee, Training, Enrollment, Certification, OutboxEvent, EventConsumerOffset
+from app.events import OutboxDispatcher, record
+from app.events.dashboard import _progress_item
+from app.timezones import LocalClock
+
+# Create test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_events.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Override the get_db dependency
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+# Authentication constants
+SECRET_KEY = "supersecretkey"
+ALGORITHM = "HS256"
+USER_EMAIL = "skillflow@gmail.com"
+
+@pytest.fixture(autouse=True)
+def setup_test():
+    """Setup and teardown for each test"""
+    Base.metadata.create_all(bind=engine)
+    cleanup_database()
+    yield
+
+def get_auth_headers():
+    """Generate authentication headers with a valid JWT token"""
+    expire = datetime.utcnow() + timedelta(minutes=60)
+    payload = {"sub": USER_EMAIL, "exp": expire}
+    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+
+    return {"Authorization": f"Bearer {token}"}
+
+def cleanup_database():
+    """Clean up test database"""
+    db = TestingSessionLocal()
+    try:
+        db.query(EventConsumerOffset).delete()
+        db.query(OutboxEvent).delete()
+        db.query(Certification).delete()
+        db.query(Enrollment).delete()
+        db.query(Employee).delete()
+        db.query(Training).delete()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Cleanup error: {e}")
+    finally:
+        db.close()
+
+def enroll_and_complete():
+    """Employee, training and enrollment through the API, then progress to 100%"""
+    headers = get_auth_headers()
+    employee = client.post("/employees/", json={
+        "employee_id": "EVT001",
+        "first_name": "Event",
+        "last_name": "Tester",
+        "email": "event.tester@test.com",
+        "position": "Analyst"
+    }, headers=headers).json()
+    training = client.post("/trainings", json={"name": "Events 101", "duration_hours": 2.0}, headers=headers).json()
+    enrollment = client.post("/enrollments", json={
+        "employee_id": employee["id"],
+        "training_id": training["id"]
+    }, headers=headers).json()
+    client.patch(f"/enrollments/{enrollment['id']}/progress?progress=100", headers=headers)
+    return employee, enrollment
+
+def test_writes_record_events_in_order():
+    """CRUD writes add outbox events in the same transaction"""
+    employee, enrollment = enroll_and_complete()
+
+    db = TestingSessionLocal()
+    try:
+        events = db.query(OutboxEvent).order_by(OutboxEvent.id).all()
+        assert [event.event_type for event in events] == [
+            "EmployeeCreated", "EnrollmentCreated", "EnrollmentProgressed", "CertificationIssued"
+        ]
+        assert events[0].aggregate_id == employee["id"]
+        progressed = events[2]
+        assert progressed.aggregate_id == enrollment["id"]
+        assert progressed.payload["status"] == "completed"
+        assert progressed.payload["previous_status"] == "enrolled"
+        assert events[3].payload["enrollment_id"] == enrollment["id"]
+
+        # An event recorded in a rolled back transaction is never visible
+        record(db, "EmployeeCreated", "employee", 999, {})
+        db.rollback()
+        assert db.query(OutboxEvent).count() == 4
+    finally:
+        db.close()
+    print("✅ Outbox events recorded with their writes")
+
+def test_dispatcher_batches_retries_and_replays():
+    """Durable consumers get batches at least once and can replay from an offset"""
+    enroll_and_complete()
+    # No visibility lag: the events were just committed by this test
+    dispatcher = OutboxDispatcher(session_factory=TestingSessionLocal, batch_size=3, visibility_lag=0)
+
+    batches = []
+    failures = {"left": 1}
+    def handler(db, events):
+        if failures["left"]:
+            failures["left"] -= 1
+            raise RuntimeError("handler down")
+        batches.append([(event.id, event.event_type) for event in events])
+
+    dispatcher.register("audit", handler)
+    dispatcher.register(
+        "certificates",
+        lambda db, events: batches.append([("cert", event.event_type) for event in events]),
+        event_types=["CertificationIssued"]
+    )
+
+    # The first "audit" batch fails and stays pending; "certificates" still progresses
+    dispatcher.dispatch_pending()
+    assert batches == [[("cert", "CertificationIssued")]]
+    offsets = dispatcher.offsets()
+    assert offsets["audit"] == 0
+
+    # Retried on the next pass, in batches of 3
+    batches.clear()
+    assert dispatcher.dispatch_pending() == 4
+    assert [len(batch) for batch in batches] == [3, 1]
+    ids = [event_id for batch in batches for event_id, _ in batch]
+    assert ids == sorted(ids)
+    last_id = ids[-1]
+    assert dispatcher.offsets()["audit"] == last_id
+
+    # Nothing new: nothing delivered
+    batches.clear()
+    assert dispatcher.dispatch_pending() == 0
+    assert batches == []
+
+    # Replay redelivers from the requested event id
+    dispatcher.replay("audit", ids[2])
+    dispatcher.dispatch_pending()
+    assert [event_id for batch in batches for event_id, _ in batch] == ids[2:]
+    print("✅ Outbox dispatcher delivered in batches, retried and replayed")
+
+def test_dispatcher_waits_for_late_commits():
+    """An event committed after a higher id was already visible is still delivered"""
+    dispatcher = OutboxDispatcher(session_factory=TestingSessionLocal, visibility_lag=2)
+    delivered = []
+    dispatcher.register("audit", lambda db, events: delivered.extend(event.id for event in events))
+
+    def event(event_id):
+        return OutboxEvent(id=event_id, event_type="EmployeeCreated", aggregate_type="employee", aggregate_id=1, payload={})
+
+    db = TestingSessionLocal()
+    try:
+        # Transaction B commits id 11 while transaction A, holding id 10, is still open
+        db.add(event(11))
+        db.commit()
+        assert dispatcher.dispatch_pending() == 0
+        assert dispatcher.offsets()["audit"] == 0
+
+        # A commits later; once both are older than the lag they go out in id order
+        db.add(event(10))
+        db.commit()
+        db.query(OutboxEvent).update({OutboxEvent.created_at: datetime.utcnow() - timedelta(seconds=3)})
+        db.commit()
+    finally:
+        db.close()
+
+    assert dispatcher.dispatch_pending() == 2
+    assert delivered == [10, 11]
+    assert dispatcher.offsets()["audit"] == 11
+    print("✅ Late-committed event delivered")
+
+def test_prune_keeps_undelivered_and_recent_events():
+    """Pruning deletes old events every durable consumer has processed, in batches"""
+    dispatcher = OutboxDispatcher(session_factory=TestingSessionLocal, visibility_lag=0)
+    dispatcher.register("audit", lambda db, events: None)
+    dispatcher.register("live", lambda db, events: None, durable=False)
+
+    old = datetime.utcnow() - timedelta(days=30)
+    db = TestingSessionLocal()
+    try:
+        db.add_all([
+            OutboxEvent(
+                id=event_id, event_type="EmployeeCreated", aggregate_type="employee", aggregate_id=1,
+                payload={}, created_at=old if event_id <= 6 else datetime.utcnow()
+            )
+            for event_id in range(1, 9)
+        ])
+        db.add(EventConsumerOffset(consumer="audit", last_event_id=4))
+        db.commit()
+    finally:
+        db.close()
+
+    cutoff = datetime.utcnow() - timedelta(days=7)
+    # Events 5 and 6 are old but "audit" hasn't processed them; 7 and 8 are recent
+    assert dispatcher.prune(cutoff, batch_size=3) == 4
+    dispatcher.dispatch_pending()
+    assert dispatcher.prune(cutoff) == 2
+
+    db = TestingSessionLocal()
+    try:
+        assert [event.id for event in db.query(OutboxEvent).order_by(OutboxEvent.id)] == [7, 8]
+    finally:
+        db.close()
+    print("✅ Delivered outbox events pruned")
+
+def test_progress_delta_overdue_in_org_zone():
+    """Live progress deltas flag overdue enrollments on the org-zone day, like /dashboard-data"""
+    # 19:00 UTC on 1 June is already 2 June in IST, the default org zone
+    clock = LocalClock(now=datetime(2024, 6, 1, 19, 0))
+    employee = Employee(first_name="Ova", last_name="Due", position="Analyst")
+    training = Training(name="Overdue Training")
+
+    def status(end_date, enrollment_status="in_progress"):
+        enrollment = Enrollment(status=enrollment_status, progress=50, end_date=end_date)
+        enrollment.employee, enrollment.training = employee, training
+        return _progress_item(enrollment, clock)["status"]
+
+    # Ended 1 June 17:30 IST: yesterday in the org zone, though still 1 June in UTC
+    assert status(datetime(2024, 6, 1, 12, 0)) == "overdue"
+    assert status(datetime(2024, 6, 1, 18, 30)) == "in_progress"
+    assert status(datetime(2024, 6, 1, 12, 0), "completed") == "completed"
+    print("✅ Progress deltas use the org-zone day")
+
+def test_replay_unknown_consumer():
+    """Replaying a consumer that isn't registered is an error"""
+    dispatcher = OutboxDispatcher(session_factory=TestingSessionLocal)
+    with pytest.raises(ValueError):
+        dispatcher.replay("missing", 1)
+    print("✅ Unknown consumer rejected")
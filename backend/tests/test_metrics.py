@@ -0,0 +1,158 @@
+# tests/test_metrics.py
+import sys
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from datetime import date, datetime, timedelta
+from jose import jwt
+import pytz
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.database import Base, get_db
+from app.models import Employee, Department, Training, Enrollment, Certification, DailyMetric
+from app.crud import metrics as crud_metrics
+from app.timezones import ORG_TZ, LocalClock, local_date, format_date
+
+# Create test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_metrics.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Override the get_db dependency
+def override_get_db():
+    try:
+        db = TestingSessionLocal()
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+# Authentication constants
+SECRET_KEY = "supersecretkey"
+ALGORITHM = "HS256"
+USER_EMAIL = "skillflow@gmail.com"
+
+@pytest.fixture(autouse=True)
+def setup_test():
+    """Setup and teardown for each test"""
+    Base.metadata.create_all(bind=engine)
+    cleanup_database()
+    yield
+
+def get_auth_headers():
+    """Generate authentication headers with a valid JWT token"""
+    expire = datetime.utcnow() + timedelta(minutes=60)
+    payload = {"sub": USER_EMAIL, "exp": expire}
+    token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+    
+    return {"Authorization": f"Bearer {token}"}
+
+def cleanup_database():
+    """Clean up test database"""
+    db = TestingSessionLocal()
+    try:
+        db.query(DailyMetric).delete()
+        db.query(Certification).delete()
+        db.query(Enrollment).delete()
+        db.query(Employee).delete()
+        db.query(Training).delete()
+        db.query(Department).delete()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Cleanup error: {e}")
+    finally:
+        db.close()
+
+def create_metrics_data():
+    """Two trainings/employees: one created three days ago, one created now"""
+    db = TestingSessionLocal()
+    try:
+        old = datetime.utcnow() - timedelta(days=3)
+        training_old = Training(name="Old Training", duration_hours=10.0, created_at=old)
+        training_new = Training(name="New Training", duration_hours=5.0)
+        emp_old = Employee(employee_id="MET-001", first_name="Old", last_name="Hire",
+                           email="old.hire@example.com", created_at=old)
+        emp_new = Employee(employee_id="MET-002", first_name="New", last_name="Hire",
+                           email="new.hire@example.com")
+        db.add_all([training_old, training_new, emp_old, emp_new])
+        db.commit()
+        
+        enrollment = Enrollment(
+            employee_id=emp_old.id, training_id=training_old.id, status="completed",
+            progress=100, enrolled_date=old, completed_date=old
+        )
+        db.add(enrollment)
+        db.commit()
+    finally:
+        db.close()
+
+def test_snapshot_counts_totals_up_to_day():
+    """Test that a snapshot only counts rows that existed at the end of that day"""
+    create_metrics_data()
+    yesterday = datetime.now(ORG_TZ).date() - timedelta(days=1)
+    
+    db = TestingSessionLocal()
+    try:
+        row = crud_metrics.snapshot(db, yesterday)
+        assert row.metric_date == yesterday
+        assert row.total_employees == 1
+        assert row.total_trainings == 1
+        assert row.total_enrollments == 1
+        assert row.completed_enrollments == 1
+        assert row.total_training_hours == 10.0
+        
+        # Re-running the job for the same day updates the row in place
+        crud_metrics.snapshot(db, yesterday)
+        assert db.query(DailyMetric).count() == 1
+    finally:
+        db.close()
+
+def test_dashboard_growth_uses_rollup():
+    """Test that dashboard growth percentages are computed against the rollup row"""
+    create_metrics_data()
+    headers = get_auth_headers()
+    
+    response = client.get("/api/dashboard/dashboard-data", headers=headers)
+    assert response.status_code == 200
+    stats = response.json()["stats"]
+    
+    # 1 employee yesterday, 2 today
+    assert stats["employee_growth_percentage"] == 100.0
+    assert stats["training_growth_percentage"] == 100.0
+    assert stats["training_hours_growth_percentage"] == 0.0
+    
+    # The dashboard wrote yesterday's rollup on first use
+    db = TestingSessionLocal()
+    try:
+        assert db.query(DailyMetric).count() == 1
+    finally:
+        db.close()
+
+def test_local_day_bucketing_matches_pytz():
+    """Test that cached day boundaries bucket naive UTC values like a per-row pytz conversion"""
+    ist = pytz.timezone("Asia/Kolkata")
+    new_york = pytz.timezone("America/New_York")
+    # Every 17 minutes across both 2024 DST changes in New York, plus IST
+    start = datetime(2024, 3, 8)
+    values = [start + timedelta(minutes=17 * i) for i in range(0, 240 * 60 // 17)]
+    values += [datetime(2024, 11, 1) + timedelta(minutes=17 * i) for i in range(0, 240 * 60 // 17)]
+    for tz in (ist, new_york):
+        for value in values:
+            assert local_date(value, tz) == pytz.utc.localize(value).astimezone(tz).date()
+    
+    # 00:00 IST is 18:30 UTC the day before
+    clock = LocalClock(ist, now=datetime(2024, 6, 1, 19, 0))
+    assert clock.today == date(2024, 6, 2)
+    assert clock.day_start(clock.today) == datetime(2024, 6, 1, 18, 30)
+    assert clock.day_end(clock.today) == datetime(2024, 6, 2, 18, 30)
+    assert format_date(clock.local_date(datetime(2024, 6, 2, 18, 29))) == "2024-06-02"
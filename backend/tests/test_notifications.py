@@ -0,0 +1,202 @@
+# tests/test_notifications.py
+import sys
+import os
+import mailbox
+import smtplib
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import Base
+from app.models import (
+    Employee, Department, Training, Certification, NotificationLog, NotificationWatermark
+)
+from app.notifications import FileTransport, Transport, send_expiry_notifications
+
+# Create test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_notifications.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class CollectingTransport(Transport):
+    """Keeps sent messages in memory; can refuse chosen recipients with an SMTP code"""
+    def __init__(self, fail_for=(), code=451):
+        self.messages = []
+        self.fail_for = set(fail_for)
+        self.code = code
+
+    def send(self, message):
+        if message["To"] in self.fail_for:
+            raise smtplib.SMTPRecipientsRefused({message["To"]: (self.code, b"mailbox unavailable")})
+        self.messages.append(message)
+
+@pytest.fixture(autouse=True)
+def setup_test():
+    """Setup and teardown for each test"""
+    Base.metadata.create_all(bind=engine)
+    cleanup_database()
+    yield
+
+def cleanup_database():
+    """Clean up test database"""
+    db = TestingSessionLocal()
+    try:
+        db.query(NotificationLog).delete()
+        db.query(NotificationWatermark).delete()
+        db.query(Certification).delete()
+        db.query(Employee).delete()
+        db.query(Training).delete()
+        db.query(Department).delete()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Cleanup error: {e}")
+    finally:
+        db.close()
+
+def create_expiry_data(now):
+    """
+    Alice (Operations, managed by ops.lead@test.com): certifications 5 and 29.5 days out
+    Bob (no department): one certification 12 hours out, one 60 days out, one already expired
+    """
+    db = TestingSessionLocal()
+    try:
+        dept = Department(name="Operations", manager_email="ops.lead@test.com")
+        training = Training(name="Forklift Safety", duration_hours=4.0)
+        db.add_all([dept, training])
+        db.flush()
+        alice = Employee(employee_id="N001", first_name="Alice", last_name="Ng", email="alice@test.com",
+                         department_id=dept.id, position="Operator", is_active=True)
+        bob = Employee(employee_id="N002", first_name="Bob", last_name="Ray", email="bob@test.com",
+                       position="Driver", is_active=True)
+        db.add_all([alice, bob])
+        db.flush()
+
+        def cert(employee, number, expires_in, status="active"):
+            return Certification(employee_id=employee.id, training_id=training.id, cert_number=number,
+                                 expires_at=now + expires_in, status=status)
+
+        db.add_all([
+            cert(alice, "N-1", timedelta(days=5)),
+            cert(alice, "N-2", timedelta(days=29, hours=12)),
+            cert(bob, "N-3", timedelta(hours=12)),
+            cert(bob, "N-4", timedelta(days=60)),
+            cert(bob, "N-5", timedelta(days=2), status="expired"),
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+def run(transport, now):
+    db = TestingSessionLocal()
+    try:
+        return send_expiry_notifications(db, transport, now)
+    finally:
+        db.close()
+
+def test_digests_per_employee_and_manager():
+    """Crossed thresholds are grouped into one digest per recipient"""
+    now = datetime.utcnow()
+    create_expiry_data(now)
+    transport = CollectingTransport()
+
+    result = run(transport, now)
+    assert result == {"certifications": 3, "digests": 3, "sent": 3, "failed": 0}
+    by_recipient = {message["To"]: message for message in transport.messages}
+    assert set(by_recipient) == {"alice@test.com", "bob@test.com", "ops.lead@test.com"}
+    assert by_recipient["alice@test.com"]["Subject"] == "2 of your certifications expire soon"
+    assert by_recipient["bob@test.com"]["Subject"] == "Your Forklift Safety certification expires in 1 day"
+    manager_body = by_recipient["ops.lead@test.com"].get_content()
+    assert "Operations:" in manager_body and manager_body.count("Alice Ng") == 2
+
+    db = TestingSessionLocal()
+    try:
+        thresholds = dict(
+            db.query(Certification.cert_number, NotificationLog.threshold_days)
+            .join(NotificationLog, NotificationLog.certification_id == Certification.id)
+            .filter(NotificationLog.recipient_type == "employee")
+            .all()
+        )
+        assert thresholds == {"N-1": 7, "N-2": 30, "N-3": 1}
+    finally:
+        db.close()
+    print("✅ Expiry digests grouped per employee and manager")
+
+def test_reruns_send_nothing_until_next_threshold():
+    """Watermarks and the send log stop repeats; later thresholds are still announced"""
+    now = datetime.utcnow()
+    create_expiry_data(now)
+    run(CollectingTransport(), now)
+
+    transport = CollectingTransport()
+    assert run(transport, now + timedelta(hours=1))["digests"] == 0
+    assert transport.messages == []
+
+    # 23 days later the 29.5 day certification crosses the 7 day threshold
+    result = run(transport, now + timedelta(days=23))
+    assert result["certifications"] == 1
+    by_recipient = {message["To"]: message for message in transport.messages}
+    assert set(by_recipient) == {"alice@test.com", "ops.lead@test.com"}
+    assert by_recipient["alice@test.com"]["Subject"] == "Your Forklift Safety certification expires in 7 days"
+    print("✅ Reruns are incremental and idempotent")
+
+def test_failed_send_is_retried_without_duplicates():
+    """A failed digest is retried on the next run; delivered ones are not repeated"""
+    now = datetime.utcnow()
+    create_expiry_data(now)
+
+    first = CollectingTransport(fail_for={"bob@test.com"})
+    assert run(first, now) == {"certifications": 3, "digests": 3, "sent": 2, "failed": 1}
+
+    # Watermarks advance regardless; the failed digest is retried from the log
+    db = TestingSessionLocal()
+    try:
+        assert {row.scanned_until for row in db.query(NotificationWatermark).all()} == {now}
+    finally:
+        db.close()
+
+    second = CollectingTransport()
+    result = run(second, now + timedelta(minutes=5))
+    assert result["sent"] == 1
+    assert [message["To"] for message in second.messages] == ["bob@test.com"]
+
+    third = CollectingTransport()
+    assert run(third, now + timedelta(minutes=10))["digests"] == 0
+    print("✅ Failed digest retried once")
+
+def test_permanently_refused_address_is_not_retried():
+    """A 5xx refusal is logged as rejected and doesn't come back on later runs"""
+    now = datetime.utcnow()
+    create_expiry_data(now)
+
+    assert run(CollectingTransport(fail_for={"bob@test.com"}, code=550), now)["failed"] == 1
+
+    transport = CollectingTransport()
+    assert run(transport, now + timedelta(minutes=5))["digests"] == 0
+    assert transport.messages == []
+
+    db = TestingSessionLocal()
+    try:
+        statuses = dict(db.query(NotificationLog.recipient, NotificationLog.status).all())
+        assert statuses["bob@test.com"] == "rejected"
+        assert statuses["alice@test.com"] == "sent"
+        assert {row.scanned_until for row in db.query(NotificationWatermark).all()} == {now + timedelta(minutes=5)}
+    finally:
+        db.close()
+    print("✅ Rejected address skipped on later runs")
+
+def test_file_transport_writes_mbox(tmp_path):
+    """The file transport appends every digest to an mbox"""
+    now = datetime.utcnow()
+    create_expiry_data(now)
+    path = str(tmp_path / "notifications.mbox")
+
+    run(FileTransport(path), now)
+    recipients = sorted(message["To"] for message in mailbox.mbox(path))
+    assert recipients == ["alice@test.com", "bob@test.com", "ops.lead@test.com"]
+    print("✅ File transport wrote the digests")
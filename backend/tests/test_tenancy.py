@@ -0,0 +1,303 @@
+# tests/test_tenancy.py
+import sys
+import os
+import csv
+import io
+import json
+import pytest
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app
+from app.database import Base, get_db
+from app.dependecies import get_tenant_id
+from app.models import Tenant, Employee, Department, Training, Enrollment, Certification, Tombstone
+from app.tenancy import DEFAULT_TENANT_ID, scope
+from app.crud import metrics as crud_metrics
+from app.data_versions import data_version
+
+# Create test database
+SQLALCHEMY_DATABASE_URL = "sqlite:///./test_tenancy.db"
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Override the get_db dependency, keeping its tenant scoping
+def override_get_db(tenant_id: int = Depends(get_tenant_id)):
+    try:
+        db = scope(TestingSessionLocal(), tenant_id)
+        yield db
+    finally:
+        db.close()
+
+app.dependency_overrides[get_db] = override_get_db
+
+client = TestClient(app)
+
+@pytest.fixture(autouse=True)
+def setup_test():
+    """Setup and teardown for each test"""
+    Base.metadata.create_all(bind=engine)
+    cleanup_database()
+    yield
+
+def cleanup_database():
+    """Clean up test database, keeping only the default tenant"""
+    db = TestingSessionLocal()
+    try:
+        for model in (Tombstone, Certification, Enrollment, Training, Employee, Department):
+            db.query(model).delete()
+        db.query(Tenant).delete()
+        db.add(Tenant(id=DEFAULT_TENANT_ID, slug="default", name="Default"))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"Cleanup error: {e}")
+    finally:
+        db.close()
+
+def login(tenant=None):
+    body = {"email": "skillflow@gmail.com", "password": "skillflow1"}
+    if tenant:
+        body["tenant"] = tenant
+    response = client.post("/auth/login", json=body)
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+def employee_row(number, department_id=None):
+    return {
+        "employee_id": f"T{number:03d}",
+        "first_name": "Tenant",
+        "last_name": f"Tester{number}",
+        "email": f"tenant.tester{number}@test.com",
+        "department_id": department_id,
+        "position": "Analyst",
+        "is_active": True
+    }
+
+def seed_tenants():
+    """
+    Tenant "acme" beside the default one, each with an employee, training, enrollment
+    and certification old enough for the change feed. Returns {tenant_id: {entity: id}}.
+    """
+    db = TestingSessionLocal()
+    try:
+        db.add(Tenant(id=2, slug="acme", name="Acme"))
+        db.commit()
+    finally:
+        db.close()
+
+    old = datetime.utcnow() - timedelta(days=1)
+    ids = {}
+    for tenant_id in (DEFAULT_TENANT_ID, 2):
+        db = scope(TestingSessionLocal(), tenant_id)
+        try:
+            employee = Employee(**employee_row(tenant_id), created_at=old, updated_at=old)
+            training = Training(name=f"Training {tenant_id}", duration_hours=2.0, created_at=old, updated_at=old)
+            db.add_all([employee, training])
+            db.flush()
+            enrollment = Enrollment(
+                employee_id=employee.id, training_id=training.id, status="completed", progress=100,
+                enrolled_date=old, completed_date=old, created_at=old, updated_at=old
+            )
+            db.add(enrollment)
+            db.flush()
+            certification = Certification(
+                employee_id=employee.id, training_id=training.id, enrollment_id=enrollment.id,
+                cert_number=f"TEN-{tenant_id}", issued_date=old, created_at=old, updated_at=old
+            )
+            db.add(certification)
+            db.commit()
+            ids[tenant_id] = {
+                "employee": employee.id, "training": training.id,
+                "enrollment": enrollment.id, "certification": certification.id
+            }
+        finally:
+            db.close()
+    return ids
+
+def test_scoped_sessions_only_see_their_tenant():
+    """Reads are filtered and writes stamped with the session's tenant"""
+    db = TestingSessionLocal()
+    try:
+        db.add(Tenant(id=2, slug="acme", name="Acme"))
+        db.commit()
+    finally:
+        db.close()
+
+    default, acme = scope(TestingSessionLocal(), DEFAULT_TENANT_ID), scope(TestingSessionLocal(), 2)
+    try:
+        default.add(Employee(**employee_row(1)))
+        default.commit()
+        # Same employee ID and email in another tenant; ORM bulk inserts are stamped too
+        acme.execute(insert(Employee), [employee_row(1), employee_row(2)])
+        acme.commit()
+
+        assert [e.tenant_id for e in default.query(Employee).all()] == [DEFAULT_TENANT_ID]
+        assert sorted(e.employee_id for e in acme.query(Employee).all()) == ["T001", "T002"]
+        assert {e.tenant_id for e in acme.query(Employee).all()} == {2}
+
+        # Other tenants' rows can't be fetched, counted, updated or deleted
+        other_id = default.query(Employee.id).scalar()
+        assert acme.get(Employee, other_id) is None
+        assert acme.query(Employee).filter(Employee.id == other_id).update({"position": "x"}) == 0
+        assert acme.query(Employee).filter(Employee.id == other_id).delete() == 0
+        acme.commit()
+    finally:
+        default.close()
+        acme.close()
+
+    unscoped = TestingSessionLocal()
+    try:
+        assert unscoped.query(Employee).count() == 3
+    finally:
+        unscoped.close()
+    print("✅ Sessions scoped per tenant")
+
+def test_token_tenant_scopes_requests():
+    """The tenant chosen at login scopes every request made with the token"""
+    default_headers = login()
+    response = client.post("/tenants", json={"slug": "acme", "name": "Acme"}, headers=default_headers)
+    assert response.status_code == 201
+    acme_headers = login("acme")
+
+    # Only default-tenant tokens administer tenants
+    assert client.get("/tenants", headers=acme_headers).status_code == 403
+    response = client.post("/tenants", json={"slug": "rival", "name": "Rival"}, headers=acme_headers)
+    assert response.status_code == 403
+    assert [t["slug"] for t in client.get("/tenants", headers=default_headers).json()] == ["default", "acme"]
+
+    # The same department name is free in each tenant
+    for headers in (default_headers, acme_headers):
+        response = client.post("/departments", json={"name": "Operations"}, headers=headers)
+        assert response.status_code == 201
+    acme_department = response.json()["id"]
+    response = client.post("/departments", json={"name": "Acme Only"}, headers=acme_headers)
+    assert response.status_code == 201
+
+    names = [d["name"] for d in client.get("/departments", headers=default_headers).json()["departments"]]
+    assert names == ["Operations"]
+
+    response = client.post("/employees", json=employee_row(1, acme_department), headers=acme_headers)
+    assert response.status_code == 201
+    acme_employee = response.json()["id"]
+    assert client.get(f"/employees/{acme_employee}", headers=default_headers).status_code == 404
+    assert client.get(f"/employees/{acme_employee}", headers=acme_headers).status_code == 200
+
+    # Cached compliance reports are per tenant too
+    for _ in range(2):
+        totals = [
+            client.post("/api/compliance/report?summary=true", json={"department": "all"}, headers=headers).json()["totalEmployees"]
+            for headers in (default_headers, acme_headers)
+        ]
+        assert totals == [0, 1]
+
+    response = client.post("/auth/login", json={
+        "email": "skillflow@gmail.com", "password": "skillflow1", "tenant": "nope"
+    })
+    assert response.status_code == 401
+    print("✅ Requests scoped to the token's tenant")
+
+def test_exports_only_stream_the_tokens_tenant():
+    """Employee, enrollment and certification exports, in every format, stay within the tenant"""
+    ids = seed_tenants()
+    for tenant_id, headers in ((DEFAULT_TENANT_ID, login()), (2, login("acme"))):
+        for resource, entity in (("employees", "employee"), ("enrollments", "enrollment"), ("certifications", "certification")):
+            for format in ("ndjson", "csv"):
+                response = client.get(f"/{resource}/export?format={format}", headers=headers)
+                assert response.status_code == 200
+                if format == "csv":
+                    rows = list(csv.DictReader(io.StringIO(response.text)))
+                else:
+                    rows = [json.loads(line) for line in response.text.splitlines() if line]
+                assert [int(row["id"]) for row in rows] == [ids[tenant_id][entity]], (resource, format)
+                assert {int(row["tenant_id"]) for row in rows} == {tenant_id}
+    print("✅ Exports scoped to the token's tenant")
+
+def test_change_feed_only_reports_the_tokens_tenant():
+    """Upserts and tombstones on /changes belong to the token's tenant"""
+    ids = seed_tenants()
+    db = TestingSessionLocal()
+    try:
+        old = datetime.utcnow() - timedelta(hours=1)
+        db.add_all([
+            Tombstone(tenant_id=tenant_id, entity_type="training", entity_id=1000 + tenant_id, deleted_at=old)
+            for tenant_id in (DEFAULT_TENANT_ID, 2)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+    for tenant_id, headers in ((DEFAULT_TENANT_ID, login()), (2, login("acme"))):
+        response = client.get("/changes", headers=headers)
+        assert response.status_code == 200
+        items = response.json()["changes"]
+        upserts = {(item["entity"], item["id"]) for item in items if item["operation"] == "upsert"}
+        assert upserts == {(entity, id) for entity, id in ids[tenant_id].items()}
+        deletes = [item["id"] for item in items if item["operation"] == "delete"]
+        assert deletes == [1000 + tenant_id]
+    print("✅ Change feed scoped to the token's tenant")
+
+def test_rollups_and_dashboard_count_one_tenant():
+    """Daily rollup totals and the dashboard's employee counts cover only the session's tenant"""
+    seed_tenants()
+    # A second employee in acme, so the tenants' counts differ
+    acme = scope(TestingSessionLocal(), 2)
+    try:
+        acme.add(Employee(**employee_row(3)))
+        acme.commit()
+    finally:
+        acme.close()
+
+    tomorrow = datetime.utcnow().date() + timedelta(days=1)
+    for tenant_id, employees in ((DEFAULT_TENANT_ID, 1), (2, 2)):
+        db = scope(TestingSessionLocal(), tenant_id)
+        try:
+            totals = crud_metrics.compute_totals(db, tomorrow)
+        finally:
+            db.close()
+        assert totals["total_employees"] == employees
+        assert totals["total_trainings"] == 1
+        assert totals["total_enrollments"] == 1
+        assert totals["completed_enrollments"] == 1
+        assert totals["total_certifications"] == 1
+
+    for headers, employees in ((login(), 1), (login("acme"), 2)):
+        response = client.get("/api/dashboard/dashboard-data", headers=headers)
+        assert response.status_code == 200
+        status = response.json()["employeeStatus"]
+        assert status["totalEmployees"] == employees
+        assert sum(item["count"] for item in status["distribution"]) == employees
+    print("✅ Rollups and dashboard counts scoped per tenant")
+
+def test_data_versions_move_per_tenant():
+    """A write moves its own tenant's data version only"""
+    seed_tenants()
+
+    def versions():
+        result = []
+        for tenant_id in (DEFAULT_TENANT_ID, 2):
+            db = scope(TestingSessionLocal(), tenant_id)
+            try:
+                result.append(data_version(db, (Employee, Department)))
+            finally:
+                db.close()
+        return result
+
+    before = versions()
+    acme = scope(TestingSessionLocal(), 2)
+    try:
+        acme.query(Employee).one().position = "Lead"
+        acme.commit()
+    finally:
+        acme.close()
+    after = versions()
+    assert after[0] == before[0]
+    assert after[1] != before[1]
+    print("✅ Data versions per tenant")
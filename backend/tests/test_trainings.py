@@ -501,6 +501,37 @@ def test_invalid_token():
     assert response.status_code == 401 or response.status_code == 403
     print("✅ Expired token correctly rejected for list endpoint")
 
+def test_trainings_list_etag():
+    """Test conditional GET on the trainings list"""
+    print("\nTest 14: Testing ETag revalidation on the trainings list...")
+    headers = get_auth_headers()
+
+    response = client.get("/trainings", headers=headers)
+    assert response.status_code == 200
+    etag = response.headers.get("etag")
+    assert etag is not None
+    assert response.headers.get("cache-control") == "private, no-cache"
+    print(f"✅ List returned ETag {etag}")
+
+    # Unchanged data revalidates with an empty 304
+    response = client.get("/trainings", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers.get("etag") == etag
+    print("✅ Matching If-None-Match returned 304 Not Modified")
+
+    # A write changes the tag
+    training = create_test_training()
+    try:
+        response = client.get("/trainings", headers={**headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers.get("etag") != etag
+        print("✅ ETag changed after creating a training")
+    finally:
+        delete_test_training(training["id"])
+
+    return True
+
 if __name__ == "__main__":
     print("=" * 60)
     print("Running Trainings API Tests (with Authentication)")
@@ -520,6 +551,7 @@ if __name__ == "__main__":
         ("Invalid Duration", test_training_with_invalid_duration),
         ("Multiple Trainings", test_create_multiple_trainings),
         ("Invalid Token", test_invalid_token),
+        ("Trainings List ETag", test_trainings_list_etag),
     ]
     
     tests_passed = 0